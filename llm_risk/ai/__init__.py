@@ -7,6 +7,7 @@ from .gemini_agent import GeminiAgent
 from .llama_agent import LlamaAgent
 from .qwen_agent import QwenAgent
 from .mistral_agent import MistralAgent
+from .response_store import AIResponseStore
 
 __all__ = [
     "BaseAIAgent",
@@ -16,5 +17,6 @@ __all__ = [
     "GeminiAgent",
     "LlamaAgent",
     "QwenAgent",
-    "MistralAgent"
+    "MistralAgent",
+    "AIResponseStore"
 ]
@@ -1,5 +1,22 @@
 from abc import ABC, abstractmethod
 import json # Added for potential use if action is a string that needs parsing, though Gemini part handles it.
+try:
+    import orjson # Optional: faster parsing of the game state JSON for the intelligence briefing
+except ImportError:
+    orjson = None
+
+# Chat action formats and action selection rules; the same on every action prompt.
+ACTION_SELECTION_INSTRUCTIONS = (
+    "\nIf you want to chat globally, use action: {'type': 'GLOBAL_CHAT', 'message': 'your message here'}\n"
+    "If you want to initiate a private chat, use action: {'type': 'PRIVATE_CHAT', 'target_player_name': 'PlayerName', 'initial_message': 'your message here'}\n"
+    "\nCRITICAL INSTRUCTIONS FOR ACTION SELECTION:\n"
+    "1. Your primary task is to select ONE action object EXACTLY AS IT APPEARS in the 'Valid Actions' list below or construct a chat action.\n"
+    "2. For actions like 'DEPLOY', 'ATTACK', or 'FORTIFY', the 'Valid Actions' list provides templates. You MUST choose one of these templates.\n"
+    "   - The `territory`, `from`, `to` fields in these templates are FIXED. DO NOT change them or choose territories not listed in these templates for the respective action type.\n"
+    "   - Your role is to decide numerical values like `num_armies`, `num_attacking_armies`, or `num_armies_to_move`, respecting any 'max_armies' or similar constraints provided in the chosen template.\n"
+    "3. The 'action' key in your JSON response MUST be a JSON STRING representation of your chosen action object (copied from 'Valid Actions' and with numerical values filled in where appropriate).\n"
+    "   Example: If a valid DEPLOY action is `{'type': 'DEPLOY', 'territory': 'Alaska', 'max_armies': 5}` and you decide to deploy 3 armies, your action string would be `'{\"type\": \"DEPLOY\", \"territory\": \"Alaska\", \"num_armies\": 3}'`. Notice 'Alaska' was copied directly.\n"
+)
 
 class BaseAIAgent(ABC):
     DEBUG_VALIDATION = False # Class-level toggle for validation debug messages - ENABLED FOR DEVELOPMENT
@@ -7,6 +24,7 @@ class BaseAIAgent(ABC):
     def __init__(self, player_name: str, player_color: str):
         self.player_name = player_name
         self.player_color = player_color
+        self._briefing_cache: tuple[str, str] | None = None # (game_state_json, briefing) of the last prompt
 
     @abstractmethod
     def get_thought_and_action(self, game_state_json: str, valid_actions: list, game_rules: str, system_prompt_addition: str = "") -> dict:
@@ -17,22 +35,24 @@ class BaseAIAgent(ABC):
         pass
 
     def _construct_system_prompt(self, base_prompt: str, game_rules: str, additional_text: str = "") -> str:
-        prompt = f"{base_prompt}\n\nYou are {self.player_name}, playing as the {self.player_color} pieces.\n\n{game_rules}"
-        if additional_text:
-            prompt += f"\n\n{additional_text}"
-        return prompt
-
-    def _construct_user_prompt_for_action(self, game_state_json: str, valid_actions: list, turn_chat_log: list = None) -> str:
-        prompt = f"Current Game State:\n{game_state_json}\n\n"
-        if turn_chat_log:
-            prompt += "Recent Global Chat Messages (last 10):\n"
-            for chat_msg in turn_chat_log[-10:]:
-                 prompt += f"- {chat_msg['sender']}: {chat_msg['message']}\n"
-            prompt += "\n"
-
+        static_part, dynamic_part = self._construct_system_prompt_parts(base_prompt, game_rules, additional_text)
+        return static_part + dynamic_part
+
+    def _construct_system_prompt_parts(self, base_prompt: str, game_rules: str, additional_text: str = "") -> tuple[str, str]:
+        """Splits the system prompt into the part that is identical on every call for this agent (persona,
+        identity, rules) and the per-call tail, so providers with prompt caching can cache the former."""
+        static_part = f"{base_prompt}\n\nYou are {self.player_name}, playing as the {self.player_color} pieces.\n\n{game_rules}"
+        return static_part, (f"\n\n{additional_text}" if additional_text else "")
+
+    def _intelligence_briefing(self, game_state_json: str) -> str:
+        """Summary of the latest events in game_state_json. The orchestrator re-sends the same cached
+        state string until the state changes, so the last result is reused instead of re-parsing."""
+        cached = self._briefing_cache
+        if cached is not None and cached[0] == game_state_json:
+            return cached[1]
         # Attempt to parse game_state_json to extract event_history for summary
         try:
-            game_state_data = json.loads(game_state_json)
+            game_state_data = orjson.loads(game_state_json) if orjson is not None else json.loads(game_state_json)
             event_history = game_state_data.get("event_history") # This key might not be in the default to_json
             # We need to ensure game_state_json passed here includes event_history.
             # For now, assume it might be missing or needs to be fetched/passed differently.
@@ -81,27 +101,33 @@ class BaseAIAgent(ABC):
                 if relevant_event_count == 0:
                     briefing += "- No significant recent actions by players.\n"
                 briefing += "--- End of Briefing ---\n\n"
-                prompt += briefing
+                briefing_text = briefing
             else:
                 # This case will be hit if game_state_json does not contain 'event_history'
                 # or if it's not a list.
-                prompt += "\n--- Intelligence Briefing ---\n- Event history not available in this summary.\n--- End of Briefing ---\n\n"
-        except (json.JSONDecodeError, AttributeError):
-            prompt += "\n--- Intelligence Briefing ---\n- Could not parse event history from game state.\n--- End of Briefing ---\n\n"
+                briefing_text = "\n--- Intelligence Briefing ---\n- Event history not available in this summary.\n--- End of Briefing ---\n\n"
+        except (ValueError, AttributeError): # json.JSONDecodeError and orjson.JSONDecodeError are ValueErrors
+            briefing_text = "\n--- Intelligence Briefing ---\n- Could not parse event history from game state.\n--- End of Briefing ---\n\n"
+        self._briefing_cache = (game_state_json, briefing_text)
+        return briefing_text
+
+    def _construct_user_prompt_for_action(self, game_state_json: str, valid_actions: list, turn_chat_log: list = None,
+                                          include_instructions: bool = True) -> str:
+        """include_instructions=False leaves out ACTION_SELECTION_INSTRUCTIONS, for agents that send them in the system prompt."""
+        prompt = f"Current Game State:\n{game_state_json}\n\n"
+        if turn_chat_log:
+            prompt += "Recent Global Chat Messages (last 10):\n"
+            for chat_msg in turn_chat_log[-10:]:
+                 prompt += f"- {chat_msg['sender']}: {chat_msg['message']}\n"
+            prompt += "\n"
 
+        prompt += self._intelligence_briefing(game_state_json)
 
         prompt += "Valid Actions (choose one, or a chat action):\n"
         for i, action in enumerate(valid_actions):
             prompt += f"{i+1}. {action}\n"
-        prompt += "\nIf you want to chat globally, use action: {'type': 'GLOBAL_CHAT', 'message': 'your message here'}\n"
-        prompt += "If you want to initiate a private chat, use action: {'type': 'PRIVATE_CHAT', 'target_player_name': 'PlayerName', 'initial_message': 'your message here'}\n"
-        prompt += "\nCRITICAL INSTRUCTIONS FOR ACTION SELECTION:\n"
-        prompt += "1. Your primary task is to select ONE action object EXACTLY AS IT APPEARS in the 'Valid Actions' list below or construct a chat action.\n"
-        prompt += "2. For actions like 'DEPLOY', 'ATTACK', or 'FORTIFY', the 'Valid Actions' list provides templates. You MUST choose one of these templates.\n"
-        prompt += "   - The `territory`, `from`, `to` fields in these templates are FIXED. DO NOT change them or choose territories not listed in these templates for the respective action type.\n"
-        prompt += "   - Your role is to decide numerical values like `num_armies`, `num_attacking_armies`, or `num_armies_to_move`, respecting any 'max_armies' or similar constraints provided in the chosen template.\n"
-        prompt += "3. The 'action' key in your JSON response MUST be a JSON STRING representation of your chosen action object (copied from 'Valid Actions' and with numerical values filled in where appropriate).\n"
-        prompt += "   Example: If a valid DEPLOY action is `{'type': 'DEPLOY', 'territory': 'Alaska', 'max_armies': 5}` and you decide to deploy 3 armies, your action string would be `'{\"type\": \"DEPLOY\", \"territory\": \"Alaska\", \"num_armies\": 3}'`. Notice 'Alaska' was copied directly.\n"
+        if include_instructions:
+            prompt += ACTION_SELECTION_INSTRUCTIONS
         prompt += "\nRespond with a JSON object containing 'thought' and 'action' keys. "
         return prompt
 
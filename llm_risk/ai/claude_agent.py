@@ -1,10 +1,29 @@
-from .base_agent import BaseAIAgent, GAME_RULES_SNIPPET
+from .base_agent import BaseAIAgent, GAME_RULES_SNIPPET, ACTION_SELECTION_INSTRUCTIONS
 import os
 import json
 import anthropic # Would be used in a real environment
 import time # For potential retries
 
 class ClaudeAgent(BaseAIAgent):
+    _clients: dict[str, anthropic.Anthropic] = {} # api_key -> client shared by all ClaudeAgents (one connection pool)
+    # Shortest prompt prefix the API will cache, in tokens; shorter prefixes are silently sent uncached.
+    MIN_CACHEABLE_TOKENS = 1024 # Sonnet / Opus
+    MIN_CACHEABLE_TOKENS_HAIKU = 2048
+    CHARS_PER_TOKEN = 4 # Rough average for English prose; errs towards fewer tokens, i.e. towards not caching
+
+    @classmethod
+    def _is_cacheable_prefix(cls, model_name: str, text: str) -> bool:
+        """Whether text is long enough for the model's prompt cache (estimated from its length)."""
+        min_tokens = cls.MIN_CACHEABLE_TOKENS_HAIKU if "haiku" in model_name else cls.MIN_CACHEABLE_TOKENS
+        return len(text) // cls.CHARS_PER_TOKEN >= min_tokens
+
+    @classmethod
+    def _shared_client(cls, api_key: str) -> anthropic.Anthropic:
+        client = cls._clients.get(api_key)
+        if client is None:
+            client = cls._clients[api_key] = anthropic.Anthropic(api_key=api_key)
+        return client
+
     def __init__(self, player_name: str, player_color: str, api_key: str = None, model_name: str = "claude-3-haiku-20240307"): # Using Haiku for speed/cost effectiveness
         super().__init__(player_name, player_color)
         self.api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
@@ -12,7 +31,7 @@ class ClaudeAgent(BaseAIAgent):
             print(f"Warning: ClaudeAgent for {player_name} initialized without an API key. Live calls will fail.")
             self.client = None
         else:
-            self.client = anthropic.Anthropic(api_key=self.api_key)
+            self.client = self._shared_client(self.api_key)
         self.model_name = model_name
         self.base_system_prompt = f"You are a masterful and cunning AI player in the game of Risk, known as {self.player_name} ({self.player_color}). Your objective is total domination. You are highly analytical and articulate your thoughts clearly before deciding on an action. Respond in JSON format with 'thought' and 'action' keys."
 
@@ -40,11 +59,21 @@ class ClaudeAgent(BaseAIAgent):
             return {"thought": "No valid actions were provided to choose from.", "action": {"type": "END_TURN"}}
 
         # Ensure the system prompt explicitly asks for JSON.
-        system_p = self._construct_system_prompt(self.base_system_prompt, game_rules, system_prompt_addition)
-        if "Respond in JSON format" not in system_p: # Double check
-             system_p += " You MUST respond with a single valid JSON object containing two keys: 'thought' (your reasoning) and 'action' (one of the provided valid actions)."
-
-        user_p = self._construct_user_prompt_for_action(game_state_json, valid_actions)
+        static_p, dynamic_p = self._construct_system_prompt_parts(self.base_system_prompt, game_rules, system_prompt_addition)
+        if "Respond in JSON format" not in static_p + dynamic_p: # Double check
+             dynamic_p += " You MUST respond with a single valid JSON object containing two keys: 'thought' (your reasoning) and 'action' (one of the provided valid actions)."
+        # Persona, rules and the action selection instructions are the same on every call: send them as one
+        # prefix block, the phase-specific text follows. With the default rules this comes to roughly 2.6k
+        # tokens; a prefix below the model's caching minimum is sent without the cache marker.
+        static_p += "\n" + ACTION_SELECTION_INSTRUCTIONS
+        static_block = {"type": "text", "text": static_p}
+        if self._is_cacheable_prefix(self.model_name, static_p):
+            static_block["cache_control"] = {"type": "ephemeral"}
+        system_p = [static_block]
+        if dynamic_p:
+            system_p.append({"type": "text", "text": dynamic_p})
+
+        user_p = self._construct_user_prompt_for_action(game_state_json, valid_actions, include_instructions=False)
         # Anthropic expects the last message to be 'user' to generate an 'assistant' response.
         # The user_p already contains the request for action.
 
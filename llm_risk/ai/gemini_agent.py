@@ -14,6 +14,15 @@ class AgentResponse(BaseModel):
     action: str # Changed from dict to str to comply with Gemini API's stricter schema validation
 
 class GeminiAgent(BaseAIAgent):
+    _clients: dict[str, genai.Client] = {} # api_key -> client shared by all GeminiAgents (one connection pool)
+
+    @classmethod
+    def _shared_client(cls, api_key: str) -> genai.Client:
+        client = cls._clients.get(api_key)
+        if client is None:
+            client = cls._clients[api_key] = genai.Client(api_key=api_key)
+        return client
+
     def __init__(self, player_name: str, player_color: str, api_key: str = None, model_name = gemini_model_flash): # Using flash for speed
         super().__init__(player_name, player_color)
 
@@ -23,7 +32,7 @@ class GeminiAgent(BaseAIAgent):
             print(f"Warning: GeminiAgent for {player_name} initialized without an API key. Live calls will fail.")
             self.client = None
         else:
-            self.client = genai.Client(api_key=self.api_key)
+            self.client = self._shared_client(self.api_key)
             # System instructions can be passed to GenerativeModel for some models/versions
             # Or included directly in the prompt. For action generation, explicit JSON instruction is key.
             
@@ -0,0 +1,41 @@
+"""
+On-disk store of AI responses, so the orchestrator's response reuse (reuse_setup_ai_responses /
+reuse_play_ai_responses) carries over between runs, e.g. repeated benchmark games with the same setup.
+Backed by a single SQLite file; entries expire after a TTL.
+"""
+import hashlib
+import json
+import sqlite3
+import time
+
+
+class AIResponseStore:
+    DEFAULT_TTL_S = 30 * 86400 # Entries older than this are ignored and overwritten
+
+    def __init__(self, path: str, ttl_s: float = DEFAULT_TTL_S):
+        self.path = path
+        self.ttl_s = ttl_s
+        # Autocommit; only the orchestrator's main thread touches the connection.
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT NOT NULL, expires REAL NOT NULL)")
+
+    @staticmethod
+    def make_key(namespace: tuple, cache_key: tuple) -> str:
+        """sha256 of the namespace (agent class, model) and the orchestrator's in-memory cache key."""
+        raw = json.dumps([namespace, cache_key], separators=(",", ":"), default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> dict | None:
+        row = self._conn.execute("SELECT response FROM responses WHERE key = ? AND expires > ?", (key, time.time())).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, response: dict):
+        try:
+            encoded = json.dumps(response)
+        except (TypeError, ValueError):
+            return # Not JSON-serializable; keep it in memory only
+        self._conn.execute("INSERT OR REPLACE INTO responses (key, response, expires) VALUES (?, ?, ?)",
+                           (key, encoded, time.time() + self.ttl_s))
+
+    def close(self):
+        self._conn.close()
@@ -5,13 +5,13 @@ import json
 LOG_DIR = "logs"
 
 class GlobalChat:
-    def __init__(self, log_file_name: str = "global_chat.log"):
+    def __init__(self, log_file_name: str = "global_chat.log", log_dir: str = LOG_DIR):
         self.log: list[dict] = [] # List of message dictionaries
         self.log_file = None
         if log_file_name:
-            if not os.path.exists(LOG_DIR):
-                os.makedirs(LOG_DIR)
-            self.log_file = os.path.join(LOG_DIR, log_file_name)
+            if not os.path.exists(log_dir):
+                os.makedirs(log_dir)
+            self.log_file = os.path.join(log_dir, log_file_name)
             # You could add a timestamp to the log_file_name for unique logs per game run
             # e.g., log_file_name = f"global_chat_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
 
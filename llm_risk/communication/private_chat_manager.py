@@ -7,21 +7,23 @@ import os
 LOG_DIR = "logs" # Defined in global_chat.py, ensure consistency or pass around
 
 class PrivateChatManager:
-    def __init__(self, max_exchanges_per_conversation: int = 3, log_file_name: str = "private_chats.jsonl"):
+    def __init__(self, max_exchanges_per_conversation: int = 3, log_file_name: str = "private_chats.jsonl", log_dir: str = LOG_DIR):
         """
         Manages private conversations between two AI agents.
 
         Args:
             max_exchanges_per_conversation: The maximum number of message exchanges (one message from each agent is one exchange)
                                             allowed in a single private conversation session.
+            log_file_name: File in log_dir that conversations are appended to; empty to disable logging.
+            log_dir: Directory for log_file_name, created if missing.
         """
         self.max_exchanges = max_exchanges_per_conversation
         self.conversation_logs: dict[str, list[dict]] = {} # Stores logs, key could be "PlayerA_PlayerB_timestamp"
         self.log_file = None
         if log_file_name:
-            if not os.path.exists(LOG_DIR):
-                os.makedirs(LOG_DIR)
-            self.log_file = os.path.join(LOG_DIR, log_file_name)
+            if not os.path.exists(log_dir):
+                os.makedirs(log_dir)
+            self.log_file = os.path.join(log_dir, log_file_name)
 
 
     def run_conversation(self,
@@ -72,7 +74,7 @@ class PrivateChatManager:
 
         current_speaker = agent2
         other_speaker = agent1
-        game_state_json = game_state.to_json() # Serialize once
+        game_state_json = game_state.to_json_cached() # Serialize once (reused if the state is unchanged since the last call)
 
         for exchange_turn in range(self.max_exchanges * 2 -1): # Max (N*2 -1) messages after initial one
             # If current_speaker is agent2, recipient_name is agent1.player_name for the prompt
@@ -214,7 +216,10 @@ class PrivateChatManager:
 
         # Store the conversation log (optional) in memory
         log_key = f"{agent1.player_name}_vs_{agent2.player_name}_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}"
-        self.conversation_logs[log_key] = list(conversation_history) # Store a copy
+        # Copy-on-write: conversations may run on an AI worker thread while the GUI iterates the current dict.
+        conversation_logs = dict(self.conversation_logs)
+        conversation_logs[log_key] = list(conversation_history) # Store a copy
+        self.conversation_logs = conversation_logs
 
         # Log the entire conversation to a file
         if self.log_file:
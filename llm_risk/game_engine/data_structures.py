@@ -1,4 +1,17 @@
 import json
+from collections import deque
+from dataclasses import dataclass
+from typing import ClassVar
+try:
+    import orjson # Optional: much faster encoding of the (large) state dumps sent to the AIs
+except ImportError:
+    orjson = None
+
+def _dumps_indented(obj) -> str:
+    """json.dumps(obj, indent=2), via orjson when available (same layout; non-ASCII is left unescaped)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
 
 class Territory:
     def __init__(self, name: str, continent: 'Continent' = None, owner: 'Player' = None, army_count: int = 0, power_index: float = 0.0):
@@ -7,6 +20,9 @@ class Territory:
         self.owner = owner
         self.army_count = army_count
         self.adjacent_territories: list['Territory'] = []
+        # The Territory objects named by the dict entries of adjacent_territories, in the same order.
+        # Resolved once at map load so attack enumeration needs no name lookups.
+        self.neighbors: list['Territory'] = []
         self.power_index = power_index # Add this line
 
     def __repr__(self):
@@ -54,6 +70,8 @@ class Card:
         }
 
 class Player:
+    MUST_TRADE_HAND_SIZE = 5 # Holding this many cards (or more) forces a trade in REINFORCE
+
     def __init__(self, name: str, color: str, is_neutral: bool = False):
         self.name = name
         self.color = color
@@ -67,6 +85,11 @@ class Player:
         self.has_conquered_territory_this_turn: bool = False
 
 
+    @property
+    def must_trade(self) -> bool:
+        """True if the player's hand is large enough that a card trade is mandatory."""
+        return len(self.hand) >= self.MUST_TRADE_HAND_SIZE
+
     def __repr__(self):
         return (f"Player({self.name}, Color: {self.color}, Neutral: {self.is_neutral}, Territories: {len(self.territories)}, "
                 f"Cards: {len(self.hand)}, Deploy: {self.armies_to_deploy}, "
@@ -87,11 +110,182 @@ class Player:
             "has_conquered_territory_this_turn": self.has_conquered_territory_this_turn
         }
 
+# Typed event_history records. These are allocated on every attack/trade/diplomatic move and kept for the
+# whole game, so they use slots instead of per-event dicts. as_dict() gives the original dict layout
+# (for JSON and any consumer expecting dicts).
+@dataclass(slots=True)
+class CardTradeEvent:
+    turn: int
+    player: str
+    cards_traded_symbols: tuple
+    armies_gained: int
+    territory_bonus_info: str | None # None or a bonus message string
+    type: ClassVar[str] = "CARD_TRADE"
+
+    def as_dict(self) -> dict:
+        return {"turn": self.turn, "type": self.type, "player": self.player,
+                "cards_traded_symbols": list(self.cards_traded_symbols),
+                "armies_gained": self.armies_gained, "territory_bonus_info": self.territory_bonus_info}
+
+@dataclass(slots=True)
+class DiplomacyProposalEvent:
+    turn: int
+    proposer: str
+    target: str
+    type: ClassVar[str] = "DIPLOMACY_PROPOSAL"
+    subtype: ClassVar[str] = "ALLIANCE_PROPOSED"
+
+    def as_dict(self) -> dict:
+        return {"turn": self.turn, "type": self.type, "subtype": self.subtype, "proposer": self.proposer, "target": self.target}
+
+@dataclass(slots=True)
+class AllianceFormedEvent:
+    turn: int
+    players: tuple[str, str] # Sorted pair
+    type: ClassVar[str] = "DIPLOMACY_CHANGE"
+    subtype: ClassVar[str] = "ALLIANCE_FORMED"
+
+    def as_dict(self) -> dict:
+        return {"turn": self.turn, "type": self.type, "subtype": self.subtype, "players": list(self.players)}
+
+@dataclass(slots=True)
+class AllianceBrokenEvent:
+    turn: int
+    breaker: str
+    target: str
+    new_status: str = "NEUTRAL"
+    type: ClassVar[str] = "DIPLOMACY_CHANGE"
+    subtype: ClassVar[str] = "ALLIANCE_BROKEN"
+
+    def as_dict(self) -> dict:
+        return {"turn": self.turn, "type": self.type, "subtype": self.subtype, "breaker": self.breaker,
+                "target": self.target, "new_status": self.new_status}
+
+@dataclass(slots=True)
+class AllianceRejectedEvent:
+    turn: int
+    rejector: str
+    proposer: str
+    type: ClassVar[str] = "DIPLOMACY_REJECTION"
+    subtype: ClassVar[str] = "ALLIANCE_REJECTED"
+
+    def as_dict(self) -> dict:
+        return {"turn": self.turn, "type": self.type, "subtype": self.subtype, "rejector": self.rejector, "proposer": self.proposer}
+
+@dataclass(slots=True)
+class AttackEvent:
+    turn: int
+    type: str # "ATTACK_RESULT" (conquest) or "ATTACK_SKIRMISH"
+    attacker: str
+    defender: str
+    attacking_territory: str
+    defending_territory: str
+    attacker_losses: int
+    defender_losses: int
+    betrayal: bool
+    card_drawn: bool = False # Only reported for conquests
+    elimination: dict | None = None # Elimination details when the conquest knocked out the defender
+
+    def as_dict(self) -> dict:
+        d = {"turn": self.turn, "type": self.type, "attacker": self.attacker, "defender": self.defender,
+             "attacking_territory": self.attacking_territory, "defending_territory": self.defending_territory,
+             "attacker_losses": self.attacker_losses, "defender_losses": self.defender_losses}
+        if self.type != "ATTACK_RESULT":
+            d["betrayal"] = self.betrayal
+            return d
+        d["conquered"] = True
+        d["betrayal"] = self.betrayal
+        d["card_drawn"] = self.card_drawn
+        if self.elimination:
+            d["elimination"] = self.elimination
+        return d
+
+@dataclass(slots=True)
+class EliminationEvent:
+    turn: int
+    eliminator: str
+    eliminated_player: str
+    context: str = "CONQUEST"
+    type: ClassVar[str] = "ELIMINATION"
+
+    def as_dict(self) -> dict:
+        return {"turn": self.turn, "type": self.type, "eliminator": self.eliminator,
+                "eliminated_player": self.eliminated_player, "context": self.context}
+
+@dataclass(slots=True)
+class ContinentControlEvent:
+    turn: int
+    player: str
+    controlled_continents: list
+    reinforcement_bonus_from_continents: int
+    type: ClassVar[str] = "CONTINENT_CONTROL_UPDATE"
+
+    def as_dict(self) -> dict:
+        return {"turn": self.turn, "type": self.type, "player": self.player,
+                "controlled_continents": self.controlled_continents,
+                "reinforcement_bonus_from_continents": self.reinforcement_bonus_from_continents}
+
+@dataclass(slots=True, frozen=True)
+class FortifyAction:
+    """Parameters of an AI FORTIFY action. Construction raises ValueError if they have the wrong type or sign."""
+    from_territory: str
+    to_territory: str
+    num_armies: int
+
+    def __post_init__(self):
+        if not (isinstance(self.from_territory, str) and isinstance(self.to_territory, str) and
+                isinstance(self.num_armies, int) and self.num_armies >= 0):
+            raise ValueError(f"invalid FORTIFY parameters: {self.from_territory!r}, {self.to_territory!r}, {self.num_armies!r}")
+
+@dataclass(slots=True, frozen=True)
+class PlayerConfig:
+    """A human player's entry from the player config, after name/colour defaults are applied."""
+    name: str
+    color: str
+    ai_type: str
+
+class EventHistory(deque):
+    """
+    Container for GameState.event_history: a deque that also counts every event ever appended.
+    Events only enter on the right and leave on the left (popleft or the maxlen cap), so the event
+    at index i has the sequence number appended - len(self) + i. Caches key on these numbers.
+    """
+    def __init__(self, iterable=(), maxlen=None):
+        super().__init__(iterable, maxlen)
+        self.appended = len(self)
+
+    def append(self, event):
+        super().append(event)
+        self.appended += 1
+
+    def extend(self, events):
+        events = list(events)
+        super().extend(events)
+        self.appended += len(events)
+
+    def __iadd__(self, events):
+        self.extend(events)
+        return self
+
+    def _not_supported(self, *args, **kwargs):
+        raise TypeError("event_history only supports append/extend and popleft")
+
+    appendleft = extendleft = insert = remove = pop = rotate = reverse = _not_supported
+    __setitem__ = __delitem__ = _not_supported
+
+    def first_seq(self) -> int:
+        """Sequence number of the oldest event still held."""
+        return self.appended - len(self)
+
 class GameState:
+    EVENT_HISTORY_MAXLEN = 10000 # Hard cap on event_history; the oldest events are dropped beyond it
+
     def __init__(self):
         self.territories: dict[str, Territory] = {}
         self.continents: dict[str, Continent] = {}
         self.players: list[Player] = [] # Will include the Neutral player in 2-player games
+        self.players_by_name: dict[str, Player] = {} # Name lookup, rebuilt via rebuild_player_index() when players changes
+        self.player_index_by_name: dict[str, int] = {} # Name -> position in players, rebuilt alongside players_by_name
         self.current_turn_number: int = 1
         # Game Phases: SETUP_START, SETUP_DETERMINE_ORDER, SETUP_CLAIM_TERRITORIES, SETUP_PLACE_ARMIES,
         # SETUP_2P_DEAL_CARDS, SETUP_2P_PLACE_REMAINING, REINFORCE, ATTACK, FORTIFY, GAME_OVER
@@ -114,7 +308,26 @@ class GameState:
         # Stores active proposals, key is frozenset({proposer, target}), value is {'proposer': name, 'target': name, 'type': type, 'turn': turn}
         self.active_diplomatic_proposals: dict[frozenset[str], dict] = {}
         # History of key game events
-        self.event_history: list[dict] = []
+        self.event_history: EventHistory = EventHistory(maxlen=self.EVENT_HISTORY_MAXLEN) # dicts and typed event records (see CardTradeEvent etc.)
+        # Monotonic mutation counter, bumped by engine/orchestrator mutators. Used to key caches
+        # (e.g. valid actions) so they are invalidated whenever the board changes.
+        self.version: int = 0
+        # with_history -> (cache_key, json_str) for to_json_cached() / to_json_with_history_cached()
+        self._json_cache: dict[bool, tuple[tuple, str]] = {}
+        # Event sequence number -> indented JSON text for the entries of event_history; see _event_history_json()
+        self._event_json_cache: dict[int, str] = {}
+
+    def __getstate__(self):
+        # The JSON caches are derived data and go stale once a restored copy diverges; leave them out
+        # of pickles (e.g. orchestrator snapshots) and start the copy with empty ones.
+        state = self.__dict__.copy()
+        del state["_json_cache"], state["_event_json_cache"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._json_cache = {}
+        self._event_json_cache = {}
 
     def get_current_player(self) -> Player | None: # For regular game turns
         if not self.players or self.current_player_index < 0 or self.current_player_index >= len(self.players):
@@ -128,6 +341,35 @@ class GameState:
             pass
         return self.players[self.current_player_index]
 
+    def rebuild_player_index(self):
+        """Refreshes players_by_name / player_index_by_name after players are added or removed."""
+        self.players_by_name = {p.name: p for p in self.players}
+        self.player_index_by_name = {p.name: i for i, p in enumerate(self.players)}
+
+    def get_player_by_name(self, name: str) -> Player | None:
+        return self.players_by_name.get(name)
+
+    def index_of_player(self, player: Player) -> int:
+        """players.index(player) via player_index_by_name; raises ValueError if player is not in players."""
+        index = self.player_index_by_name.get(player.name)
+        if index is None or index >= len(self.players) or self.players[index] is not player:
+            # players was modified without rebuild_player_index(); refresh the index and retry.
+            self.rebuild_player_index()
+            index = self.player_index_by_name.get(player.name)
+            if index is None or self.players[index] is not player:
+                raise ValueError(f"{player.name} is not in players")
+        return index
+
+    def diplomatic_statuses_for(self, player_name: str) -> dict[str, str]:
+        """Maps every player with a recorded diplomatic status towards player_name to that status."""
+        statuses = {}
+        for key, status in self.diplomacy.items():
+            if player_name in key:
+                for other_name in key:
+                    if other_name != player_name:
+                        statuses[other_name] = status
+        return statuses
+
     def get_current_setup_player(self) -> Player | None: # For setup phases
         if not self.player_setup_order or \
            self.current_setup_player_index < 0 or \
@@ -167,14 +409,58 @@ class GameState:
 
     def to_json_with_history(self) -> str: # New method to include full history if needed
         full_dict = self.to_dict() # This now includes serialized active_diplomatic_proposals
-        full_dict["event_history"] = self.event_history # Add full history here
-        # Remove count if full history is present
-        if "event_history_count" in full_dict and "event_history" in full_dict :
-            del full_dict["event_history_count"]
-        return json.dumps(full_dict, indent=2)
+        # Remove count, the full history is appended instead
+        del full_dict["event_history_count"]
+        state_json = _dumps_indented(full_dict)
+        # Splice the history in as the last key; same text as dumping it as part of full_dict.
+        return state_json[:-2] + ',\n  "event_history": ' + self._event_history_json() + "\n}"
+
+    def _event_history_json(self) -> str:
+        """event_history as an indented JSON array nested one level deep. Each event is encoded once and
+        its text reused on later calls, so a dump only encodes the events added since the previous one."""
+        cache = self._event_json_cache
+        history = self.event_history
+        first_seq = history.first_seq()
+        parts = []
+        for seq, event in enumerate(history, first_seq):
+            text = cache.get(seq)
+            if text is None:
+                # Typed records are expanded to their dict form.
+                text = _dumps_indented(event if type(event) is dict else event.as_dict())
+                text = cache[seq] = "    " + text.replace("\n", "\n    ")
+            parts.append(text)
+        if len(cache) > len(parts): # Forget events trimmed from the history
+            for seq in [seq for seq in cache if seq < first_seq]:
+                del cache[seq]
+        if not parts:
+            return "[]"
+        return "[\n" + ",\n".join(parts) + "\n  ]"
+
+    def _json_cache_key(self) -> tuple:
+        # version covers engine mutations; the rest catches fields the orchestrator sets directly.
+        return (self.version, self.current_turn_number, self.current_game_phase, self.current_player_index,
+                self.current_setup_player_index, self.requires_post_attack_fortify,
+                # Together these identify the events held: sequence numbers first_seq() .. appended - 1.
+                self.event_history.appended, len(self.event_history))
+
+    def _cached_json(self, with_history: bool) -> str:
+        cache_key = self._json_cache_key()
+        cached = self._json_cache.get(with_history)
+        if cached is None or cached[0] != cache_key:
+            cached = (cache_key, self.to_json_with_history() if with_history else self.to_json())
+            self._json_cache[with_history] = cached
+        return cached[1]
+
+    def to_json_with_history_cached(self) -> str:
+        """Same as to_json_with_history(), but reuses the last dump until the state changes."""
+        return self._cached_json(True)
+
+    def to_json_cached(self) -> str:
+        """Same as to_json(), but reuses the last dump until the state changes."""
+        return self._cached_json(False)
 
     def to_json(self) -> str: # Default to_json will not include the potentially large event_history
-        return json.dumps(self.to_dict(), indent=2)
+        return _dumps_indented(self.to_dict())
 
 # The second GameState class definition and the if __name__ == '__main__': block are removed as they are duplicates or outdated.
 # Ensure the first GameState class is the one being actively developed and used.
@@ -1,6 +1,10 @@
-from .data_structures import GameState, Player, Territory, Continent, Card
+from .data_structures import GameState, Player, Territory, Continent, Card, AttackEvent, EliminationEvent, ContinentControlEvent
 import json
 import random
+import itertools
+import logging
+
+logger = logging.getLogger(__name__)
 
 class GameEngine:
     def __init__(self, map_file_path: str = "map_config.json"):
@@ -22,6 +26,7 @@ class GameEngine:
         gs.current_game_phase = "SETUP_START" # Ensure fresh start
         gs = self.game_state
         gs.current_game_phase = "SETUP_START"
+        gs.version += 1 # Everything below rebuilds the board; drop any state JSON cached before (re)initialization
         gs.is_two_player_game = is_two_player_game
         gs.game_mode = game_mode
 
@@ -76,14 +81,17 @@ class GameEngine:
             territory = gs.territories.get(terr_name)
             if territory:
                 territory.adjacent_territories.clear()
+                territory.neighbors.clear()
                 # terr_data.get("adjacent_to", []) is now a list of dicts, e.g., [{"name": "Alaska", "type": "sea"}, ...]
                 for adj_info in terr_data.get("adjacent_to", []):
                     if isinstance(adj_info, dict) and "name" in adj_info:
                         # Store the dictionary itself, which includes name and type.
                         # The actual Territory object can be retrieved when needed using adj_info["name"].
                         # We also need to ensure the target territory actually exists.
-                        if adj_info["name"] in gs.territories:
+                        adj_territory_obj = gs.territories.get(adj_info["name"])
+                        if adj_territory_obj:
                             territory.adjacent_territories.append(adj_info)
+                            territory.neighbors.append(adj_territory_obj)
                         else:
                             print(f"Warning: Adjacent territory name '{adj_info['name']}' for '{terr_name}' (type: {adj_info.get('type')}) not found in game state territories during linking.")
                     elif isinstance(adj_info, str): # Handle old format gracefully if map file is mixed by mistake
@@ -91,6 +99,7 @@ class GameEngine:
                         if adj_territory_obj:
                             # Convert to new format assuming 'land' if only string is given
                             territory.adjacent_territories.append({"name": adj_info, "type": "land"})
+                            territory.neighbors.append(adj_territory_obj)
                             print(f"Warning: Adjacency for '{terr_name}' to '{adj_info}' was string-only. Converted to land type.")
                         else:
                             print(f"Warning: Adjacent territory string '{adj_info}' for '{terr_name}' not found during linking.")
@@ -104,6 +113,7 @@ class GameEngine:
         gs.players.clear()
         human_players = [Player(p_info["name"], p_info["color"]) for p_info in players_data]
         gs.players.extend(human_players)
+        gs.rebuild_player_index()
 
         # Deck Creation (common for standard mode, whether manual or auto-init)
         # World map mode doesn't use this deck system in the same way initially.
@@ -120,7 +130,7 @@ class GameEngine:
                 gs.deck.append(Card(None, "Wildcard"))
                 gs.deck.append(Card(None, "Wildcard"))
                 random.shuffle(gs.deck)
-                print(f"DEBUG: Standard N-player or Auto-Init deck created with {len(gs.deck)} cards.")
+                logger.debug(f"Standard N-player or Auto-Init deck created with {len(gs.deck)} cards.")
 
         # --- Mode-Specific Setup ---
         if game_mode == "world_map":
@@ -155,6 +165,7 @@ class GameEngine:
                     if pc.lower() not in used_colors: neutral_color = pc; break
             neutral_player = Player(name="Neutral", color=neutral_color, is_neutral=True)
             gs.players.append(neutral_player)
+            gs.rebuild_player_index()
 
             # Army allocation for standard 2P
             initial_armies_per_entity = 40
@@ -179,9 +190,9 @@ class GameEngine:
                 for terr_name in territory_names_for_cards:
                     gs.deck.append(Card(terr_name, symbols[symbol_idx % 3])); symbol_idx +=1
                 random.shuffle(gs.deck)
-                print(f"DEBUG: Standard 2-Player (Manual) deck created/re-created with {len(gs.deck)} cards (no wildcards).")
+                logger.debug(f"Standard 2-Player (Manual) deck created/re-created with {len(gs.deck)} cards (no wildcards).")
             else:
-                print(f"DEBUG: Standard 2-Player (Manual) using pre-existing standard deck as map size is not 42. Deck size: {len(gs.deck)}.")
+                logger.debug(f"Standard 2-Player (Manual) using pre-existing standard deck as map size is not 42. Deck size: {len(gs.deck)}.")
 
 
             gs.current_game_phase = "SETUP_2P_DEAL_CARDS"
@@ -233,7 +244,7 @@ class GameEngine:
         gs.unclaimed_territory_names.clear()
         print(f"Auto-Init: Distributed {len(all_territory_objects)} territories among {num_human_players} players.")
         for p in human_players:
-            print(f"DEBUG Auto-Init: Player {p.name} assigned {len(p.territories)} territories.")
+            logger.debug(f"Auto-Init: Player {p.name} assigned {len(p.territories)} territories.")
 
 
         # 2. Allocate and Place Initial Armies
@@ -271,7 +282,7 @@ class GameEngine:
                 territory_idx += 1
 
             player.armies_placed_in_setup = player.initial_armies_pool
-            print(f"DEBUG Auto-Init: Player {player.name} (Initial Pool: {player.initial_armies_pool}) armies placed. Total armies on board: {sum(t.army_count for t in player.territories)}")
+            logger.debug(f"Auto-Init: Player {player.name} (Initial Pool: {player.initial_armies_pool}) armies placed. Total armies on board: {sum(t.army_count for t in player.territories)}")
 
 
         # 3. Setup for First Turn
@@ -283,7 +294,7 @@ class GameEngine:
         gs.first_player_of_game = shuffled_human_players[0]
 
         try:
-            gs.current_player_index = gs.players.index(gs.first_player_of_game)
+            gs.current_player_index = gs.index_of_player(gs.first_player_of_game)
         except ValueError:
             print(f"Error: First player {gs.first_player_of_game.name} not found in gs.players. Defaulting to 0 or first human.")
             # Attempt to find the first human player in the main gs.players list as a fallback
@@ -737,6 +748,7 @@ class GameEngine:
         to each human player and the neutral player. Each gets 1 army.
         Wild cards are NOT in the deck at this point.
         """
+        self.game_state.version += 1
         gs = self.game_state
         log = {"event": "setup_2p_deal_cards", "success": False, "message": ""}
 
@@ -822,6 +834,7 @@ class GameEngine:
         own_army_placements: list of (territory_name, count), sum of counts must be 2.
         neutral_army_placement: (territory_name, count=1)
         """
+        self.game_state.version += 1
         gs = self.game_state
         log = {"event": "place_initial_armies_2p", "player": acting_player_name, "success": False, "message": ""}
 
@@ -928,13 +941,13 @@ class GameEngine:
 
             gs.current_game_phase = "REINFORCE"
             try:
-                gs.current_player_index = gs.players.index(gs.first_player_of_game)
+                gs.current_player_index = gs.index_of_player(gs.first_player_of_game)
                 # Ensure first player is not neutral
                 if gs.players[gs.current_player_index].is_neutral:
                     # This means first_player_of_game was set to Neutral, which is an error for 2P mode.
                     # Default to the first human player in original list.
                     first_human = next(p for p in gs.players if not p.is_neutral)
-                    gs.current_player_index = gs.players.index(first_human)
+                    gs.current_player_index = gs.index_of_player(first_human)
             except ValueError:
                 gs.current_player_index = 0 # Fallback
 
@@ -959,6 +972,7 @@ class GameEngine:
         Called by the orchestrator after player order is determined (e.g., by dice rolls).
         Relevant for standard setup, not 2-player card-based setup.
         """
+        self.game_state.version += 1
         gs = self.game_state
         if gs.is_two_player_game:
             # For 2-player, setup order for placing remaining armies is typically fixed (P1, P2)
@@ -979,7 +993,7 @@ class GameEngine:
             print(f"Error: Cannot set player setup order in phase {gs.current_game_phase}")
             return False
 
-        name_to_player_map = {p.name: p for p in gs.players}
+        name_to_player_map = gs.players_by_name
         # Filter out neutral player if it accidentally got into ordered_player_names for standard setup
         gs.player_setup_order = [name_to_player_map[name] for name in ordered_player_names if name in name_to_player_map and not name_to_player_map[name].is_neutral]
 
@@ -1004,6 +1018,7 @@ class GameEngine:
         """
         Allows a player to claim an unoccupied territory during setup.
         """
+        self.game_state.version += 1
         gs = self.game_state
         log = {"event": "claim_territory", "player": player_name, "territory": territory_name, "success": False, "message": ""}
 
@@ -1058,6 +1073,7 @@ class GameEngine:
         """
         Allows a player to place one additional army on an owned territory during setup.
         """
+        self.game_state.version += 1
         gs = self.game_state
         log = {"event": "place_initial_army", "player": player_name, "territory": territory_name, "success": False, "message": ""}
 
@@ -1094,7 +1110,7 @@ class GameEngine:
         if self._all_initial_armies_placed():
             gs.current_game_phase = "REINFORCE" # First game phase after setup
             try:
-                gs.current_player_index = gs.players.index(gs.first_player_of_game)
+                gs.current_player_index = gs.index_of_player(gs.first_player_of_game)
             except ValueError:
                 print(f"Error: First player of game '{gs.first_player_of_game.name if gs.first_player_of_game else 'None'}' not found in players list. Defaulting to index 0.")
                 gs.current_player_index = 0
@@ -1163,57 +1179,25 @@ class GameEngine:
         - Wildcards can substitute for any symbol.
         Returns a list of sets, where each set is a list of 3 Card objects.
         """
-        valid_sets = []
         hand = player.hand
-        if len(hand) < 3:
-            return []
-
-        from collections import Counter
-        import itertools
+        return [[hand[i], hand[j], hand[k]] for i, j, k in self.find_valid_card_set_indices(player)]
 
-        # Iterate through all combinations of 3 cards
-        for combo_indices in itertools.combinations(range(len(hand)), 3):
-            combo = [hand[i] for i in combo_indices]
+    def find_valid_card_set_indices(self, player: Player) -> list[tuple[int, int, int]]:
+        """Same sets as find_valid_card_sets(), as ascending hand index triples (no hand.index() re-search)."""
+        return list(self._iter_valid_card_set_indices(player))
 
-            symbols_in_combo = [c.symbol for c in combo]
-            num_wildcards = symbols_in_combo.count("Wildcard")
-            non_wild_symbols = [s for s in symbols_in_combo if s != "Wildcard"]
+    def has_valid_card_set(self, player: Player) -> bool:
+        """Whether the player holds at least one tradeable set; stops at the first one found."""
+        return next(self._iter_valid_card_set_indices(player), None) is not None
 
-            # Check for 3 of a kind (possibly with wildcards)
-            if num_wildcards == 3: # 3 wildcards is a valid set
-                valid_sets.append(list(combo))
-                continue
-            if num_wildcards == 2 and len(non_wild_symbols) == 1: # 2 wildcards + 1 other is 3 of that kind
-                valid_sets.append(list(combo))
-                continue
-            if num_wildcards == 1 and len(non_wild_symbols) == 2:
-                if non_wild_symbols[0] == non_wild_symbols[1]: # 1 wildcard + 2 same symbols is 3 of that kind
-                    valid_sets.append(list(combo))
-                    continue
-            if num_wildcards == 0 and len(set(non_wild_symbols)) == 1: # 3 same non-wild symbols
-                 valid_sets.append(list(combo))
-                 continue
-
-            # Check for 1 of each unique symbol (possibly with wildcards)
-            # The symbols are Infantry, Cavalry, Artillery
-            unique_symbols = {"Infantry", "Cavalry", "Artillery"}
-            present_symbols = set(non_wild_symbols)
-
-            if num_wildcards == 0:
-                if len(present_symbols) == 3: # All 3 unique symbols present, no wildcards
-                    valid_sets.append(list(combo))
-            elif num_wildcards == 1:
-                if len(present_symbols) == 2: # 1 wildcard can complete a set of 3 unique if 2 are already present
-                    valid_sets.append(list(combo))
-            elif num_wildcards == 2:
-                if len(present_symbols) == 1: # 2 wildcards can complete a set of 3 unique if 1 is already present
-                    valid_sets.append(list(combo))
-            # 3 wildcards already handled by "3 of a kind" logic (counts as any set)
-
-        # Ensure we don't return duplicate sets if multiple card objects are identical but different instances
-        # This current implementation identifies sets by card objects, so if cards are unique, sets will be too.
-        # If card objects could be identical, further deduplication by card content might be needed.
-        return valid_sets
+    def _iter_valid_card_set_indices(self, player: Player):
+        symbols = [c.symbol for c in player.hand]
+        if len(symbols) < 3:
+            return iter(())
+        # Any combination with a wildcard can complete either kind of set; without one, three symbols form
+        # a set when they are all the same or all different, i.e. unless exactly two distinct symbols appear.
+        return (combo for combo in itertools.combinations(range(len(symbols)), 3)
+                if "Wildcard" in (syms := (symbols[combo[0]], symbols[combo[1]], symbols[combo[2]])) or len(set(syms)) != 2)
 
 
     def perform_card_trade(self, player: Player, cards_to_trade_indices: list[int]) -> dict:
@@ -1226,24 +1210,30 @@ class GameEngine:
         - Updates player's armies_to_deploy.
         Returns a log of the trade.
         """
+        self.game_state.version += 1
         log = {"event": "card_trade", "player": player.name, "success": False, "message": "", "armies_gained": 0}
 
         if len(cards_to_trade_indices) != 3:
             log["message"] = "Exactly 3 cards must be selected for a trade."
             return log
 
-        # Ensure indices are valid and unique
-        if len(set(cards_to_trade_indices)) != 3:
+        # Ensure indices are valid and unique in one pass: one bit per in-range index, so duplicates
+        # collapse. A non-integer fails the comparison or the shift with TypeError.
+        hand_size = len(player.hand)
+        mask = 0
+        try:
+            for i in cards_to_trade_indices:
+                if not 0 <= i < hand_size:
+                    raise ValueError(i)
+                mask |= 1 << i
+        except (TypeError, ValueError):
+            log["message"] = "Invalid card index provided."
+            return log
+        if mask.bit_count() != 3:
             log["message"] = "Card indices must be unique."
             return log
 
-        cards_to_trade = []
-        for i in sorted(cards_to_trade_indices, reverse=True): # Sort reverse to pop correctly
-            if i < 0 or i >= len(player.hand):
-                log["message"] = "Invalid card index provided."
-                return log
-            cards_to_trade.append(player.hand[i])
-        cards_to_trade.reverse() # Get them back in original order for set checking
+        cards_to_trade = [player.hand[i] for i in sorted(cards_to_trade_indices)] # Original hand order for set checking
 
         # Validate the set (re-using find_valid_card_sets logic on the selected cards)
         # This is a bit inefficient but ensures the selected cards form a valid set among themselves.
@@ -1308,6 +1298,7 @@ class GameEngine:
                                       this exact number of dice will be used for defense if valid.
         Returns a log of the battle's result.
         """
+        self.game_state.version += 1
         attacker_territory = self.game_state.territories.get(attacker_territory_name)
         defender_territory = self.game_state.territories.get(defender_territory_name)
         log = {"event": "attack", "attacker": None, "defender": None, "results": [], "conquered": False, "card_drawn": None, "betrayal": False}
@@ -1541,45 +1532,27 @@ class GameEngine:
                     log["mandatory_card_trade_initiated"] = new_owner.name
 
             # Log event to history
-            event_data = {
-                "turn": gs.current_turn_number,
-                "type": "ATTACK_RESULT",
-                "attacker": attacker_player.name if attacker_player else "N/A",
-                "defender": defender_player.name if defender_player else "N/A",
-                "attacking_territory": attacker_territory_name,
-                "defending_territory": defender_territory_name,
-                "attacker_losses": attacker_losses,
-                "defender_losses": defender_losses,
-                "conquered": log["conquered"],
-                "betrayal": log["betrayal"]
-            }
-            if log["conquered"]:
-                event_data["card_drawn"] = log.get("card_drawn") is not None
-                if eliminated_player_details:
-                    event_data["elimination"] = eliminated_player_details # Keep details in attack log
-                    # Also add a specific ELIMINATION event for easier filtering by AI
-                    gs.event_history.append({
-                        "turn": gs.current_turn_number,
-                        "type": "ELIMINATION",
-                        "eliminator": new_owner.name,
-                        "eliminated_player": old_owner.name,
-                        "context": "CONQUEST"
-                    })
-            gs.event_history.append(event_data)
+            if eliminated_player_details:
+                # Also add a specific ELIMINATION event for easier filtering by AI
+                gs.event_history.append(EliminationEvent(gs.current_turn_number, new_owner.name, old_owner.name, "CONQUEST"))
+            gs.event_history.append(AttackEvent(
+                gs.current_turn_number, "ATTACK_RESULT",
+                attacker_player.name if attacker_player else "N/A",
+                defender_player.name if defender_player else "N/A",
+                attacker_territory_name, defender_territory_name,
+                attacker_losses, defender_losses, log["betrayal"],
+                card_drawn=log.get("card_drawn") is not None,
+                elimination=eliminated_player_details # Keep details in attack log
+            ))
 
         else: # Attack did not result in conquest, but still log the skirmish
-            event_data = {
-                "turn": gs.current_turn_number,
-                "type": "ATTACK_SKIRMISH", # Different type for non-conquest
-                "attacker": attacker_player.name if attacker_player else "N/A",
-                "defender": defender_player.name if defender_player else "N/A",
-                "attacking_territory": attacker_territory_name,
-                "defending_territory": defender_territory_name,
-                "attacker_losses": attacker_losses,
-                "defender_losses": defender_losses,
-                "betrayal": log["betrayal"]
-            }
-            gs.event_history.append(event_data)
+            gs.event_history.append(AttackEvent(
+                gs.current_turn_number, "ATTACK_SKIRMISH", # Different type for non-conquest
+                attacker_player.name if attacker_player else "N/A",
+                defender_player.name if defender_player else "N/A",
+                attacker_territory_name, defender_territory_name,
+                attacker_losses, defender_losses, log["betrayal"]
+            ))
 
 
         return log
@@ -1589,6 +1562,7 @@ class GameEngine:
         Moves armies between two connected territories owned by the same player.
         Returns a log of the fortification.
         """
+        self.game_state.version += 1
         log = {"event": "fortify", "success": False, "message": ""}
         from_territory = self.game_state.territories.get(from_territory_name)
         to_territory = self.game_state.territories.get(to_territory_name)
@@ -1634,6 +1608,7 @@ class GameEngine:
         Moves armies into a newly conquered territory based on player's decision.
         This is called after a conquest when game_state.requires_post_attack_fortify is True.
         """
+        self.game_state.version += 1
         log = {"event": "post_attack_fortify", "player": player.name, "success": False, "message": ""}
 
         if not self.game_state.requires_post_attack_fortify or not self.game_state.conquest_context:
@@ -1738,6 +1713,45 @@ class GameEngine:
 
         return False
 
+    def has_attack_option(self, player: Player) -> bool:
+        """
+        Cheap check for whether get_valid_actions would offer the player any ATTACK/BETRAY_ALLY action:
+        an owned territory with more than 1 army next to a territory the player does not own.
+        Stops at the first hit instead of building the full action list.
+        """
+        for territory in player.territories:
+            if territory.army_count > 1:
+                for neighbor_obj in territory.neighbors:
+                    if neighbor_obj.owner != player:
+                        return True
+        return False
+
+    def clear_elimination_card_trade(self):
+        """Drops the pending post-elimination trade requirement (met, impossible, or abandoned)."""
+        self.game_state.elimination_card_trade_player_name = None
+        self.game_state.version += 1 # The flag is part of the state JSON and decides which actions are valid
+
+    def get_paf_action(self, player: Player) -> dict | None:
+        """
+        The POST_ATTACK_FORTIFY action get_valid_actions would offer while a post-attack fortify is pending,
+        built straight from gs.conquest_context. None if no PAF is pending or the context allows no move.
+        """
+        gs = self.game_state
+        context = gs.conquest_context
+        if not gs.requires_post_attack_fortify or not context:
+            return None
+        # If max_movable is < 0 (should not happen), no valid PAF action.
+        # This implies an issue in conquest_context setup.
+        if context["max_movable"] < 0: # Allow 0 move if that's the only option
+            return None
+        return {
+            "type": "POST_ATTACK_FORTIFY",
+            "from_territory": context["from_territory_name"],
+            "to_territory": context["to_territory_name"],
+            "min_armies": context["min_movable"],
+            "max_armies": context["max_movable"],
+        }
+
     def is_game_over(self) -> Player | None:
         """
         Checks for win conditions:
@@ -1803,6 +1817,7 @@ class GameEngine:
         """
         Advances to the next player and resets turn-specific state.
         """
+        self.game_state.version += 1
         gs = self.game_state
         if not gs.players:
             return
@@ -1873,7 +1888,7 @@ class GameEngine:
             # Try to reset to the first active human player.
             if active_human_players:
                 try:
-                    gs.current_player_index = gs.players.index(active_human_players[0])
+                    gs.current_player_index = gs.index_of_player(active_human_players[0])
                     print(f"Warning: Next player not found by iteration, reset to first active human: {active_human_players[0].name}")
                 except ValueError:
                     print("Error: Could not find first active human player in main player list after next_turn error.")
@@ -1897,13 +1912,12 @@ class GameEngine:
                 new_current_player_obj.armies_to_deploy = reinforcements
                 if controlled_continents:
                     # Log continent control event
-                    gs.event_history.append({
-                        "turn": gs.current_turn_number,
-                        "type": "CONTINENT_CONTROL_UPDATE", # Or "CONTINENT_CONQUERED" if we track "newly"
-                        "player": new_current_player_obj.name,
-                        "controlled_continents": controlled_continents,
-                        "reinforcement_bonus_from_continents": sum(gs.continents[c].bonus_armies for c in controlled_continents if c in gs.continents)
-                    })
+                    gs.event_history.append(ContinentControlEvent(
+                        gs.current_turn_number,
+                        new_current_player_obj.name,
+                        controlled_continents,
+                        sum(gs.continents[c].bonus_armies for c in controlled_continents if c in gs.continents)
+                    ))
         else:
             print("CRITICAL ERROR in next_turn: No current player after advancing turn.")
 
@@ -1922,10 +1936,10 @@ class GameEngine:
         # Check for mandatory post-elimination card trade first. This overrides other actions.
         if gs.elimination_card_trade_player_name == player.name:
             if len(player.hand) <= 4: # Target is 4 or fewer cards
-                gs.elimination_card_trade_player_name = None # Requirement met
+                self.clear_elimination_card_trade() # Requirement met
                 # Fall through to regular actions for the current phase (e.g. post_attack_fortify or attack)
             else:
-                valid_card_sets = self.find_valid_card_sets(player)
+                valid_card_sets = self.find_valid_card_set_indices(player)
                 if not valid_card_sets:
                     # Player has > 4 cards but no sets to trade. This is an edge case.
                     # As per rules "once your hand is reduced to 4,3, or 2 cards, you must stop trading."
@@ -1939,37 +1953,28 @@ class GameEngine:
                     # This means if you have 5 cards and make a trade, you get to 2 + new armies.
                     # If you have 5 cards and CANNOT make a trade, you stop.
                     if len(player.hand) >=5 and not valid_card_sets: # Cannot make a trade to reduce hand
-                         gs.elimination_card_trade_player_name = None # Consider requirement met as impossible to proceed
+                         self.clear_elimination_card_trade() # Consider requirement met as impossible to proceed
                     # Fall through to regular actions.
                 else: # Has sets and must trade
-                    for card_set in valid_card_sets:
-                        card_indices_in_hand = [player.hand.index(c) for c in card_set if c in player.hand]
+                    for card_indices_in_hand in valid_card_sets:
                         if len(card_indices_in_hand) == 3:
                             actions.append({
                                 "type": "TRADE_CARDS",
-                                "card_indices": sorted(card_indices_in_hand),
+                                "card_indices": list(card_indices_in_hand),
                                 "must_trade": True, # This is a mandatory trade due to elimination
                                 "reason": "Post-elimination mandatory trade"
                             })
                     if actions: # Only trade actions are allowed
                         return actions
                     else: # No valid sets found, despite hand > 4. Clear flag.
-                        gs.elimination_card_trade_player_name = None
+                        self.clear_elimination_card_trade()
                         # Fall through to regular actions.
 
         # Check for mandatory post-attack fortification next, as this takes precedence over other phase actions.
         if gs.requires_post_attack_fortify and gs.conquest_context:
-            context = gs.conquest_context
-            if context["max_movable"] >= 0 : # Allow 0 move if that's the only option
-                actions.append({
-                    "type": "POST_ATTACK_FORTIFY",
-                    "from_territory": context["from_territory_name"],
-                    "to_territory": context["to_territory_name"],
-                    "min_armies": context["min_movable"],
-                    "max_armies": context["max_movable"],
-                })
-            # If max_movable is < 0 (should not happen), no valid PAF action.
-            # This implies an issue in conquest_context setup.
+            paf_action = self.get_paf_action(player)
+            if paf_action is not None:
+                actions.append(paf_action)
             # If actions list is empty here, orchestrator might need to auto-resolve PAF.
             return actions # Return immediately, only PAF is valid.
 
@@ -2018,10 +2023,7 @@ class GameEngine:
 
         if phase == "SETUP_CLAIM_TERRITORIES":
             if player.is_neutral: return [] # Should not happen if setup_order is correct
-            if gs.unclaimed_territory_names:
-                for terr_name in gs.unclaimed_territory_names:
-                     actions.append({"type": "SETUP_CLAIM", "territory": terr_name})
-            return actions
+            return [{"type": "SETUP_CLAIM", "territory": terr_name} for terr_name in gs.unclaimed_territory_names]
 
         if phase == "SETUP_PLACE_ARMIES": # Standard setup
             if player.is_neutral: return []
@@ -2044,17 +2046,16 @@ class GameEngine:
             # Player must trade cards if they have 5 or more.
             # Otherwise, they can choose to trade if they have a valid set.
 
-            must_trade = len(player.hand) >= 5
-            valid_card_sets = self.find_valid_card_sets(player)
+            must_trade = player.must_trade
+            valid_card_sets = self.find_valid_card_set_indices(player)
             trade_actions = []
 
             if valid_card_sets:
-                for card_set in valid_card_sets:
-                    card_indices_in_hand = [player.hand.index(c) for c in card_set if c in player.hand]
-                    if len(card_indices_in_hand) == 3: # Ensure all cards are found
+                for card_indices_in_hand in valid_card_sets: # Ascending index triples
+                    if len(card_indices_in_hand) == 3:
                         trade_actions.append({
                             "type": "TRADE_CARDS",
-                            "card_indices": sorted(card_indices_in_hand),
+                            "card_indices": list(card_indices_in_hand),
                             "must_trade": must_trade # Correctly reflects if the trade is mandatory
                         })
 
@@ -2104,28 +2105,19 @@ class GameEngine:
 
         elif phase == "ATTACK":
             # Valid attack actions: (from_territory, to_territory, num_armies)
+            # Resolve this player's diplomatic standing once, instead of hashing a frozenset per neighbour.
+            dip_statuses = gs.diplomatic_statuses_for(player.name)
             for territory in player.territories:
                 if territory.army_count > 1:
-                    # territory.adjacent_territories now holds dicts like {"name": "other_terr", "type": "land"}
-                    for adj_info in territory.adjacent_territories:
-                        if not isinstance(adj_info, dict) or "name" not in adj_info:
-                            continue # Skip malformed entries
-
-                        neighbor_name = adj_info["name"]
-                        neighbor_obj = gs.territories.get(neighbor_name)
-
-                        if not neighbor_obj: # Should not happen if map is consistent
-                            print(f"Warning: Neighbor territory '{neighbor_name}' not found in game state for attack check from '{territory.name}'.")
-                            continue
-
+                    # territory.neighbors holds the resolved Territory objects of its adjacencies (land, sea, air)
+                    for neighbor_obj in territory.neighbors:
                         if neighbor_obj.owner != player: # Can only attack territories not owned by the player
                             # All types of adjacencies (land, sea, air) allow attack for now.
-                            diplomatic_key = frozenset({player.name, neighbor_obj.owner.name}) if neighbor_obj.owner else None
-                            current_status = gs.diplomacy.get(diplomatic_key) if diplomatic_key else "NEUTRAL" # Treat unowned/neutral owner as NEUTRAL diplo
+                            current_status = dip_statuses.get(neighbor_obj.owner.name) if neighbor_obj.owner else "NEUTRAL" # Treat unowned/neutral owner as NEUTRAL diplo
 
                             action_details = {
                                 "from": territory.name,
-                                "to": neighbor_name, # Use neighbor_name from adj_info
+                                "to": neighbor_obj.name,
                                 "max_armies_for_attack": territory.army_count - 1
                             }
 
@@ -2174,12 +2166,12 @@ class GameEngine:
 
             # Diplomacy related actions (PROPOSE_ALLIANCE, BREAK_ALLIANCE)
             # ACCEPT_ALLIANCE is typically presented by Orchestrator if a proposal is pending.
+            dip_statuses = gs.diplomatic_statuses_for(player.name)
             for other_player in gs.players:
                 if other_player == player or other_player.is_neutral:
                     continue
 
-                diplomatic_key = frozenset({player.name, other_player.name})
-                current_status = gs.diplomacy.get(diplomatic_key)
+                current_status = dip_statuses.get(other_player.name)
 
                 if not current_status or current_status == "NEUTRAL":
                     # Can propose alliance if neutral or no status
@@ -2189,7 +2181,7 @@ class GameEngine:
                     })
 
                 # Check for pending proposals TO the current player
-                proposal_details = gs.active_diplomatic_proposals.get(diplomatic_key)
+                proposal_details = gs.active_diplomatic_proposals.get(frozenset({player.name, other_player.name})) if gs.active_diplomatic_proposals else None
                 if proposal_details and proposal_details.get('target') == player.name:
                     # Proposal exists, and current player is the target
                     if proposal_details.get('type') == 'ALLIANCE': # Assuming only alliance proposals for now
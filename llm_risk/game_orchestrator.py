@@ -1,6 +1,8 @@
 from .game_engine.engine import GameEngine
 from .game_engine.data_structures import Player as GamePlayer # To avoid confusion with AI Player concepts
+from .game_engine.data_structures import CardTradeEvent, DiplomacyProposalEvent, AllianceFormedEvent, AllianceBrokenEvent, FortifyAction, PlayerConfig
 from .ai.base_agent import BaseAIAgent, GAME_RULES_SNIPPET
+from .ai.response_store import AIResponseStore
 from .communication.global_chat import GlobalChat
 from .communication.private_chat_manager import PrivateChatManager
 from .ui.gui import GameGUI # Import for GUI updates later
@@ -15,28 +17,237 @@ from .ai.qwen_agent import QwenAgent
 from .ai.mistral_agent import MistralAgent
 from .game_orchestrator_diplomacy_helper import _process_diplomatic_action # Import the helper
 import threading # For asynchronous AI calls
+from concurrent.futures import Executor, ThreadPoolExecutor, Future, wait # Reused worker threads for AI calls
+import queue # Hands AI thought log lines to the background writer
+import contextvars # AI calls run in the submitting thread's context
+import itertools # For enumerating player pairs and numbering snapshots
+from collections import deque, OrderedDict # Bounded turn_action_log; LRU response cache
+import copy # For handing out copies of cached AI responses
+import pickle # For game snapshots (take_snapshot / branch_from)
+import random # Snapshots capture the dice RNG state
 
 import json # For loading player configs if any
 import time # For potential delays
 from datetime import datetime # For logging timestamp
 import os # For log directory creation
+import sys # sys.intern for restored phase strings
+import weakref # Closes the persistent log handles without pinning the orchestrator
+try:
+    import orjson # Optional: faster encoding of AI thought log lines
+except ImportError:
+    orjson = None
+import logging # Diagnostic output; enabled by main.py --debug
+from operator import itemgetter # For unpacking AI action parameters
+
+logger = logging.getLogger(__name__)
+
+# Post-attack fortify prompt, formatted per conquest.
+_PAF_TMPL = ("You conquered {to}. You MUST move between {mn} and {mx} armies "
+             "from {fr} (currently has {cur} armies) "
+             "to the newly conquered {to}.")
+
+# FORTIFY prompt additions, selected by player.has_fortified_this_turn.
+_FORTIFY_PROMPT_OPEN = ("It is your FORTIFY phase. Fortified this turn: False. "
+                        "Make one fortification move (remember to specify 'num_armies') or choose to end your turn.")
+_FORTIFY_PROMPT_DONE = ("It is your FORTIFY phase. Fortified this turn: True. "
+                        "You have already fortified. You must end your turn.")
+
+# REINFORCE prompt addition; trade_hint is "" or one of the hints below (each carries its leading space).
+_REINFORCE_PROMPT_TMPL = ("It is your REINFORCE phase. You have {armies} armies to deploy. "
+                          "You currently hold {cards} cards.{trade_hint}")
+_REINFORCE_MUST_TRADE_HINT = " You MUST trade cards as you have 5 or more and a valid set is available."
+_REINFORCE_MAY_TRADE_HINT = " You may optionally trade cards if you have a valid set."
+
+# Regular ATTACK prompt addition; opponents is "" or " Opponents: ...".
+_ATTACK_PROMPT_TMPL = ("It is your attack phase. You have made {attacks} attacks this turn. "
+                       "You have {cards} cards.{opponents}")
+
+# Valid actions offered when choosing Neutral's defense dice (2P mode, neutral has 2+ armies). Shared; never mutated.
+_NEUTRAL_DEFENSE_DICE_OPTIONS = [{"type": "CHOOSE_DEFENSE_DICE", "num_dice": 1}, {"type": "CHOOSE_DEFENSE_DICE", "num_dice": 2}]
+
+# Action parameter unpackers; a missing key raises KeyError and is reported as invalid parameters.
+_attack_get = itemgetter("from", "to", "num_armies")
+_deploy_get = itemgetter("territory", "num_armies")
+_private_chat_get = itemgetter("target_player_name", "initial_message")
+
+# Setup phases in which no player is due to act (get_agent_for_current_player returns None).
+_NO_ACTOR_PHASES = frozenset(("SETUP_START", "SETUP_DETERMINE_ORDER", "SETUP_2P_DEAL_CARDS"))
+# Setup phases whose acting player comes from gs.player_setup_order rather than the turn order.
+_SETUP_ORDER_PHASES = frozenset(("SETUP_CLAIM_TERRITORIES", "SETUP_PLACE_ARMIES"))
+
+# Valid action template fields that the agent replaces with its own value (chat templates carry "..." placeholders).
+_AGENT_FILLED_KEYS = frozenset(("num_armies", "message", "initial_message"))
+# Template fields that only describe the choice (bounds, notes); agents need not copy them into their answer.
+_TEMPLATE_HINT_KEYS = frozenset(("max_armies", "max_armies_for_attack", "max_armies_to_move", "min_armies", "must_trade", "reason"))
+
+# Player config "ai_type" -> agent class; unknown types fall back to Gemini.
+_AGENT_CLASSES: dict[str, type[BaseAIAgent]] = {
+    "Gemini": GeminiAgent,
+    "OpenAI": OpenAIAgent,
+    "Claude": ClaudeAgent,
+    "DeepSeek": DeepSeekAgent,
+    "Llama": LlamaAgent,
+    "Qwen": QwenAgent,
+    "Mistral": MistralAgent,
+}
+
+def _call_agent(agent: BaseAIAgent, game_state_json: str, valid_actions: list, game_rules: str, system_prompt_addition: str) -> dict:
+    """Runs on an AI worker and returns the agent's response. Module-level so process pools can pickle it;
+    it does not touch orchestrator state (the main thread picks the result up in _collect_ai_result())."""
+    try:
+        return agent.get_thought_and_action(
+            game_state_json, valid_actions, game_rules, system_prompt_addition
+        )
+    except Exception as e:
+        print(f"Error in AI thread for {agent.player_name}: {e}")
+        return {"error": str(e), "thought": f"Error during API call: {e}", "action": None} # Ensure a dict is returned
+
+def _run_private_chat(private_chat_manager: PrivateChatManager, chat_kwargs: dict) -> tuple[list[dict], dict | None]:
+    """Runs a whole private conversation on an AI worker thread and returns (conversation log, negotiated action).
+    The orchestrator applies the outcome on the main thread in _finish_private_chat()."""
+    try:
+        return private_chat_manager.run_conversation(**chat_kwargs)
+    except Exception as e:
+        print(f"Error in private chat thread: {e}")
+        return [], None
+
+def _log_writer_loop(log_queue: queue.SimpleQueue, game_fh, thought_fh):
+    """
+    Log-writer thread body: drains the orchestrator's _log_queue into the game/thought logs. Items are
+    (handle, timestamp, player, text), with player None for game log lines; a threading.Event is set once
+    everything queued before it is flushed, and a None item stops the loop. Handles are flushed once per
+    drained batch rather than per line. Takes no orchestrator reference, so the thread does not keep it alive.
+    """
+    while True:
+        item = log_queue.get()
+        dirty = set()
+        waiters = []
+        while item is not None:
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+            else:
+                fh, timestamp, player_name, text = item
+                try:
+                    if fh is game_fh:
+                        fh.write(f"[{timestamp}] {text}\n")
+                    else:
+                        log_entry = {"timestamp": timestamp, "player": player_name, "thought": text}
+                        fh.write((orjson.dumps(log_entry).decode() if orjson is not None else json.dumps(log_entry)) + "\n")
+                    dirty.add(fh)
+                except (IOError, ValueError) as e: # ValueError: handle already closed
+                    print(f"Error writing to {'game log' if fh is game_fh else 'AI thought log'}: {e}")
+            try:
+                item = log_queue.get_nowait()
+            except queue.Empty:
+                break
+        for fh in dirty:
+            try:
+                fh.flush()
+            except (IOError, ValueError) as e:
+                print(f"Error flushing log file {fh.name}: {e}")
+        for event in waiters:
+            event.set()
+        if item is None:
+            return
+
+def _stop_log_writer(log_queue: queue.SimpleQueue, writer: threading.Thread, game_fh, thought_fh):
+    """Stops the log-writer thread after it drained the queue, then closes both log handles.
+    Runs once, via the orchestrator's weakref.finalize (close_logs(), garbage collection or interpreter exit)."""
+    if writer.is_alive():
+        log_queue.put(None) # Let the writer drain what is queued, then stop
+        writer.join(timeout=5)
+    game_fh.close()
+    thought_fh.close()
 
 class GameOrchestrator:
+    EVENT_HISTORY_TURN_HORIZON = 20 # Default for event_history_turn_horizon
+    TURN_ACTION_LOG_MAXLEN = 2000 # Cap on turn_action_log; the oldest entries are dropped beyond it
+    AI_WORKERS = 2 # Worker threads kept for AI calls; only one call is awaited at a time
+    AI_RESPONSE_CACHE_PHASES = frozenset({"SETUP_CLAIM_TERRITORIES", "SETUP_PLACE_ARMIES"}) # See reuse_setup_ai_responses
+    AI_PLAY_RESPONSE_CACHE_PHASES = frozenset({"REINFORCE", "ATTACK", "FORTIFY"}) # See reuse_play_ai_responses
+    AI_RESPONSE_CACHE_MAXSIZE = 4096 # Least recently used responses are dropped beyond this
+
     def __init__(self,
                  player_configs_override: list | None = None,
                  default_player_setup_file: str = "player_config.json",
                  game_mode: str = "standard",
                  auto_initialize_board: bool = False, # New flag
                  geojson_data_str: str | None = None,
-                 map_file_path_override: str | None = None): # Added for testability
+                 map_file_path_override: str | None = None, # Added for testability
+                 ai_executor: Executor | None = None,
+                 event_history_turn_horizon: int | None = EVENT_HISTORY_TURN_HORIZON,
+                 headless: bool = False, # No GUI; run_game() plays to the end without a window
+                 log_dir: str = "logs"): # Game, AI thought and chat logs; separate per game when several run at once
 
         self.game_mode = game_mode
+        self.headless = headless
+        self.log_dir = log_dir
+        # event_history keeps only events that arrived in the last this-many turns; None keeps everything
+        # (up to GameState.EVENT_HISTORY_MAXLEN).
+        self.event_history_turn_horizon = event_history_turn_horizon
+        # Persistent, buffered handles for log_turn_info / log_ai_thought instead of an open/close per line.
+        os.makedirs(log_dir, exist_ok=True)
+        self._game_log_fh = open(os.path.join(log_dir, "game_log.txt"), 'a', encoding='utf-8', buffering=1 << 16)
+        self._thought_log_fh = open(os.path.join(log_dir, "ai_thoughts.jsonl"), 'a', encoding='utf-8', buffering=1 << 16)
+        self._ts_cache: tuple[int, str] = (0, "") # (epoch second, ISO string) for _now_iso()
+        # Game log lines and AI thoughts are formatted and written by a daemon thread, which owns both
+        # handles from here on and flushes them once per drained batch. See _log_writer_loop.
+        self._log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._log_writer = threading.Thread(target=_log_writer_loop, name="log-writer", daemon=True,
+                                            args=(self._log_queue, self._game_log_fh, self._thought_log_fh))
+        self._log_writer.start()
+        # Stops the writer and closes the handles on close_logs(), or at the latest when the orchestrator is
+        # garbage collected or the interpreter exits; unlike an atexit hook it does not keep the orchestrator alive.
+        self._log_finalizer = weakref.finalize(self, _stop_log_writer, self._log_queue, self._log_writer,
+                                               self._game_log_fh, self._thought_log_fh)
+        # Cached once per turn in advance_game_turn; guards the expensive repr() dumps of actions/responses.
+        self._debug_on = logger.isEnabledFor(logging.DEBUG)
+        # (key, actions, actions_by_type) for the last get_valid_actions call made via _get_valid_actions_cached.
+        self._va_cache: tuple | None = None
+        # ((gs.version, player name, attacks this turn), prompt addition) for the last regular ATTACK prompt
+        self._attack_prompt_cache: tuple | None = None
+        # Interned frozenset keys for gs.diplomacy / gs.active_diplomatic_proposals, keyed by both name orders.
+        # Pre-filled for all human pairs in _map_game_players_to_ai_agents; see _dip_key()
+        self._dip_key_cache: dict[tuple[str, str], frozenset[str]] = {}
+        # Per-phase action dispatch tables: action type -> handler(player, agent, action) -> state_changed
+        self._reinforce_handlers = {
+            "TRADE_CARDS": self._handle_reinforce_trade_cards,
+            "DEPLOY": self._handle_reinforce_deploy,
+            "END_REINFORCE_PHASE": self._handle_reinforce_end_phase,
+            "ACCEPT_ALLIANCE": self._handle_diplomatic_response,
+            "REJECT_ALLIANCE": self._handle_diplomatic_response,
+        }
+        # Setup phase -> handler() -> bool, for advance_game_turn; any other phase is a regular game turn
+        self._setup_phase_handlers = {
+            "SETUP_START": self._handle_setup_start,
+            "SETUP_DETERMINE_ORDER": self._handle_setup_determine_order,
+            "SETUP_CLAIM_TERRITORIES": self._handle_setup_claim_territories,
+            "SETUP_PLACE_ARMIES": self._handle_setup_place_armies,
+            "SETUP_2P_DEAL_CARDS": self._handle_setup_2p_deal_cards,
+            "SETUP_2P_PLACE_REMAINING": self._handle_setup_2p_place_remaining,
+        }
+        # Main-game phase -> (initiate(player, agent), process(player, agent, ai_response)) for advance_game_turn
+        self._play_phase_handlers = {
+            "REINFORCE": (self._initiate_reinforce_ai_action, self._process_reinforce_ai_action),
+            "ATTACK": (self._initiate_attack_ai_action, self._process_attack_ai_action),
+            "FORTIFY": (self._initiate_fortify_ai_action, self._process_fortify_ai_action),
+        }
+        self._attack_handlers = {
+            "POST_ATTACK_FORTIFY": self._handle_attack_post_attack_fortify,
+            "ATTACK": self._handle_attack_attack,
+            "END_ATTACK_PHASE": self._handle_attack_end_phase,
+            "GLOBAL_CHAT": self._handle_attack_global_chat,
+            "PRIVATE_CHAT": self._handle_attack_private_chat,
+            "BREAK_ALLIANCE": self._handle_attack_break_alliance,
+            "ACCEPT_ALLIANCE": self._handle_diplomatic_response,
+            "REJECT_ALLIANCE": self._handle_diplomatic_response,
+        }
         self.auto_initialize_board = auto_initialize_board if self.game_mode == "standard" else False
-        print(f"DEBUG: GameOrchestrator.__init__ - Received game_mode: {self.game_mode}, auto_initialize_board: {self.auto_initialize_board}")
+        logger.debug(f"GameOrchestrator.__init__ - Received game_mode: {self.game_mode}, auto_initialize_board: {self.auto_initialize_board}")
 
         map_file_to_load = map_file_path_override if map_file_path_override else "map_config.json"
         if map_file_path_override:
-            print(f"DEBUG: GameOrchestrator.__init__ - Using map_file_path_override: {map_file_path_override}")
+            logger.debug(f"GameOrchestrator.__init__ - Using map_file_path_override: {map_file_path_override}")
 
         self.map_display_config_to_load = "map_display_config.json" # Default for standard, can be overridden if needed later
 
@@ -44,7 +255,7 @@ class GameOrchestrator:
             if map_file_path_override:
                 # If world_map and override is given, it implies the map processor step is skipped
                 # and these override paths point to pre-generated world map configs.
-                print(f"DEBUG: GameOrchestrator.__init__ - World_map mode with map_file_path_override: {map_file_path_override}. Map processing step will be skipped.")
+                logger.debug(f"GameOrchestrator.__init__ - World_map mode with map_file_path_override: {map_file_path_override}. Map processing step will be skipped.")
                 map_file_to_load = map_file_path_override
                 # Display config might also need an override mechanism if tests require specific display for world_map.
                 # For now, assume if map_file_path_override is for world_map_config.json, then map_display_config.json is its pair.
@@ -64,7 +275,7 @@ class GameOrchestrator:
                         try:
                             with open(default_geojson_path, 'r', encoding='utf-8') as f:
                                 geojson_data_str = f.read()
-                            print(f"DEBUG: GameOrchestrator - Fallback: Loaded GeoJSON from {default_geojson_path}")
+                            logger.debug(f"GameOrchestrator - Fallback: Loaded GeoJSON from {default_geojson_path}")
                         except Exception as e:
                             raise ValueError(f"Fallback load of {default_geojson_path} failed: {e}")
                     else:
@@ -75,7 +286,7 @@ class GameOrchestrator:
                 os.makedirs(generated_map_dir, exist_ok=True) # Ensure directory exists
                 map_file_to_load = os.path.join(generated_map_dir, "world_map_config.json") # Will be generated
                 self.map_display_config_to_load = os.path.join(generated_map_dir, "world_map_display_config.json") # Will be generated
-                print(f"DEBUG: GameOrchestrator.__init__ - world_map mode: map_file_to_load set to '{map_file_to_load}', map_display_config_to_load set to '{self.map_display_config_to_load}' for generation.")
+                logger.debug(f"GameOrchestrator.__init__ - world_map mode: map_file_to_load set to '{map_file_to_load}', map_display_config_to_load set to '{self.map_display_config_to_load}' for generation.")
 
                 print(f"Initializing World Map game mode. Processing GeoJSON...")
                 try:
@@ -86,22 +297,22 @@ class GameOrchestrator:
                     processor = MapProcessor(geojson_data, MAP_AREA_WIDTH_FOR_PROCESSING, MAP_AREA_HEIGHT_FOR_PROCESSING)
                     processor.save_configs(map_file_to_load, self.map_display_config_to_load)
                     print(f"World map configurations generated: {map_file_to_load}, {self.map_display_config_to_load}")
-                    # DEBUG: Inspect content of the generated display config
-                    try:
-                        with open(self.map_display_config_to_load, 'r') as f_inspect:
-                            f_inspect.seek(0)
-                            loaded_json_for_debug = json.load(f_inspect)
-                            if isinstance(loaded_json_for_debug, dict):
-                                print(f"DEBUG: GameOrchestrator - Generated display config keys: {list(loaded_json_for_debug.keys())}")
-                                if "territory_polygons" in loaded_json_for_debug:
-                                    print(f"DEBUG: GameOrchestrator - 'territory_polygons' has {len(loaded_json_for_debug['territory_polygons'])} entries.")
-                                if "territory_centroids" in loaded_json_for_debug:
-                                    print(f"DEBUG: GameOrchestrator - 'territory_centroids' has {len(loaded_json_for_debug['territory_centroids'])} entries.")
-                            else:
-                                print(f"DEBUG: GameOrchestrator - Generated display config is not a dictionary. Type: {type(loaded_json_for_debug)}")
-
-                    except Exception as e_inspect:
-                        print(f"DEBUG: GameOrchestrator - Error inspecting generated display config: {e_inspect}")
+                    if self._debug_on: # Inspect content of the generated display config
+                        try:
+                            with open(self.map_display_config_to_load, 'r') as f_inspect:
+                                f_inspect.seek(0)
+                                loaded_json_for_debug = json.load(f_inspect)
+                                if isinstance(loaded_json_for_debug, dict):
+                                    logger.debug(f"GameOrchestrator - Generated display config keys: {list(loaded_json_for_debug.keys())}")
+                                    if "territory_polygons" in loaded_json_for_debug:
+                                        logger.debug(f"GameOrchestrator - 'territory_polygons' has {len(loaded_json_for_debug['territory_polygons'])} entries.")
+                                    if "territory_centroids" in loaded_json_for_debug:
+                                        logger.debug(f"GameOrchestrator - 'territory_centroids' has {len(loaded_json_for_debug['territory_centroids'])} entries.")
+                                else:
+                                    logger.debug(f"GameOrchestrator - Generated display config is not a dictionary. Type: {type(loaded_json_for_debug)}")
+
+                        except Exception as e_inspect:
+                            logger.debug(f"GameOrchestrator - Error inspecting generated display config: {e_inspect}")
 
                 except json.JSONDecodeError:
                     raise ValueError("Invalid GeoJSON data string provided.")
@@ -116,23 +327,60 @@ class GameOrchestrator:
 
         self.engine = GameEngine(map_file_path=map_file_to_load)
         # Removed duplicated block that was causing IndentationError
-        self.global_chat = GlobalChat()
-        self.private_chat_manager = PrivateChatManager(max_exchanges_per_conversation=3)
+        self.global_chat = GlobalChat(log_dir=log_dir)
+        self.private_chat_manager = PrivateChatManager(max_exchanges_per_conversation=3, log_dir=log_dir)
 
         # Attributes for asynchronous AI calls - INITIALIZE THEM HERE
         self.ai_is_thinking: bool = False
-        self.current_ai_thread: threading.Thread | None = None
+        # AI calls run on a small reused pool instead of a new thread per call; _ai_future tracks the pending one.
+        # A caller-supplied executor (e.g. a ProcessPoolExecutor for CPU-bound local agents) replaces the thread
+        # pool; with a process pool the agents must be picklable, and their state changes stay in the worker.
+        self._ai_executor_is_threaded = ai_executor is None or isinstance(ai_executor, ThreadPoolExecutor)
+        self._owns_ai_executor = ai_executor is None # Only a pool created here is shut down by close()
+        if ai_executor is None:
+            ai_executor = ThreadPoolExecutor(max_workers=self.AI_WORKERS, thread_name_prefix="ai-turn")
+        self._ai_executor: Executor = ai_executor
+        self._ai_future: Future | None = None
+        # Opt-in: replay an agent's earlier valid answer when it is asked the exact same setup question again
+        # (same phase, valid actions and board). Only sensible for deterministic (temperature 0) agents.
+        self.reuse_setup_ai_responses: bool = False
+        # Opt-in, same idea for main-game decisions: keyed additionally on the player's hand, diplomatic
+        # statuses and prompt addition, but not on chat or event history.
+        self.reuse_play_ai_responses: bool = False
+        self._ai_response_cache: OrderedDict[tuple, dict] = OrderedDict() # Oldest first; hits move to the end (LRU)
+        # Optional on-disk backing for _ai_response_cache, so reused responses survive restarts.
+        # Consulted on in-memory misses and written alongside it; only used when reuse is enabled above.
+        self.response_store: AIResponseStore | None = None
+        self._last_response_cache_hit: tuple | None = None # (key, gs.version) of the last replayed response
+        self._pending_response_cache_entry: tuple[tuple, list] | None = None # (key, valid_actions) of the call in flight
+        # Opt-in: in SETUP_2P_PLACE_REMAINING, ask the other human for their next placement while the current
+        # player's call is in flight. The answer is used only if that player's valid actions are unchanged by
+        # then; it was given against the board before the current player's placement.
+        self.speculate_2p_setup_turns: bool = False
+        self._speculative_ai_call: tuple[str, list, Future] | None = None # (player name, valid_actions, future)
+        # snapshot id -> (pickled game/chat/RNG state, ai_agents at that point); see take_snapshot() / branch_from()
+        self._snapshots: dict[int, tuple[bytes, dict]] = {}
+        self._snapshot_ids = itertools.count() # Ids are never reused, so dropped snapshots stay unknown
         self.ai_action_result: dict | None = None
         self.active_ai_player_name: str | None = None # Name of the player whose AI is thinking
         self.current_ai_context: dict | None = None # Context for the current AI call
+        self.pending_neutral_defense: dict | None = None # 2P: attack waiting on the other human's neutral defense dice choice
+        self.pending_private_chat: dict | None = None # PRIVATE_CHAT whose conversation is running on an AI worker
+        self._event_buffer: list = [] # Orchestrator-side events, moved into event_history by _flush_event_buffer()
+        self._committed_turn: int = 0 # Turn at which event_history was last trimmed
+        # (turn, event_history.appended) when each turn was first flushed, oldest first; see _flush_event_buffer()
+        self._turn_start_seqs: deque[tuple[int, int]] = deque()
         self.has_logged_ai_is_thinking_for_current_action: bool = False
         self.has_logged_current_turn_player_phase: bool = False # For logging headers
+        self._gui_dirty: bool = False # Set by _update_gui_full_state(); pushed once per advance_game_turn() tick
         # self.gui is initialized after engine and player setup
         self.gui = None
 
         # AI agents and player_map are initialized after players are loaded by _load_player_setup
         self.ai_agents: dict[str, BaseAIAgent] = {}
         self.player_map: dict[GamePlayer, BaseAIAgent] = {}
+        self.agents_by_player_name: dict[str, BaseAIAgent] = {} # Same mapping keyed by name, robust to stale GamePlayer objects
+        self.two_player_opponent_by_name: dict[str, GamePlayer] = {} # 2P mode only: human name -> the other human
         self.is_two_player_mode: bool = False # Will be set in _load_player_setup
 
 
@@ -159,27 +407,75 @@ class GameOrchestrator:
         self._map_game_players_to_ai_agents()
 
         # Initialize GUI now that engine and players are fully set up
-        self.setup_gui() # Moved the single call here
+        if not headless:
+            self.setup_gui() # Moved the single call here
 
         self.game_rules = GAME_RULES_SNIPPET
-        self.turn_action_log = []
+        self.turn_action_log: deque = deque(maxlen=self.TURN_ACTION_LOG_MAXLEN)
         self.max_turns = 200 # Default, could be configurable
         self.game_running_via_gui = False
 
-    def _ai_thread_target(self, agent: BaseAIAgent, game_state_json: str, valid_actions: list, game_rules: str, system_prompt_addition: str):
-        """Target function for the AI thinking thread."""
-        try:
-            self.ai_action_result = agent.get_thought_and_action(
-                game_state_json, valid_actions, game_rules, system_prompt_addition
-            )
-            # It's important to also capture whose thought this was, if applicable for logging/display
-            # self.active_ai_player_name is already set before thread start
-        except Exception as e:
-            print(f"Error in AI thread for {agent.player_name}: {e}")
-            self.ai_action_result = {"error": str(e), "thought": f"Error during API call: {e}", "action": None} # Ensure a dict is returned
+    def _submit_ai_call(self, agent: BaseAIAgent, game_state_json: str, valid_actions: list, game_rules: str, system_prompt_addition: str) -> Future:
+        """Submits one agent call to the AI executor and returns its future."""
+        args = (agent, game_state_json, valid_actions, game_rules, system_prompt_addition)
+        if not self._ai_executor_is_threaded:
+            return self._ai_executor.submit(_call_agent, *args)
+        # Pool threads do not inherit context variables; run the call in a copy of the caller's context
+        # so per-request settings (log correlation ids, SDK/tracing context) reach the agent.
+        return self._ai_executor.submit(contextvars.copy_context().run, _call_agent, *args)
+
+    def _collect_ai_result(self):
+        """Moves a finished AI call's response into ai_action_result (main thread only).
+        Cached and branch-override responses are set directly and leave the future's result as None."""
+        future = self._ai_future
+        if future is None or not future.done():
+            return
+        result = future.result()
+        if result is None:
+            return
+        self.ai_action_result = result
+        if self._pending_response_cache_entry is not None:
+            response_cache_key, valid_actions = self._pending_response_cache_entry
+            self._pending_response_cache_entry = None
+            if isinstance(result, dict) and self._matches_valid_action(result.get("action"), valid_actions): # Only remember plausible answers
+                self._cache_ai_response(response_cache_key, copy.deepcopy(result))
+                if self.response_store is not None:
+                    self.response_store.set(self._response_store_key(response_cache_key), result)
+
+    def _cache_ai_response(self, response_cache_key: tuple, response: dict):
+        """Stores a response as the most recently used entry, dropping the least recently used beyond the cap."""
+        cache = self._ai_response_cache
+        cache[response_cache_key] = response
+        cache.move_to_end(response_cache_key) # Replacing an entry keeps its old position otherwise
+        if len(cache) > self.AI_RESPONSE_CACHE_MAXSIZE:
+            cache.popitem(last=False)
+
+    def _poll_ai_result(self, handler_name: str) -> tuple[bool, str | None, dict | None]:
+        """
+        Shared AI-call bookkeeping for the setup handlers. Returns (busy, player_name, ai_response):
+        busy is True while the call is still running; otherwise a finished call's response (if any) is
+        handed over together with the acting player's name, and the per-call state is cleared.
+        """
+        if self.ai_is_thinking:
+            if self._ai_future and not self._ai_future.done():
+                return True, None, None
+            self.log_turn_info(f"Orchestrator: AI ({self.active_ai_player_name or 'no active_ai_player_name'}) thread finished (detected in {handler_name}).")
+            self._collect_ai_result()
+            self.ai_is_thinking = False
 
-    def _execute_ai_turn_async(self, agent: BaseAIAgent, game_state_json: str, valid_actions: list, game_rules: str, system_prompt_addition: str):
-        """Initiates the AI call in a separate thread."""
+        ai_response = self.ai_action_result
+        if not ai_response:
+            return False, None, None
+        player_name = self.active_ai_player_name # Set when the AI call was made
+        # Clear context related to the completed AI action
+        self.ai_action_result = None
+        self.active_ai_player_name = None
+        self.current_ai_context = None
+        return False, player_name, ai_response
+
+    def _execute_ai_turn_async(self, agent: BaseAIAgent, game_state_json: str, valid_actions: list, game_rules: str, system_prompt_addition: str,
+                               future: Future | None = None):
+        """Initiates the AI call on the AI worker pool, or awaits an already submitted call's future instead."""
         if self.ai_is_thinking:
             print(f"Warning: _execute_ai_turn_async called while AI for {self.active_ai_player_name} is already thinking. Ignoring.")
             return
@@ -189,30 +485,161 @@ class GameOrchestrator:
         self.ai_action_result = None  # Clear previous result
         self.ai_is_thinking = True
 
-        # For simplicity, storing args directly; can be more structured if needed
+        # Only small metadata is kept here: the state JSON (often 100 KB+) lives in the worker's arguments
+        # and GameState's JSON cache, and would otherwise stay referenced until the result is collected.
+        gs = self.engine.game_state
         self.current_ai_context = {
-            "agent": agent,
-            "game_state_json": game_state_json,
-            "valid_actions": valid_actions,
-            "game_rules": game_rules,
-            "system_prompt_addition": system_prompt_addition
+            "player_name": agent.player_name,
+            "phase": gs.current_game_phase,
+            "state_version": gs.version,
         }
 
-        self.current_ai_thread = threading.Thread(
-            target=self._ai_thread_target,
-            args=(agent, game_state_json, valid_actions, game_rules, system_prompt_addition)
-        )
-        self.current_ai_thread.daemon = True # Allow main program to exit even if threads are running
-        self.current_ai_thread.start()
-        print(f"Orchestrator: Started AI thinking thread for {agent.player_name}.")
+        response_cache_key = self._response_cache_key(agent, valid_actions, system_prompt_addition) if future is None else None
+        cached_response = self._ai_response_cache.get(response_cache_key) if response_cache_key is not None else None
+        if cached_response is None and response_cache_key is not None and self.response_store is not None:
+            cached_response = self.response_store.get(self._response_store_key(response_cache_key))
+            if cached_response is not None:
+                self._cache_ai_response(response_cache_key, cached_response)
+        if cached_response is not None:
+            if self._last_response_cache_hit == (response_cache_key, gs.version):
+                # Replaying it last time changed nothing (it was rejected), so ask the agent again instead.
+                # The entry stays; a valid new answer replaces it in _collect_ai_result().
+                cached_response = None
+            else:
+                self._ai_response_cache.move_to_end(response_cache_key) # Most recently used
+                self._last_response_cache_hit = (response_cache_key, gs.version)
+        if future is not None:
+            self._pending_response_cache_entry = None
+            self._ai_future = future
+            print(f"Orchestrator: Using speculative AI call for {agent.player_name}.")
+        elif cached_response is not None:
+            # Same question as before: answer from the cache, through an already-completed future.
+            self.ai_action_result = copy.deepcopy(cached_response)
+            self._pending_response_cache_entry = None
+            self._ai_future = Future()
+            self._ai_future.set_result(None)
+            print(f"Orchestrator: Reusing cached response for {agent.player_name}.")
+        else:
+            self._pending_response_cache_entry = (response_cache_key, valid_actions) if response_cache_key is not None else None
+            self._ai_future = self._submit_ai_call(agent, game_state_json, valid_actions, game_rules, system_prompt_addition)
+            print(f"Orchestrator: Started AI thinking for {agent.player_name}.")
         if self.gui: # Update GUI to show AI is thinking
              self._update_gui_full_state()
 
 
-    def _load_player_setup(self, player_configs_override: list | None, default_player_setup_file: str) -> list[GamePlayer]:
+    def take_snapshot(self) -> int:
+        """Saves the game between AI calls (board, history, chats, card bonus step, dice RNG) and returns
+        an id for branch_from(). Snapshots are taken on demand; nothing is recorded automatically."""
+        if self.ai_is_thinking:
+            raise RuntimeError("Cannot take a snapshot while an AI call is pending.")
+        self._flush_event_buffer()
+        state = (self.engine.game_state, self.engine.card_trade_bonus_index, self.global_chat.log,
+                 self.private_chat_manager.conversation_logs, self._committed_turn, self._turn_start_seqs, random.getstate())
+        snapshot_id = next(self._snapshot_ids)
+        self._snapshots[snapshot_id] = (pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL), dict(self.ai_agents))
+        return snapshot_id
+
+    def drop_snapshot(self, snapshot_id: int):
+        """Frees a snapshot from take_snapshot() that is no longer needed; its id cannot be branched from afterwards."""
+        del self._snapshots[snapshot_id]
+
+    def branch_from(self, snapshot_id: int, override_action: dict | None = None):
+        """Restores a snapshot from take_snapshot() so play can continue from there with advance_game_turn().
+        With override_action, the acting player's next action is that action instead of an AI call.
+        The setup response cache is kept, so repeated setup questions are not asked again in the branch."""
+        state_bytes, ai_agents = self._snapshots[snapshot_id]
+        gs, bonus_index, chat_log, private_logs, committed_turn, turn_start_seqs, rng_state = pickle.loads(state_bytes)
+        # Unpickled strings are fresh objects; re-intern the phase so the phase == "LITERAL" checks
+        # and the phase handler table lookups keep hitting the identity fast path.
+        gs.current_game_phase = sys.intern(gs.current_game_phase)
+        self.engine.game_state = gs
+        self.engine.card_trade_bonus_index = bonus_index
+        self.global_chat.log = chat_log
+        self.private_chat_manager.conversation_logs = private_logs
+        self._committed_turn = committed_turn
+        self._turn_start_seqs = turn_start_seqs
+        random.setstate(rng_state)
+        self.ai_agents = dict(ai_agents) # Players eliminated after the snapshot are back in play
+        self._map_game_players_to_ai_agents()
+
+        self._event_buffer.clear()
+        self._va_cache = None
+        self._attack_prompt_cache = None
+        self.pending_neutral_defense = None
+        self.pending_private_chat = None
+        self.ai_is_thinking = False
+        self.ai_action_result = None
+        self.active_ai_player_name = None
+        self.current_ai_context = None
+        self._ai_future = None
+        self._pending_response_cache_entry = None
+        self._last_response_cache_hit = None # gs.version is back at the snapshot's value; an old pair could match again
+        self._discard_speculative_ai_call()
+        self.has_logged_current_turn_player_phase = False
+        self.has_logged_ai_is_thinking_for_current_action = False
+
+        if override_action is not None:
+            acting_player = gs.get_current_setup_player() if gs.current_game_phase.startswith("SETUP_") else gs.get_current_player()
+            if acting_player is None:
+                raise ValueError(f"No acting player to apply the override action to in phase {gs.current_game_phase}.")
+            # Present the action as an already-finished AI call; the next advance_game_turn() processes it.
+            self.active_ai_player_name = acting_player.name
+            self.ai_action_result = {"thought": "Branch override action.", "action": override_action}
+            self._ai_future = Future()
+            self._ai_future.set_result(None)
+            self.ai_is_thinking = True
+        self.log_turn_info(f"Orchestrator: Branched from snapshot {snapshot_id} (turn {gs.current_turn_number}, phase {gs.current_game_phase}).")
+        if self.gui: self._push_gui_state()
+
+    def _response_cache_key(self, agent: BaseAIAgent, valid_actions: list, system_prompt_addition: str) -> tuple | None:
+        """Key for _ai_response_cache, or None when responses should not be reused for this call."""
+        if self.pending_neutral_defense is not None:
+            return None # Neutral defense dice are asked mid-attack, in the attacker's phase; never replay them
+        gs = self.engine.game_state
+        phase = gs.current_game_phase
+        if phase in self.AI_RESPONSE_CACHE_PHASES:
+            if not self.reuse_setup_ai_responses:
+                return None
+            extra = ()
+        elif phase in self.AI_PLAY_RESPONSE_CACHE_PHASES and not gs.requires_post_attack_fortify:
+            if not self.reuse_play_ai_responses:
+                return None
+            player = gs.players_by_name.get(agent.player_name)
+            hand = tuple(sorted((c.territory_name or "", c.symbol) for c in player.hand)) if player else ()
+            extra = (hand, tuple(sorted(gs.diplomatic_statuses_for(agent.player_name).items())), system_prompt_addition)
+        else:
+            return None
+        board = tuple((t.owner.name if t.owner else None, t.army_count) for t in gs.territories.values())
+        actions = tuple(sorted(json.dumps(a, sort_keys=True) for a in valid_actions))
+        return (agent.player_name, phase, actions, board) + extra
+
+    def _response_store_key(self, response_cache_key: tuple) -> str:
+        """response_store key: the in-memory key (which starts with the player name), namespaced by
+        that player's agent class and model so runs with different models never share answers."""
+        agent = self.ai_agents.get(response_cache_key[0])
+        namespace = (type(agent).__name__, getattr(agent, "model_name", None), getattr(agent, "player_color", None))
+        return AIResponseStore.make_key(namespace, response_cache_key)
+
+    @staticmethod
+    def _matches_valid_action(action, valid_actions: list) -> bool:
+        """
+        Whether action is one of valid_actions. Fields the agent fills in (_AGENT_FILLED_KEYS) are ignored and
+        template hints (_TEMPLATE_HINT_KEYS) may be left out; every other field of the template must be echoed.
+        """
+        if not isinstance(action, dict):
+            return False
+        if action in valid_actions:
+            return True
+        action_type = action.get("type")
+        return any(va.get("type") == action_type and
+                   all(k in _AGENT_FILLED_KEYS or (action[k] == v if k in action else k in _TEMPLATE_HINT_KEYS)
+                       for k, v in va.items())
+                   for va in valid_actions)
+
+    def _load_player_setup(self, player_configs_override: list | None, default_player_setup_file: str) -> list[PlayerConfig]:
         """
         Loads player configurations, creates AI agents, and determines game mode (2-player or standard).
-        Returns a list of human GamePlayer objects created.
+        Returns the human players' configs, with defaults for missing names/colours/AI types filled in.
         The actual Player objects in self.engine.game_state (including Neutral for 2P)
         will be created by self.engine.initialize_game_from_map().
         """
@@ -247,7 +674,7 @@ class GameOrchestrator:
             raise ValueError("Player configurations are empty after attempting to load.")
 
         self.ai_agents.clear() # Clear any previous agents
-        human_game_players_for_engine = [] # Store GamePlayer stubs for engine init
+        human_player_configs: list[PlayerConfig] = [] # Parsed once; engine init only needs name and colour
 
         # Determine game mode based on number of human player configs
         if len(loaded_player_configs) == 2:
@@ -265,51 +692,42 @@ class GameOrchestrator:
         for i, config in enumerate(loaded_player_configs):
             player_name = config.get("name", f"Player{i+1}") # Use configured name or generate
 
-            player_color = config.get("color")
-            if not player_color or player_color.lower() in used_colors:
-                # Find next available default color
-                found_color = False
-                for c in default_colors:
-                    if c.lower() not in used_colors:
-                        player_color = c
-                        found_color = True
-                        break
-                if not found_color: # All defaults used, cycle with numbers
-                    player_color = f"{default_colors[i % len(default_colors)]}{i // len(default_colors) + 1}"
+            player_color = (config.get("color") or "").strip()
+            color_key = player_color.lower() # Colors are compared case-insensitively
+            if not player_color or color_key in used_colors:
+                # Next available default color; once all are used, cycle with numbers
+                player_color = next((c for c in default_colors if c.lower() not in used_colors),
+                                    f"{default_colors[i % len(default_colors)]}{i // len(default_colors) + 1}")
+                color_key = player_color.lower()
                 print(f"Assigned color '{player_color}' to player '{player_name}'.")
-            used_colors.add(player_color.lower())
+            used_colors.add(color_key)
 
             ai_type = config.get("ai_type", "Gemini")
 
-            # Create GamePlayer stub for engine (engine creates the actual objects)
-            # This list `human_game_players_for_engine` will only contain human players.
-            # The engine will add the Neutral player itself in 2P mode.
-            human_game_players_for_engine.append(GamePlayer(name=player_name, color=player_color))
-
-            agent: BaseAIAgent | None = None
-            if ai_type == "Gemini": agent = GeminiAgent(player_name, player_color)
-            elif ai_type == "OpenAI": agent = OpenAIAgent(player_name, player_color)
-            elif ai_type == "Claude": agent = ClaudeAgent(player_name, player_color)
-            elif ai_type == "DeepSeek": agent = DeepSeekAgent(player_name, player_color)
-            elif ai_type == "Llama": agent = LlamaAgent(player_name, player_color)
-            elif ai_type == "Qwen": agent = QwenAgent(player_name, player_color)
-            elif ai_type == "Mistral": agent = MistralAgent(player_name, player_color)
-            else:
+            # Only human players are listed; the engine creates the actual Player objects
+            # and adds the Neutral player itself in 2P mode.
+            human_player_configs.append(PlayerConfig(player_name, player_color, ai_type))
+
+            agent_class = _AGENT_CLASSES.get(ai_type)
+            if agent_class is None:
                 print(f"Warning: Unknown AI type '{ai_type}' for player {player_name}. Defaulting to Gemini.")
-                agent = GeminiAgent(player_name, player_color)
+                agent_class = GeminiAgent
+            agent: BaseAIAgent | None = agent_class(player_name, player_color)
 
             if agent:
                 self.ai_agents[player_name] = agent
             else:
                 raise ValueError(f"Could not create AI agent for {player_name} with type {ai_type}.")
 
-        print(f"Player setup complete. Loaded {len(human_game_players_for_engine)} human players. Two player mode: {self.is_two_player_mode}")
-        return human_game_players_for_engine
+        print(f"Player setup complete. Loaded {len(human_player_configs)} human players. Two player mode: {self.is_two_player_mode}")
+        return human_player_configs
 
 
     def _map_game_players_to_ai_agents(self):
         """Maps GamePlayer objects (created by engine) to their corresponding AI agents."""
         self.player_map.clear()
+        self.agents_by_player_name.clear()
+        self.two_player_opponent_by_name.clear()
         if not self.engine.game_state.players:
             print("Warning: No players in game_state to map to AI agents (called from _map_game_players_to_ai_agents).")
             return
@@ -319,11 +737,19 @@ class GameOrchestrator:
                 continue
             if gp.name in self.ai_agents:
                 self.player_map[gp] = self.ai_agents[gp.name]
+                self.agents_by_player_name[gp.name] = self.ai_agents[gp.name]
             else:
                 print(f"Critical Error: Human GamePlayer {gp.name} from engine does not have a corresponding AI agent. AI Agents: {list(self.ai_agents.keys())}")
                 # This implies a mismatch between player names in configs and those used by engine, or an issue in agent creation.
                 # Raise error as this will break gameplay.
                 raise ValueError(f"Mismatch: GamePlayer {gp.name} has no AI agent.")
+        humans = [gp for gp in self.engine.game_state.players if not gp.is_neutral]
+        if self.is_two_player_mode and len(humans) == 2:
+            self.two_player_opponent_by_name = {humans[0].name: humans[1], humans[1].name: humans[0]}
+        # Intern the diplomacy key of every human pair up front, so _dip_key() is a plain lookup during play.
+        self._dip_key_cache.clear()
+        for name_a, name_b in itertools.combinations([gp.name for gp in humans], 2):
+            self._dip_key_cache[(name_a, name_b)] = self._dip_key_cache[(name_b, name_a)] = frozenset((name_a, name_b))
         print(f"Mapped {len(self.player_map)} GamePlayer objects to AI agents.")
 
 
@@ -331,7 +757,7 @@ class GameOrchestrator:
         """Gets the AI agent for a given GamePlayer object."""
         if player_obj is None or player_obj.is_neutral:
             return None
-        return self.player_map.get(player_obj)
+        return self.agents_by_player_name.get(player_obj.name)
 
 
     def get_agent_for_current_player(self) -> BaseAIAgent | None:
@@ -341,7 +767,7 @@ class GameOrchestrator:
 
         acting_player_obj: GamePlayer | None = None
 
-        if current_phase in ["SETUP_CLAIM_TERRITORIES", "SETUP_PLACE_ARMIES"] and not gs.is_two_player_game:
+        if current_phase in _SETUP_ORDER_PHASES and not gs.is_two_player_game:
             # acting_player_obj = gs.get_current_setup_player() # Replaced due to AttributeError
             current_player_obj_temp: GamePlayer | None = None
             if not gs.player_setup_order or \
@@ -361,7 +787,7 @@ class GameOrchestrator:
             else:
                 current_player_obj_temp = gs.player_setup_order[gs.current_setup_player_index]
             acting_player_obj = current_player_obj_temp # This will be one of the two human players
-        elif current_phase not in ["SETUP_START", "SETUP_DETERMINE_ORDER", "SETUP_2P_DEAL_CARDS"]: # Regular game turn
+        elif current_phase not in _NO_ACTOR_PHASES: # Regular game turn
             acting_player_obj = gs.get_current_player()
 
         if acting_player_obj:
@@ -373,7 +799,12 @@ class GameOrchestrator:
 
 
     def _update_gui_full_state(self):
+        """Marks the GUI as stale. The push happens once, at the end of advance_game_turn()."""
+        self._gui_dirty = True
+
+    def _push_gui_state(self):
         """Helper to call GUI update with all necessary data."""
+        self._gui_dirty = False
         if self.gui:
             self.gui.update(
                 game_state=self.engine.game_state,
@@ -390,7 +821,7 @@ class GameOrchestrator:
                 return
         print("Starting LLM Risk Game!")
         if self.gui:
-            self._update_gui_full_state()
+            self._push_gui_state()
             self.game_running_via_gui = True
             self.gui.run()
             if not self.engine.is_game_over() and self.engine.game_state.current_turn_number < self.max_turns :
@@ -401,10 +832,22 @@ class GameOrchestrator:
             running = True
             while running:
                 running = self.advance_game_turn()
+                if running and self.ai_is_thinking and self._ai_future is not None:
+                    wait((self._ai_future,)) # Block until the AI call completes instead of spinning on advance_game_turn
+        self.flush_logs()
         print("GameOrchestrator.run_game() finished.")
 
 
     # --- Setup Phase Handlers ---
+    def _handle_setup_start(self) -> bool:
+        # Should be handled by initial call to initialize_game_from_map
+        gs = self.engine.game_state
+        self.log_turn_info("Error: Game in SETUP_START. Initialization might be incomplete.")
+        # Attempt to move to next logical step if possible
+        if self.is_two_player_mode: gs.current_game_phase = "SETUP_2P_DEAL_CARDS"
+        else: gs.current_game_phase = "SETUP_DETERMINE_ORDER"
+        return True
+
     def _handle_setup_determine_order(self) -> bool:
         """Handles logic for SETUP_DETERMINE_ORDER phase (standard game)."""
         gs = self.engine.game_state
@@ -473,33 +916,12 @@ class GameOrchestrator:
             self.engine.game_state.current_setup_player_index = 0 # Reset for next phase
             return True
 
-        # Check if an AI action is currently being awaited
-        if self.ai_is_thinking:
-            if self.current_ai_thread and self.current_ai_thread.is_alive():
-                # AI is still thinking. Log if needed (already done by GUI loop implicitly).
-                # print(f"Orchestrator: AI for {self.active_ai_player_name} is still thinking (SETUP_CLAIM_TERRITORIES).")
-                return True # Still busy, orchestrator will call this handler again via advance_game_turn
-
-            # If self.ai_is_thinking was true, but thread is NOT alive, it means thread just finished.
-            # So, action_result should be available. We must set ai_is_thinking to False.
-            if self.active_ai_player_name: # Check if there was an active AI
-                self.log_turn_info(f"Orchestrator: AI ({self.active_ai_player_name}) thread finished (detected in _handle_setup_claim_territories).")
-            else:
-                self.log_turn_info(f"Orchestrator: AI thread finished (detected in _handle_setup_claim_territories, no active_ai_player_name).")
-            self.ai_is_thinking = False
-            # Fall through to process self.ai_action_result below.
-            # No 'return True' here, because we want to process the result in this same call to the handler.
-
-        # If AI has finished (either detected above, or ai_is_thinking was already false and result is pending from a previous tick)
-        if self.ai_action_result:
-            action_to_process = self.ai_action_result
-            player_name_who_acted = self.active_ai_player_name # Should have been set when AI call was made
-
-            # Clear context related to the completed AI action
-            self.ai_action_result = None
-            self.active_ai_player_name = None
-            self.current_ai_context = None # Clear the context as well
+        # Check if an AI action is currently being awaited, or has finished and left a result to process
+        busy, player_name_who_acted, action_to_process = self._poll_ai_result("_handle_setup_claim_territories")
+        if busy:
+            return True # Still busy, orchestrator will call this handler again via advance_game_turn
 
+        if action_to_process:
             if not player_name_who_acted:
                 self.log_turn_info("Error: AI action result found, but no active_ai_player_name. Cannot process claim.")
                 # This is an inconsistent state. Might need to decide how to recover or if game should stall.
@@ -531,16 +953,19 @@ class GameOrchestrator:
             self.log_turn_info(f"Phase: SETUP_CLAIM_TERRITORIES - {current_setup_player_obj.name}'s turn to claim.")
             self.has_logged_current_turn_player_phase = True
 
-        valid_actions = self.engine.get_valid_actions(current_setup_player_obj)
+        valid_actions, _ = self._get_valid_actions_cached(current_setup_player_obj) # Reused when re-prompting after an invalid claim
         if not valid_actions: # Should not happen if territories are still unclaimed
             self.log_turn_info(f"No valid claim actions for {current_setup_player_obj.name}, but territories remain. Engine state: {gs.unclaimed_territory_names}")
             # This might mean engine correctly moved to next phase if all claimed by others before this player's turn in a loop
             if not gs.unclaimed_territory_names: gs.current_game_phase = "SETUP_PLACE_ARMIES"; self.engine.game_state.current_setup_player_index = 0
             return True
 
+        if self._take_forced_setup_action(current_setup_player_obj.name, valid_actions):
+            return True # Only one territory left to claim; no AI call needed
+
         prompt_add = f"It's your turn to claim a territory. Choose one from the list."
-        # Use to_json_with_history() for AI context
-        self._execute_ai_turn_async(current_setup_agent, gs.to_json_with_history(), valid_actions, self.game_rules, prompt_add)
+        # Use to_json_with_history_cached() for AI context
+        self._execute_ai_turn_async(current_setup_agent, gs.to_json_with_history_cached(), valid_actions, self.game_rules, prompt_add)
         return True # AI is now thinking
 
     def _handle_setup_place_armies(self) -> bool:
@@ -556,32 +981,19 @@ class GameOrchestrator:
                 self.log_turn_info("All initial armies have been placed. Transitioning to first game turn.")
                 # The engine should have already handled the phase transition, but this is a safeguard.
                 gs.current_game_phase = "REINFORCE"
-                gs.current_player_index = gs.players.index(gs.first_player_of_game)
+                gs.current_player_index = gs.index_of_player(gs.first_player_of_game)
                 first_player = gs.get_current_player()
                 if first_player:
                     first_player.armies_to_deploy, _ = self.engine.calculate_reinforcements(first_player)
             return True # Proceed to the new REINFORCE phase
 
         # Check if an AI action is currently being awaited
-        if self.ai_is_thinking:
-            if self.current_ai_thread and self.current_ai_thread.is_alive():
-                return True # Still busy
-
-            if self.active_ai_player_name:
-                self.log_turn_info(f"Orchestrator: AI ({self.active_ai_player_name}) thread finished (in _handle_setup_place_armies).")
-            self.ai_is_thinking = False
-            # Fall through to process self.ai_action_result
+        busy, player_name_who_acted, action_to_process = self._poll_ai_result("_handle_setup_place_armies")
+        if busy:
+            return True # Still busy
 
         # If AI has finished, process its action
-        if self.ai_action_result:
-            action_to_process = self.ai_action_result
-            player_name_who_acted = self.active_ai_player_name
-
-            # Clear context for the next AI action
-            self.ai_action_result = None
-            self.active_ai_player_name = None
-            self.current_ai_context = None
-
+        if action_to_process:
             if not player_name_who_acted:
                 self.log_turn_info("Error: AI action result found, but no active_ai_player_name. Cycling.")
                 return True
@@ -622,15 +1034,30 @@ class GameOrchestrator:
             self.log_turn_info(f"Phase: SETUP_PLACE_ARMIES - {current_setup_player_obj.name}'s turn to place. ({armies_left} left)")
             self.has_logged_current_turn_player_phase = True
 
-        valid_actions = self.engine.get_valid_actions(current_setup_player_obj)
+        valid_actions, _ = self._get_valid_actions_cached(current_setup_player_obj)
         
         if not valid_actions:
             self.log_turn_info(f"No valid SETUP_PLACE_ARMY actions for {current_setup_player_obj.name}. This may indicate an issue.")
             # Let the loop continue, it may resolve if the engine transitions the phase on the next tick.
             return True
 
+        if self._take_forced_setup_action(current_setup_player_obj.name, valid_actions):
+            return True # Only one territory to place on; no AI call needed
+
         prompt_add = f"Place one army on a territory you own. You have {current_setup_player_obj.initial_armies_pool - current_setup_player_obj.armies_placed_in_setup} left to place in total."
-        self._execute_ai_turn_async(current_setup_agent, gs.to_json_with_history(), valid_actions, self.game_rules, prompt_add)
+        self._execute_ai_turn_async(current_setup_agent, gs.to_json_with_history_cached(), valid_actions, self.game_rules, prompt_add)
+        return True
+
+    def _take_forced_setup_action(self, player_name: str, valid_actions: list) -> bool:
+        """
+        When valid_actions holds a single action, queues it as the player's result without an AI call
+        (picked up by _poll_ai_result on the next tick) and returns True.
+        """
+        if len(valid_actions) != 1:
+            return False
+        self.log_turn_info(f"{player_name} has a single valid setup action; taking it without an AI call.")
+        self.ai_action_result = {"thought": "Forced move: only one valid action.", "action": valid_actions[0]}
+        self.active_ai_player_name = player_name
         return True
 
     def _handle_setup_2p_deal_cards(self) -> bool:
@@ -655,6 +1082,7 @@ class GameOrchestrator:
                 all_human_done = False; break
 
         if all_human_done: # Engine should transition phase when last army placed by player_places_initial_armies_2p
+            self._discard_speculative_ai_call()
             if gs.current_game_phase == "SETUP_2P_PLACE_REMAINING": # If engine hasn't transitioned
                  self.log_turn_info("All 2P human armies placed, but phase not transitioned by engine. Forcing.")
                  # This part is complex as engine's player_places_initial_armies_2p should handle final transition
@@ -662,25 +1090,11 @@ class GameOrchestrator:
             return True # Let main loop pick up new REINFORCE phase.
 
         # Check if an AI action is currently being awaited
-        if self.ai_is_thinking:
-            if self.current_ai_thread and self.current_ai_thread.is_alive():
-                return True # Still busy
-
-            if self.active_ai_player_name:
-                self.log_turn_info(f"Orchestrator: AI ({self.active_ai_player_name}) thread finished (detected in _handle_setup_2p_place_remaining).")
-            else:
-                self.log_turn_info(f"Orchestrator: AI thread finished (detected in _handle_setup_2p_place_remaining, no active_ai_player_name).")
-            self.ai_is_thinking = False
-            # Fall through to process self.ai_action_result
-
-        if self.ai_action_result:
-            action_to_process = self.ai_action_result
-            player_name_who_acted = self.active_ai_player_name
-
-            self.ai_action_result = None
-            self.active_ai_player_name = None
-            self.current_ai_context = None # Clear context
+        busy, player_name_who_acted, action_to_process = self._poll_ai_result("_handle_setup_2p_place_remaining")
+        if busy:
+            return True # Still busy
 
+        if action_to_process:
             if not player_name_who_acted:
                 self.log_turn_info("Error: AI action result found (SETUP_2P_PLACE_REMAINING), but no active_ai_player_name.")
                 return True
@@ -715,7 +1129,7 @@ class GameOrchestrator:
             self.log_turn_info(f"Phase: SETUP_2P_PLACE_REMAINING - {current_setup_player_obj.name}'s turn.")
             self.has_logged_current_turn_player_phase = True
 
-        valid_actions = self.engine.get_valid_actions(current_setup_player_obj) # Should be one composite action
+        valid_actions, _ = self._get_valid_actions_cached(current_setup_player_obj) # Should be one composite action
         if not valid_actions or valid_actions[0].get("type") != "SETUP_2P_PLACE_ARMIES_TURN":
             if valid_actions and valid_actions[0].get("type") == "SETUP_2P_DONE_PLACING":
                 # Player has no more armies, this is fine, orchestrator will cycle.
@@ -731,16 +1145,59 @@ class GameOrchestrator:
             return True # Let it try again, maybe state resolves.
 
         # Prompt for the composite action
-        action_template = valid_actions[0]
-        prompt_add = (f"Place {action_template['player_armies_to_place_this_turn']} of your armies on your territories "
-                      f"({action_template['player_owned_territories']}). "
-                      f"Also, if neutral can place ({action_template['neutral_can_place']}), "
-                      f"place 1 neutral army on a neutral territory ({action_template['neutral_owned_territories']}). "
-                      "Provide action as: {'type': 'SETUP_2P_PLACE_ARMIES_TURN', 'own_army_placements': [['T1', count1], ['T2', count2], ...], 'neutral_army_placement': ['NT1', 1] or null}. "
-                      "Ensure placements are lists of two elements (e.g., [\"TerritoryName\", number_of_armies]).")
-        self._execute_ai_turn_async(current_setup_agent, gs.to_json_with_history(), valid_actions, self.game_rules, prompt_add)
+        prompt_add = self._2p_place_prompt(valid_actions[0])
+        speculative_future = self._take_speculative_ai_call(current_setup_player_obj.name, valid_actions)
+        self._execute_ai_turn_async(current_setup_agent, gs.to_json_with_history_cached(), valid_actions, self.game_rules, prompt_add,
+                                    future=speculative_future)
+        if self.speculate_2p_setup_turns:
+            self._start_2p_setup_speculation(current_setup_player_obj)
         return True
 
+    @staticmethod
+    def _2p_place_prompt(action_template: dict) -> str:
+        return (f"Place {action_template['player_armies_to_place_this_turn']} of your armies on your territories "
+                f"({action_template['player_owned_territories']}). "
+                f"Also, if neutral can place ({action_template['neutral_can_place']}), "
+                f"place 1 neutral army on a neutral territory ({action_template['neutral_owned_territories']}). "
+                "Provide action as: {'type': 'SETUP_2P_PLACE_ARMIES_TURN', 'own_army_placements': [['T1', count1], ['T2', count2], ...], 'neutral_army_placement': ['NT1', 1] or null}. "
+                "Ensure placements are lists of two elements (e.g., [\"TerritoryName\", number_of_armies]).")
+
+    def _start_2p_setup_speculation(self, current_player: GamePlayer):
+        """Submits the other human's next 2P placement call alongside current_player's (see speculate_2p_setup_turns)."""
+        gs = self.engine.game_state
+        if self._speculative_ai_call is not None:
+            return
+        next_player = next((p for p in gs.player_setup_order if p is not current_player), None)
+        next_agent = self.get_agent_for_player(next_player) if next_player else None
+        if next_agent is None:
+            return
+        valid_actions = self.engine.get_valid_actions(next_player)
+        if not valid_actions or valid_actions[0].get("type") != "SETUP_2P_PLACE_ARMIES_TURN":
+            return
+        future = self._submit_ai_call(next_agent, gs.to_json_with_history_cached(), valid_actions, self.game_rules,
+                                      self._2p_place_prompt(valid_actions[0]))
+        self._speculative_ai_call = (next_player.name, valid_actions, future)
+        print(f"Orchestrator: Started speculative AI call for {next_player.name}.")
+
+    def _take_speculative_ai_call(self, player_name: str, valid_actions: list) -> Future | None:
+        """Returns the pending speculative call's future if it was made for this player and these valid actions;
+        otherwise discards it and returns None."""
+        spec = self._speculative_ai_call
+        if spec is None:
+            return None
+        self._speculative_ai_call = None
+        spec_player_name, spec_valid_actions, future = spec
+        if spec_player_name == player_name and spec_valid_actions == valid_actions:
+            return future
+        future.cancel() # No effect if already running; the result is then simply dropped
+        self.log_turn_info(f"Orchestrator: Discarded speculative AI call for {spec_player_name} (valid actions changed).")
+        return None
+
+    def _discard_speculative_ai_call(self):
+        if self._speculative_ai_call is not None:
+            self._speculative_ai_call[2].cancel()
+            self._speculative_ai_call = None
+
     def _handle_elimination_card_trade_loop(self, player_to_trade: GamePlayer, agent_to_trade: BaseAIAgent) -> bool:
         """Handles the mandatory card trading loop after a player elimination."""
         gs = self.engine.game_state
@@ -763,13 +1220,13 @@ class GameOrchestrator:
             trade_actions = [va for va in valid_actions if va.get("type") == "TRADE_CARDS" and va.get("must_trade")]
             if not trade_actions:
                 self.log_turn_info(f"No valid 'must_trade' actions for {player_to_trade.name} despite pending elimination trade. Hand: {len(player_to_trade.hand)}. Clearing flag.")
-                gs.elimination_card_trade_player_name = None # Cannot proceed
+                self.engine.clear_elimination_card_trade() # Cannot proceed
                 break
 
             # Get AI action for trading (synchronous for this sub-loop for simplicity now)
             # TODO: Could make this async like other actions if needed, but it's a sequence.
             prompt_add = "You MUST trade cards to reduce your hand size below 5 due to player elimination."
-            ai_response = agent_to_trade.get_thought_and_action(gs.to_json_with_history(), trade_actions, self.game_rules, prompt_add)
+            ai_response = agent_to_trade.get_thought_and_action(gs.to_json_with_history_cached(), trade_actions, self.game_rules, prompt_add)
             self.log_ai_thought(player_to_trade.name, ai_response.get("thought", "N/A (elimination trade)"))
 
             chosen_action = ai_response.get("action")
@@ -784,12 +1241,12 @@ class GameOrchestrator:
             else:
                 self.log_turn_info(f"{player_to_trade.name} failed to provide a valid TRADE_CARDS action during mandatory elimination trade. Action: {chosen_action}")
                 # This is an AI error. Break loop to avoid getting stuck. Orchestrator might need to handle this.
-                gs.elimination_card_trade_player_name = None # Clear flag to prevent stall
+                self.engine.clear_elimination_card_trade() # Clear flag to prevent stall
                 break
 
         if attempts >= trade_attempt_limit:
             self.log_turn_info(f"Reached trade attempt limit for {player_to_trade.name} during elimination card trade. Clearing flag.")
-            gs.elimination_card_trade_player_name = None
+            self.engine.clear_elimination_card_trade()
 
         self.log_turn_info(f"Finished elimination card trade loop for {player_to_trade.name}. Hand size: {len(player_to_trade.hand)}")
         # The game should now proceed with any pending post-attack fortification or next phase actions.
@@ -797,19 +1254,41 @@ class GameOrchestrator:
         return True # Indicate trade loop finished, main loop can re-evaluate.
 
 
+    def is_waiting_on_ai(self) -> bool:
+        """True while an AI call is in flight; advance_game_turn() can make no progress until it completes."""
+        future = self._ai_future
+        return self.ai_is_thinking and future is not None and not future.done()
+
     def advance_game_turn(self) -> bool:
+        running = self._advance_game_turn()
+        # All _update_gui_full_state() calls made during the tick collapse into this one push.
+        if self._gui_dirty: self._push_gui_state()
+        return running
+
+    def _advance_game_turn(self) -> bool:
         gs = self.engine.game_state
+        future = self._ai_future
+        if self.ai_is_thinking and future is not None and not future.done():
+            # Nothing can change until the pending AI call completes: skip the game-over checks, phase
+            # dispatch and GUI state push. The GUI keeps redrawing from the state it already holds.
+            if not self.has_logged_ai_is_thinking_for_current_action:
+                print(f"Orchestrator: AI ({self.active_ai_player_name}) is still thinking. GUI should be responsive.")
+                self.has_logged_ai_is_thinking_for_current_action = True
+            return True
+        self._debug_on = logger.isEnabledFor(logging.DEBUG)
 
         if self.engine.is_game_over():
             winner = self.engine.is_game_over()
             win_msg = f"\n--- GAME OVER! Winner is {winner.name if winner else 'Unknown'}! ---"
             self.log_turn_info(win_msg); print(win_msg)
+            self.flush_logs()
             self.global_chat.broadcast("GameSystem", win_msg)
             if self.gui and self.game_running_via_gui: self.gui.show_game_over_screen(winner.name if winner else "N/A")
             return False
         if gs.current_turn_number >= self.max_turns and not gs.current_game_phase.startswith("SETUP_"):
             timeout_msg = f"\n--- GAME OVER! Reached max turns ({self.max_turns}). ---"
             self.log_turn_info(timeout_msg); print(timeout_msg)
+            self.flush_logs()
             self.global_chat.broadcast("GameSystem", timeout_msg)
             if self.gui and self.game_running_via_gui: self.gui.show_game_over_screen("Draw/Timeout")
             return False
@@ -818,22 +1297,9 @@ class GameOrchestrator:
         # self.log_turn_info(f"Orchestrator: Advancing turn. Current phase: {current_phase}")
 
         # --- Setup Phase Handling ---
-        if current_phase == "SETUP_START": # Should be handled by initial call to initialize_game_from_map
-            self.log_turn_info("Error: Game in SETUP_START. Initialization might be incomplete.")
-            # Attempt to move to next logical step if possible
-            if self.is_two_player_mode: gs.current_game_phase = "SETUP_2P_DEAL_CARDS"
-            else: gs.current_game_phase = "SETUP_DETERMINE_ORDER"
-            return True
-        elif current_phase == "SETUP_DETERMINE_ORDER":
-            return self._handle_setup_determine_order()
-        elif current_phase == "SETUP_CLAIM_TERRITORIES":
-            return self._handle_setup_claim_territories()
-        elif current_phase == "SETUP_PLACE_ARMIES":
-            return self._handle_setup_place_armies()
-        elif current_phase == "SETUP_2P_DEAL_CARDS":
-            return self._handle_setup_2p_deal_cards()
-        elif current_phase == "SETUP_2P_PLACE_REMAINING":
-            return self._handle_setup_2p_place_remaining()
+        setup_handler = self._setup_phase_handlers.get(current_phase)
+        if setup_handler is not None:
+            return setup_handler()
 
         # --- Regular Game Turn Logic (Post-Setup) ---
         self.turn_action_log.clear() # Clear log for the new turn/main phase part
@@ -869,41 +1335,37 @@ class GameOrchestrator:
         action_processed_in_current_tick = False
         phase_when_action_was_initiated = None
 
-        if self.ai_is_thinking:
-            if self.current_ai_thread and self.current_ai_thread.is_alive():
-                if not self.has_logged_ai_is_thinking_for_current_action:
-                    print(f"Orchestrator: AI ({self.active_ai_player_name}) is still thinking. GUI should be responsive.")
-                    self.has_logged_ai_is_thinking_for_current_action = True
-                if self.gui: self.gui.update(self.engine.game_state, self.global_chat.get_log(), self.private_chat_manager.get_all_conversations())
-                return True
+        if self.ai_is_thinking: # A pending call returned early above, so this call has finished
+            # AI thread has finished
+            print(f"Orchestrator: AI ({self.active_ai_player_name}) thread finished.")
+            self._collect_ai_result()
+            self.ai_is_thinking = False
+            self.has_logged_ai_is_thinking_for_current_action = False
+            action_to_process = self.ai_action_result
+
+            if self.pending_private_chat is not None:
+                # The finished call was a private conversation started by _handle_attack_private_chat, not an AI action.
+                self._finish_private_chat(current_player_obj, action_to_process)
+            elif action_to_process:
+                print(f"Orchestrator: Processing AI action: {action_to_process.get('action')}")
+                self.log_ai_thought(self.active_ai_player_name or "UnknownAI", action_to_process.get('thought', 'N/A'))
+                phase_when_action_was_initiated = gs.current_game_phase
+
+                phase_handlers = self._play_phase_handlers.get(phase_when_action_was_initiated)
+                if phase_handlers is not None:
+                    phase_handlers[1](current_player_obj, current_player_agent, action_to_process)
+                action_processed_in_current_tick = True
             else:
-                # AI thread has finished
-                print(f"Orchestrator: AI ({self.active_ai_player_name}) thread finished.")
-                self.ai_is_thinking = False
-                self.has_logged_ai_is_thinking_for_current_action = False
-                action_to_process = self.ai_action_result
-
-                if action_to_process:
-                    print(f"Orchestrator: Processing AI action: {action_to_process.get('action')}")
-                    self.log_ai_thought(self.active_ai_player_name or "UnknownAI", action_to_process.get('thought', 'N/A'))
-                    phase_when_action_was_initiated = self.engine.game_state.current_game_phase
-
-                    if phase_when_action_was_initiated == "REINFORCE":
-                        self._process_reinforce_ai_action(current_player_obj, current_player_agent, action_to_process)
-                    elif phase_when_action_was_initiated == "ATTACK":
-                        self._process_attack_ai_action(current_player_obj, current_player_agent, action_to_process)
-                    elif phase_when_action_was_initiated == "FORTIFY":
-                        self._process_fortify_ai_action(current_player_obj, current_player_agent, action_to_process)
+                print(f"Orchestrator: AI ({self.active_ai_player_name}) action result was None. Problem in thread.")
+                self.pending_neutral_defense = None # Drop an attack waiting on this call rather than misroute the next response
+                if gs.current_game_phase == "FORTIFY":
                     action_processed_in_current_tick = True
-                else:
-                    print(f"Orchestrator: AI ({self.active_ai_player_name}) action result was None. Problem in thread.")
-                    if self.engine.game_state.current_game_phase == "FORTIFY":
-                        action_processed_in_current_tick = True
+            if not self.ai_is_thinking: # Processing may have started a follow-up call (e.g. neutral defense dice)
                 self.ai_action_result = None
                 self.active_ai_player_name = None
                 self.current_ai_context = None
-                self._update_gui_full_state()
-                if self.engine.is_game_over(): return self.advance_game_turn()
+            self._update_gui_full_state()
+            if self.engine.is_game_over(): return self._advance_game_turn()
 
         if not self.ai_is_thinking:
             # FIX: This is the critical block to fix the freeze. After a FORTIFY action is
@@ -912,48 +1374,44 @@ class GameOrchestrator:
                 if not self.engine.is_game_over():
                     self.engine.next_turn()
                     self.has_logged_current_turn_player_phase = False
-                    new_player = self.engine.game_state.get_current_player()
-                    self.log_turn_info(f"--- End of Turn for {current_player_obj.name}. Next is Turn {self.engine.game_state.current_turn_number}, Player: {new_player.name if new_player else 'N/A'} ---")
+                    new_player = gs.get_current_player()
+                    self.log_turn_info(f"--- End of Turn for {current_player_obj.name}. Next is Turn {gs.current_turn_number}, Player: {new_player.name if new_player else 'N/A'} ---")
                     self._update_gui_full_state()
-                if self.engine.is_game_over(): return self.advance_game_turn()
+                if self.engine.is_game_over(): return self._advance_game_turn()
                 return True
 
             max_phase_transitions_per_tick = 5
             transitions_this_tick = 0
             while transitions_this_tick < max_phase_transitions_per_tick and not self.ai_is_thinking:
                 transitions_this_tick += 1
-                current_phase_before_initiation = self.engine.game_state.current_game_phase
-
-                if current_phase_before_initiation == "REINFORCE":
-                    self._initiate_reinforce_ai_action(current_player_obj, current_player_agent)
-                elif not self.engine.is_game_over() and current_phase_before_initiation == "ATTACK":
-                    self._initiate_attack_ai_action(current_player_obj, current_player_agent)
-                elif not self.engine.is_game_over() and current_phase_before_initiation == "FORTIFY":
-                    self._initiate_fortify_ai_action(current_player_obj, current_player_agent)
-                else:
+                current_phase_before_initiation = gs.current_game_phase
+
+                phase_handlers = self._play_phase_handlers.get(current_phase_before_initiation)
+                if phase_handlers is None or (current_phase_before_initiation != "REINFORCE" and self.engine.is_game_over()):
                     break
+                phase_handlers[0](current_player_obj, current_player_agent)
                 if self.ai_is_thinking:
                     break
-                if self.engine.game_state.current_game_phase == current_phase_before_initiation:
+                if gs.current_game_phase == current_phase_before_initiation:
                     break
 
             if transitions_this_tick >= max_phase_transitions_per_tick:
                 self.log_turn_info(f"Orchestrator: Exceeded max phase transitions ({max_phase_transitions_per_tick}) in a single tick for player {current_player_obj.name}. This might indicate a problem.")
 
             if self.gui: self._update_gui_full_state()
-            if self.engine.is_game_over(): return self.advance_game_turn()
+            if self.engine.is_game_over(): return self._advance_game_turn()
             if self.ai_is_thinking: return True
 
             # Fallback for Fortify phase if AI initiation fails to start thinking
-            if not self.ai_is_thinking and self.engine.game_state.current_game_phase == "FORTIFY":
+            if not self.ai_is_thinking and gs.current_game_phase == "FORTIFY":
                 if not self.engine.is_game_over():
                     self.log_turn_info(f"Orchestrator: Fallback - Fortify phase, AI not thinking after initiation attempt. Ending turn for {current_player_obj.name}.")
                     self.engine.next_turn()
                     self.has_logged_current_turn_player_phase = False
-                    new_player = self.engine.game_state.get_current_player()
+                    new_player = gs.get_current_player()
                     self.log_turn_info(f"--- End of Turn for {current_player_obj.name} (fallback after fortify init). Next player: {new_player.name if new_player else 'N/A'} ---")
                     self._update_gui_full_state()
-                if self.engine.is_game_over(): return self.advance_game_turn()
+                if self.engine.is_game_over(): return self._advance_game_turn()
                 return True
 
         if self.engine.is_game_over(): return False
@@ -962,30 +1420,31 @@ class GameOrchestrator:
 
     def _initiate_reinforce_ai_action(self, player: GamePlayer, agent: BaseAIAgent):
         """Gathers info and starts the AI thinking for the REINFORCE phase."""
+        gs = self.engine.game_state
         print(f"Orchestrator: Initiating REINFORCE AI action for {player.name}")
-        game_state_json = self.engine.game_state.to_json()
-        valid_actions = self.engine.get_valid_actions(player)
+        valid_actions, actions_by_type = self._get_valid_actions_cached(player) # Reused when re-prompting after a rejected action
 
         if not valid_actions:
             self.log_turn_info(f"No valid REINFORCE actions for {player.name}. Auto-distributing if needed and moving to ATTACK.")
             if player.armies_to_deploy > 0:
                 self.auto_distribute_armies(player, player.armies_to_deploy)
-            self.engine.game_state.current_game_phase = "ATTACK"
+            gs.current_game_phase = "ATTACK"
             self.has_logged_current_turn_player_phase = False # Phase changed
             self.ai_is_thinking = False # Ensure not stuck in thinking
             if self.gui: self._update_gui_full_state()
             return
 
-        current_reinforcements = player.armies_to_deploy
-        current_cards = len(player.hand)
-        prompt_details = [f"You have {current_reinforcements} armies to deploy.", f"You currently hold {current_cards} cards."]
-        if any(a['type'] == 'TRADE_CARDS' and a.get('must_trade') for a in valid_actions):
-            prompt_details.append("You MUST trade cards as you have 5 or more and a valid set is available.")
-        elif any(a['type'] == 'TRADE_CARDS' for a in valid_actions):
-            prompt_details.append("You may optionally trade cards if you have a valid set.")
-        system_prompt_addition = "It is your REINFORCE phase. " + " ".join(prompt_details)
+        trade_actions = actions_by_type.get('TRADE_CARDS', ())
+        if any(a.get('must_trade') for a in trade_actions):
+            trade_hint = _REINFORCE_MUST_TRADE_HINT
+        elif trade_actions:
+            trade_hint = _REINFORCE_MAY_TRADE_HINT
+        else:
+            trade_hint = ""
+        system_prompt_addition = _REINFORCE_PROMPT_TMPL.format(armies=player.armies_to_deploy, cards=len(player.hand),
+                                                               trade_hint=trade_hint)
 
-        self._execute_ai_turn_async(agent, self.engine.game_state.to_json_with_history(), valid_actions, self.game_rules, system_prompt_addition)
+        self._execute_ai_turn_async(agent, gs.to_json_with_history_cached(), valid_actions, self.game_rules, system_prompt_addition)
 
     def _process_reinforce_ai_action(self, player: GamePlayer, agent: BaseAIAgent, ai_response: dict):
         """Processes the AI's action for the REINFORCE phase."""
@@ -995,122 +1454,202 @@ class GameOrchestrator:
         if not action or not isinstance(action, dict) or "type" not in action:
             self.log_turn_info(f"{player.name} provided malformed or missing REINFORCE action: {action}. AI will be prompted again.")
             self.ai_is_thinking = False # Allow re-triggering AI for next reinforce sub-step.
-            if self.gui: self._update_gui_full_state()
-            return
+            return # Nothing changed, no GUI refresh needed.
 
         action_type = action["type"]
         self.log_turn_info(f"{player.name} REINFORCE action: {action_type} - Details: {action}")
 
-        # Handle diplomatic actions first if chosen
-        if _process_diplomatic_action(self, player, action):
-            self.ai_is_thinking = False # Diplomatic action taken, AI can make another move in Reinforce
-            if self.gui: self._update_gui_full_state()
-            return
+        # Handlers return True only when they changed GUI-visible state; rejected actions skip the refresh.
+        handler = self._reinforce_handlers.get(action_type)
+        if handler:
+            state_changed = handler(player, agent, action)
+        else: # Unknown action type
+            self.log_turn_info(f"{player.name} provided an unknown REINFORCE action type: '{action_type}'. AI will be prompted again.")
+            self.ai_is_thinking = False # Allow AI to retry its reinforce turn with a valid action.
+            state_changed = False
 
-        if action_type == "TRADE_CARDS":
-            card_indices = action.get("card_indices")
-            # Validate card_indices (must be a list of integers)
-            if not isinstance(card_indices, list) or not all(isinstance(idx, int) for idx in card_indices):
-                self.log_turn_info(f"{player.name} selected TRADE_CARDS with invalid indices format: {card_indices}. AI will be prompted again.")
-            else:
-                trade_result = self.engine.perform_card_trade(player, card_indices)
-                log_message = trade_result.get('message', f"Trade attempt by {player.name} with cards {card_indices}.")
-                self.log_turn_info(log_message)
-                if trade_result.get("success"):
-                    self.log_turn_info(f"{player.name} gained {trade_result['armies_gained']} armies. Total to deploy: {player.armies_to_deploy}.")
-                    if trade_result.get("territory_bonus"): self.log_turn_info(trade_result["territory_bonus"])
-                    # Log card trade event
-                    self.engine.game_state.event_history.append({
-                        "turn": self.engine.game_state.current_turn_number,
-                        "type": "CARD_TRADE",
-                        "player": player.name,
-                        "cards_traded_symbols": trade_result.get("traded_card_symbols", []), # From engine log
-                        "armies_gained": trade_result.get("armies_gained", 0),
-                        "territory_bonus_info": trade_result.get("territory_bonus") # Will be None or a string message
-                    })
-                # else: Card trade failed, message already logged by engine.
-            # After any trade attempt, AI needs to make another decision (deploy, trade again if possible, or end).
-            self.ai_is_thinking = False
+        self._flush_event_buffer()
+        if self.gui and state_changed: self._update_gui_full_state()
 
-        elif action_type == "DEPLOY":
-            terr_name = action.get("territory")
-            num_armies_to_deploy = action.get("num_armies")
-
-            # Validate parameters
-            if not isinstance(terr_name, str) or not isinstance(num_armies_to_deploy, int):
-                self.log_turn_info(f"{player.name} invalid DEPLOY parameters: territory='{terr_name}', num_armies='{num_armies_to_deploy}'. AI will be prompted again.")
-            elif num_armies_to_deploy <= 0:
-                self.log_turn_info(f"{player.name} attempted DEPLOY with non-positive armies: {num_armies_to_deploy}. AI will be prompted again.")
-            elif player.armies_to_deploy == 0:
-                 self.log_turn_info(f"{player.name} attempted DEPLOY but has no armies to deploy. AI will be prompted again (may need to END_REINFORCE_PHASE or TRADE_CARDS).")
-            else:
-                territory_obj = self.engine.game_state.territories.get(terr_name)
-                if not territory_obj:
-                    self.log_turn_info(f"{player.name} attempted DEPLOY to non-existent territory: {terr_name}. AI will be prompted again.")
-                elif territory_obj.owner != player:
-                    self.log_turn_info(f"{player.name} attempted DEPLOY to territory '{terr_name}' not owned by them. Owner: {territory_obj.owner.name if territory_obj.owner else 'None'}. AI will be prompted again.")
-                else:
-                    # Validations passed, proceed with deployment logic directly here
-                    actual_armies_to_deploy_on_territory = min(num_armies_to_deploy, player.armies_to_deploy)
+    def _flush_event_buffer(self):
+        """Appends buffered orchestrator events to event_history in one go; trims old turns once per turn."""
+        gs = self.engine.game_state
+        history = gs.event_history
+        if self._event_buffer:
+            history.extend(self._event_buffer)
+            self._event_buffer.clear()
+
+        current_turn = gs.current_turn_number
+        if current_turn != self._committed_turn:
+            self._committed_turn = current_turn
+            if self.event_history_turn_horizon is None:
+                return
+            # Events are aged by the turn in which they reached event_history, not by their own "turn"
+            # field: some events have none, and buffered events can land after newer engine events.
+            # Events already stamped with the new turn (e.g. from next_turn) count as part of it.
+            marks = self._turn_start_seqs
+            mark = history.appended
+            floor = max(history.first_seq(), marks[-1][1] if marks else 0)
+            while mark > floor:
+                event = history[mark - history.first_seq() - 1]
+                event_turn = event.get("turn") if type(event) is dict else event.turn
+                if event_turn is None or event_turn < current_turn:
+                    break
+                mark -= 1
+            marks.append((current_turn, mark))
+            horizon = current_turn - self.event_history_turn_horizon
+            while marks[0][0] < horizon:
+                marks.popleft()
+            cut = marks[0][1] # Events from this sequence number on arrived within the horizon
+            trimmed = False
+            while history and history.first_seq() < cut:
+                history.popleft()
+                trimmed = True
+            if trimmed:
+                gs.version += 1
+
+    def _handle_diplomatic_response(self, player: GamePlayer, agent: BaseAIAgent, action: dict) -> bool:
+        """ACCEPT_ALLIANCE / REJECT_ALLIANCE, valid in REINFORCE and ATTACK."""
+        gs = self.engine.game_state
+        version_before = gs.version
+        _process_diplomatic_action(self, player, action)
+        self.ai_is_thinking = False # Diplomatic action taken, AI can make another move in the current phase
+        return gs.version != version_before # The helper bumps version only when diplomacy actually changed
 
-                    if actual_armies_to_deploy_on_territory > 0 :
-                        territory_obj.army_count += actual_armies_to_deploy_on_territory
-                        player.armies_to_deploy -= actual_armies_to_deploy_on_territory
-                        self.log_turn_info(f"{player.name} deployed {actual_armies_to_deploy_on_territory} armies to {terr_name} (new total: {territory_obj.army_count}). Armies left to deploy: {player.armies_to_deploy}.")
-                    else:
-                        # This case implies num_armies_to_deploy from AI was <=0, or player.armies_to_deploy was already 0.
-                        # The num_armies_to_deploy <= 0 is already checked above.
-                        # So this means player.armies_to_deploy was 0, which is also checked above.
-                        # This specific else should ideally not be reached if prior checks are comprehensive.
-                        self.log_turn_info(f"{player.name} DEPLOY action for {terr_name} resulted in no armies deployed (requested: {num_armies_to_deploy}, available: {player.armies_to_deploy}). AI will be prompted again.")
-            # After deploying (or attempting to), AI needs to make another decision.
-            self.ai_is_thinking = False
+    def _handle_reinforce_trade_cards(self, player: GamePlayer, agent: BaseAIAgent, action: dict) -> bool:
+        gs = self.engine.game_state
+        state_changed = False
+        card_indices = action.get("card_indices")
+        # Validate card_indices shape here; perform_card_trade rejects non-integer, duplicate or out-of-range indices
+        if type(card_indices) is not list:
+            self.log_turn_info(f"{player.name} selected TRADE_CARDS with invalid indices format: {card_indices}. AI will be prompted again.")
+        else:
+            trade_result = self.engine.perform_card_trade(player, card_indices)
+            log_message = trade_result.get('message', f"Trade attempt by {player.name} with cards {card_indices}.")
+            self.log_turn_info(log_message)
+            if trade_result.get("success"):
+                state_changed = True
+                self.log_turn_info(f"{player.name} gained {trade_result['armies_gained']} armies. Total to deploy: {player.armies_to_deploy}.")
+                if trade_result.get("territory_bonus"): self.log_turn_info(trade_result["territory_bonus"])
+                # Log card trade event
+                self._event_buffer.append(CardTradeEvent(
+                    gs.current_turn_number, player.name,
+                    tuple(trade_result.get("traded_card_symbols", ())), # From engine log
+                    trade_result.get("armies_gained", 0),
+                    trade_result.get("territory_bonus") # Will be None or a string message
+                ))
+            # else: Card trade failed, message already logged by engine.
+        # After any trade attempt, AI needs to make another decision (deploy, trade again if possible, or end).
+        self.ai_is_thinking = False
+        return state_changed
 
-        elif action_type == "END_REINFORCE_PHASE":
-            # Check for must_trade condition before allowing end of phase
-            # Re-fetch valid actions as game state might have changed (e.g. after a trade)
-            current_valid_actions = self.engine.get_valid_actions(player) # Get fresh valid actions
-            if any(a['type'] == 'TRADE_CARDS' and a.get('must_trade') for a in current_valid_actions):
-                 self.log_turn_info(f"{player.name} tried END_REINFORCE_PHASE but MUST_TRADE cards. AI will be prompted again.")
-                 self.ai_is_thinking = False # AI needs to make a new decision (trade)
+    def _handle_reinforce_deploy(self, player: GamePlayer, agent: BaseAIAgent, action: dict) -> bool:
+        state_changed = False
+        try:
+            terr_name, num_armies_to_deploy = _deploy_get(action)
+        except KeyError:
+            terr_name = num_armies_to_deploy = None # Reported as invalid below
+        armies_available = player.armies_to_deploy
+
+        # Validate parameters
+        if not isinstance(terr_name, str) or not isinstance(num_armies_to_deploy, int):
+            self.log_turn_info(f"{player.name} invalid DEPLOY parameters: territory='{terr_name}', num_armies='{num_armies_to_deploy}'. AI will be prompted again.")
+        elif num_armies_to_deploy <= 0:
+            self.log_turn_info(f"{player.name} attempted DEPLOY with non-positive armies: {num_armies_to_deploy}. AI will be prompted again.")
+        elif armies_available == 0:
+             self.log_turn_info(f"{player.name} attempted DEPLOY but has no armies to deploy. AI will be prompted again (may need to END_REINFORCE_PHASE or TRADE_CARDS).")
+        else:
+            gs = self.engine.game_state
+            territory_obj = gs.territories.get(terr_name)
+            if not territory_obj:
+                self.log_turn_info(f"{player.name} attempted DEPLOY to non-existent territory: {terr_name}. AI will be prompted again.")
+            elif territory_obj.owner != player:
+                self.log_turn_info(f"{player.name} attempted DEPLOY to territory '{terr_name}' not owned by them. Owner: {territory_obj.owner.name if territory_obj.owner else 'None'}. AI will be prompted again.")
             else:
-                if player.armies_to_deploy > 0:
-                    self.log_turn_info(f"Warning: {player.name} chose END_REINFORCE_PHASE with {player.armies_to_deploy} armies remaining. Auto-distributing.")
-                    self.auto_distribute_armies(player, player.armies_to_deploy) # auto_distribute_armies sets player.armies_to_deploy to 0
-                else:
-                     self.log_turn_info(f"{player.name} ends REINFORCE phase with all armies deployed.")
+                # Validations passed, proceed with deployment logic directly here.
+                # num_armies_to_deploy > 0 and armies_available > 0 are guaranteed above, so this is always positive.
+                deployed = min(num_armies_to_deploy, armies_available)
+                new_total = territory_obj.army_count + deployed
+                territory_obj.army_count = new_total
+                player.armies_to_deploy = armies_available - deployed
+                gs.version += 1
+                state_changed = True
+                self.log_turn_info(f"{player.name} deployed {deployed} armies to {terr_name} (new total: {new_total}). Armies left to deploy: {armies_available - deployed}.")
+        # After deploying (or attempting to), AI needs to make another decision.
+        self.ai_is_thinking = False
+        return state_changed
+
+    def _handle_reinforce_end_phase(self, player: GamePlayer, agent: BaseAIAgent, action: dict) -> bool:
+        # Check for must_trade condition before allowing end of phase.
+        # player.must_trade is a cheap hand-size check; only look for sets when it holds
+        # (mirrors get_valid_actions, which only offers mandatory trades when a set exists).
+        if player.must_trade and self.engine.has_valid_card_set(player):
+             self.log_turn_info(f"{player.name} tried END_REINFORCE_PHASE but MUST_TRADE cards. AI will be prompted again.")
+             self.ai_is_thinking = False # AI needs to make a new decision (trade)
+             return False
+        else:
+            if player.armies_to_deploy > 0:
+                self.log_turn_info(f"Warning: {player.name} chose END_REINFORCE_PHASE with {player.armies_to_deploy} armies remaining. Auto-distributing.")
+                self.auto_distribute_armies(player, player.armies_to_deploy) # auto_distribute_armies sets player.armies_to_deploy to 0
+            else:
+                 self.log_turn_info(f"{player.name} ends REINFORCE phase with all armies deployed.")
 
-                player.armies_to_deploy = 0 # Ensure it's zeroed out
-                self.engine.game_state.current_game_phase = "ATTACK"
-                self.has_logged_current_turn_player_phase = False # So new phase header logs
-                self.ai_is_thinking = False # Reinforce phase is over for this player.
-                print(f"Orchestrator: {player.name} REINFORCE phase ended. Transitioning to ATTACK.")
+            player.armies_to_deploy = 0 # Ensure it's zeroed out
+            self.engine.game_state.current_game_phase = "ATTACK"
+            self.has_logged_current_turn_player_phase = False # So new phase header logs
+            self.ai_is_thinking = False # Reinforce phase is over for this player.
+            print(f"Orchestrator: {player.name} REINFORCE phase ended. Transitioning to ATTACK.")
+            return True
 
-        else: # Unknown action type
-            self.log_turn_info(f"{player.name} provided an unknown REINFORCE action type: '{action_type}'. AI will be prompted again.")
-            self.ai_is_thinking = False # Allow AI to retry its reinforce turn with a valid action.
+    def _dip_key(self, name_a: str, name_b: str) -> frozenset[str]:
+        """Returns the shared frozenset key for a pair of players, so its hash is computed only once."""
+        key = self._dip_key_cache.get((name_a, name_b)) # Both orders are cached
+        if key is None:
+            key = frozenset((name_a, name_b))
+            self._dip_key_cache[(name_a, name_b)] = self._dip_key_cache[(name_b, name_a)] = key
+        return key
 
-        if self.gui: self._update_gui_full_state()
+    def _get_valid_actions_cached(self, player: GamePlayer) -> tuple[list[dict], dict[str, list[dict]]]:
+        """
+        Returns (valid_actions, actions_by_type) for the player, reusing the last result while
+        the game state version, phase, PAF flag and fortify flag are unchanged. Callers must not mutate the lists.
+        Not cached while a post-elimination trade is pending: get_valid_actions settles that requirement itself.
+        """
+        gs = self.engine.game_state
+        pending_elimination_trade = gs.elimination_card_trade_player_name is not None
+        cache_key = (gs.version, player.name, gs.current_game_phase, gs.requires_post_attack_fortify, player.has_fortified_this_turn)
+        if not pending_elimination_trade and self._va_cache is not None and self._va_cache[0] == cache_key:
+            return self._va_cache[1], self._va_cache[2]
+
+        valid_actions = self.engine.get_valid_actions(player)
+        actions_by_type: dict[str, list[dict]] = {}
+        for va in valid_actions:
+            actions_by_type.setdefault(va['type'], []).append(va)
+        self._va_cache = None if pending_elimination_trade else (cache_key, valid_actions, actions_by_type)
+        return valid_actions, actions_by_type
 
     def _initiate_attack_ai_action(self, player: GamePlayer, agent: BaseAIAgent):
         """Gathers info and starts the AI thinking for the ATTACK phase (or PAF)."""
+        eng = self.engine
+        gs = eng.game_state
         self.log_turn_info(f"Orchestrator: Initiating ATTACK/PAF AI action for {player.name}.") # Changed print to log_turn_info
-        game_state_json = self.engine.game_state.to_json()
 
-        paf_required = self.engine.game_state.requires_post_attack_fortify
+        paf_required = gs.requires_post_attack_fortify
         self.log_turn_info(f"Orchestrator: _initiate_attack_ai_action for {player.name}. PAF required: {paf_required}.")
 
         if paf_required:
-            # Valid actions should primarily be PAF if required.
-            valid_actions = self.engine.get_valid_actions(player)
-            self.log_turn_info(f"Orchestrator: PAF is required for {player.name}. Valid actions from engine: {valid_actions}")
-            paf_actions = [va for va in valid_actions if va['type'] == "POST_ATTACK_FORTIFY"]
-
-            if not paf_actions:
-                self.log_turn_info(f"CRITICAL ERROR: PAF required for {player.name} but no PAF action generated. Conquest context: {self.engine.game_state.conquest_context}. Clearing flag and moving to FORTIFY for safety.");
-                self.engine.game_state.requires_post_attack_fortify = False
-                self.engine.game_state.conquest_context = None
-                self.engine.game_state.current_game_phase = "FORTIFY"
+            # Only the PAF move is valid; build it from the conquest context instead of enumerating all actions.
+            paf_detail = eng.get_paf_action(player)
+            if self._debug_on:
+                self.log_turn_info(f"Orchestrator: PAF is required for {player.name}. PAF action from engine: {paf_detail}")
+
+            if paf_detail is None:
+                self.log_turn_info(f"CRITICAL ERROR: PAF required for {player.name} but no PAF action generated. Clearing flag and moving to FORTIFY for safety.")
+                if self._debug_on:
+                    self.log_turn_info(f"Orchestrator: Conquest context at PAF failure: {gs.conquest_context}")
+                gs.requires_post_attack_fortify = False
+                gs.conquest_context = None
+                gs.current_game_phase = "FORTIFY"
                 self.has_logged_current_turn_player_phase = False
                 self.ai_is_thinking = False
                 if self.gui: self._update_gui_full_state()
@@ -1118,24 +1657,36 @@ class GameOrchestrator:
                 # The main loop in advance_game_turn will pick up the new FORTIFY phase.
                 return
             else:
-                paf_detail = paf_actions[0]
-                from_terr_obj = self.engine.game_state.territories.get(paf_detail['from_territory'])
+                paf_actions = [paf_detail]
+                fr = paf_detail['from_territory']
+                mn = paf_detail['min_armies']
+                mx = paf_detail['max_armies']
+                from_terr_obj = gs.territories.get(fr)
                 from_army_count = from_terr_obj.army_count if from_terr_obj else "N/A"
-                paf_prompt = (f"You conquered {paf_detail['to_territory']}. You MUST move between {paf_detail['min_armies']} and {paf_detail['max_armies']} armies "
-                              f"from {paf_detail['from_territory']} (currently has {from_army_count} armies) "
-                              f"to the newly conquered {paf_detail['to_territory']}.")
-                self.log_turn_info(f"Orchestrator: Prompting {player.name} for PAF with actions: {paf_actions}. Prompt: {paf_prompt}")
-                self._execute_ai_turn_async(agent, self.engine.game_state.to_json_with_history(), paf_actions, self.game_rules, paf_prompt)
+
+                # If only one amount is legal (min == max, or the source can spare exactly the minimum),
+                # there is nothing for the AI to decide: apply it directly and skip the LLM round-trip.
+                if mx == mn or (from_terr_obj and from_terr_obj.army_count - 1 == mn):
+                    fortify_log = eng.perform_post_attack_fortify(player, mn)
+                    self.log_turn_info(f"Orchestrator: Forced PAF for {player.name} ({mn} armies), applied without AI: {fortify_log.get('message', 'PAF outcome unknown.')}")
+                    if fortify_log.get("success"):
+                        self.ai_is_thinking = False
+                        if self.gui: self._update_gui_full_state()
+                        return # Main loop re-initiates the ATTACK phase for this player.
+                    # Engine rejected it; fall back to asking the AI.
+
+                paf_prompt = _PAF_TMPL.format(to=paf_detail['to_territory'], mn=mn, mx=mx, fr=fr, cur=from_army_count)
+                if self._debug_on:
+                    self.log_turn_info(f"Orchestrator: Prompting {player.name} for PAF with actions: {paf_actions}. Prompt: {paf_prompt}")
+                self._execute_ai_turn_async(agent, gs.to_json_with_history_cached(), paf_actions, self.game_rules, paf_prompt)
                 self.log_turn_info(f"Orchestrator: PAF AI action initiated for {player.name}. ai_is_thinking is now: {self.ai_is_thinking}")
                 return # AI is now thinking about PAF, advance_game_turn will detect ai_is_thinking.
 
-        # If no PAF pending, proceed with regular attack options
-        valid_actions = self.engine.get_valid_actions(player)
-        self.log_turn_info(f"Orchestrator: Regular ATTACK phase for {player.name}. Valid actions from engine: {valid_actions}")
-
-        if not valid_actions or (len(valid_actions) == 1 and valid_actions[0]['type'] == "END_ATTACK_PHASE"):
-            self.log_turn_info(f"Orchestrator: No actual attack options (or only END_ATTACK_PHASE) for {player.name}. Transitioning phase to FORTIFY directly in _initiate_attack_ai_action.")
-            self.engine.game_state.current_game_phase = "FORTIFY"
+        # If no PAF pending, proceed with regular attack options.
+        # has_attack_option() answers "anything to attack?" without enumerating every valid action.
+        if not eng.has_attack_option(player):
+            self.log_turn_info(f"Orchestrator: No actual attack options for {player.name}. Transitioning phase to FORTIFY directly in _initiate_attack_ai_action.")
+            gs.current_game_phase = "FORTIFY"
             self.has_logged_current_turn_player_phase = False
             self.ai_is_thinking = False # Ensure AI is not marked as thinking for ATTACK phase
             if self.gui: self._update_gui_full_state()
@@ -1144,17 +1695,27 @@ class GameOrchestrator:
             # We return here because this function's job (initiating an ATTACK AI action) is done (it decided not to).
             return
 
+        valid_actions, _ = self._get_valid_actions_cached(player)
+        if self._debug_on:
+            self.log_turn_info(f"Orchestrator: Regular ATTACK phase for {player.name}. Valid actions from engine: {valid_actions}")
+
         # Proceed to ask AI for an attack action
-        attacks_this_turn = self.current_ai_context.get("attacks_this_turn", 0) if self.current_ai_context else 0
-        prompt_elements = [f"It is your attack phase. You have made {attacks_this_turn} attacks this turn.", f"You have {len(player.hand)} cards."]
-        other_players_info = []
-        for p_other in self.engine.game_state.players:
-            if p_other != player: other_players_info.append(f"{p_other.name}({len(p_other.hand)}c, {len(p_other.territories)}t)")
-        if other_players_info: prompt_elements.append("Opponents: " + "; ".join(other_players_info))
-        system_prompt_addition = " ".join(prompt_elements)
+        ctx = self.current_ai_context
+        attacks_this_turn = ctx.get("attacks_this_turn", 0) if ctx else 0
+        # Hands and territory counts only change through versioned engine mutations, so the prompt
+        # (and its opponents summary) is reused while the version and attack count are unchanged.
+        prompt_key = (gs.version, player.name, attacks_this_turn)
+        if self._attack_prompt_cache is not None and self._attack_prompt_cache[0] == prompt_key:
+            system_prompt_addition = self._attack_prompt_cache[1]
+        else:
+            opponents_info = "; ".join(f"{p_other.name}({len(p_other.hand)}c, {len(p_other.territories)}t)"
+                                       for p_other in gs.players if p_other is not player)
+            system_prompt_addition = _ATTACK_PROMPT_TMPL.format(attacks=attacks_this_turn, cards=len(player.hand),
+                                                                opponents=' Opponents: ' + opponents_info if opponents_info else '')
+            self._attack_prompt_cache = (prompt_key, system_prompt_addition)
 
         self.log_turn_info(f"Orchestrator: Prompting {player.name} for regular ATTACK action with {len(valid_actions)} options. System prompt addition: {system_prompt_addition}")
-        self._execute_ai_turn_async(agent, self.engine.game_state.to_json_with_history(), valid_actions, self.game_rules, system_prompt_addition)
+        self._execute_ai_turn_async(agent, gs.to_json_with_history_cached(), valid_actions, self.game_rules, system_prompt_addition)
         self.log_turn_info(f"Orchestrator: Regular ATTACK AI action initiated for {player.name}. ai_is_thinking is now: {self.ai_is_thinking}")
 
         if self.current_ai_context:
@@ -1163,316 +1724,351 @@ class GameOrchestrator:
 
     def _process_attack_ai_action(self, player: GamePlayer, agent: BaseAIAgent, ai_response: dict):
         """Processes the AI's action for the ATTACK phase."""
-        self.log_turn_info(f"Orchestrator: Processing ATTACK AI action for {player.name}. AI Response: {ai_response}")
+        gs = self.engine.game_state
+        if self.pending_neutral_defense is not None:
+            # This response is the neutral defense dice choice requested by _handle_attack_attack.
+            state_changed = self._resume_neutral_defense_attack(player, ai_response)
+            self.log_turn_info(f"Orchestrator: End of _process_attack_ai_action for {player.name}. ai_is_thinking: {self.ai_is_thinking}, current_phase: {gs.current_game_phase}")
+            self._flush_event_buffer()
+            if self.gui and state_changed: self._update_gui_full_state()
+            return
+        if self._debug_on:
+            self.log_turn_info(f"Orchestrator: Processing ATTACK AI action for {player.name}. AI Response: {ai_response}")
+        else:
+            self.log_turn_info(f"Orchestrator: Processing ATTACK AI action for {player.name}.")
         action = ai_response.get("action")
 
-        # Retrieve attacks_this_turn from context if available, default to 0
-        attacks_this_turn = 0
-        if self.current_ai_context and isinstance(self.current_ai_context.get("attacks_this_turn"), int):
-            attacks_this_turn = self.current_ai_context["attacks_this_turn"]
-
         if not action or not isinstance(action, dict) or "type" not in action:
             self.log_turn_info(f"Orchestrator: Player {player.name} provided malformed or missing ATTACK action: {action}. AI will be prompted again for ATTACK phase.")
             self.ai_is_thinking = False # Allow re-triggering AI for next attack sub-step.
-            if self.gui: self._update_gui_full_state()
-            return
+            return # Nothing changed, no GUI refresh needed.
 
         action_type = action["type"]
         self.log_turn_info(f"Orchestrator: Player {player.name} ATTACK action type: '{action_type}'. Details: {action}")
 
-        # Handle diplomatic actions first if chosen (e.g. ACCEPT/REJECT if proposed via chat earlier)
-        # or BREAK_ALLIANCE if chosen as a formal action.
-        # The `_process_diplomatic_action` method is designed for ACCEPT/REJECT.
-        # BREAK_ALLIANCE is already handled further down.
-        # We need to make sure that if a diplomatic action (ACCEPT/REJECT) is taken,
-        # the player can still perform another attack phase action.
-        if action_type in ["ACCEPT_ALLIANCE", "REJECT_ALLIANCE"]:
-            if self._process_diplomatic_action(self, player, action):
-                self.ai_is_thinking = False # Diplomatic action processed, AI can make another move in Attack phase
-                if self.gui: self._update_gui_full_state()
-                return # Return to allow re-initiation of AI for attack phase
-
-        if action_type == "POST_ATTACK_FORTIFY":
-            num_to_move = action.get("num_armies")
-            conquest_ctx = self.engine.game_state.conquest_context
-            min_movable_default = conquest_ctx.get('min_movable', 1) if conquest_ctx else 1
-
-            if not isinstance(num_to_move, int): # Basic type check
-                self.log_turn_info(f"Orchestrator: {player.name} PAF num_armies invalid type: {num_to_move}. Defaulting to min: {min_movable_default}.")
-                num_to_move = min_movable_default
-
-            # perform_post_attack_fortify will validate min/max bounds based on conquest_context
-            fortify_log = self.engine.perform_post_attack_fortify(player, num_to_move)
-            self.log_turn_info(f"Orchestrator: {player.name} PAF engine call result: {fortify_log.get('message', 'PAF outcome unknown.')}")
-            self.log_turn_info(f"Orchestrator: PAF for {player.name} complete. PAF required is now: {self.engine.game_state.requires_post_attack_fortify}")
-
-            self.ai_is_thinking = False # Ready for next attack or end phase.
-            if self.engine.is_game_over():
-                 self.ai_is_thinking = False # Ensure AI is not stuck if game ends. Fall through to GUI update.
-
-        elif action_type == "ATTACK":
-            from_territory_name = action.get("from")
-            to_territory_name = action.get("to")
-            num_armies = action.get("num_armies")
-
-            if not all(isinstance(param, str) for param in [from_territory_name, to_territory_name]) or \
-               not isinstance(num_armies, int) or num_armies <= 0:
-                self.log_turn_info(f"Orchestrator: {player.name} invalid ATTACK parameters: from='{from_territory_name}', to='{to_territory_name}', num_armies='{num_armies}'. AI will be prompted again.")
-                # No actual attack performed, AI needs to retry.
-                self.ai_is_thinking = False # Allow re-triggering for ATTACK phase
-                if self.gui: self._update_gui_full_state()
-                return # Return to main loop to re-initiate AI for attack phase.
-
-            # Check if defender is Neutral in a 2-player game
-            defender_territory_obj = self.engine.game_state.territories.get(to_territory_name)
-            explicit_defense_dice = None
-            if self.is_two_player_mode and defender_territory_obj and \
-               defender_territory_obj.owner and defender_territory_obj.owner.is_neutral:
-
-                other_human_player = None
-                for p_obj in self.engine.game_state.players:
-                    if not p_obj.is_neutral and p_obj.name != player.name: # player is the attacker
-                        other_human_player = p_obj
-                        break
-
-                if other_human_player:
-                    other_human_agent = self.get_agent_for_player(other_human_player)
-                    if other_human_agent:
-                        self.log_turn_info(f"Neutral territory {to_territory_name} attacked by {player.name}. Prompting {other_human_player.name} for defense dice.")
-
-                        defense_dice_options = []
-                        if defender_territory_obj.army_count >= 1: defense_dice_options.append({"type": "CHOOSE_DEFENSE_DICE", "num_dice": 1})
-                        if defender_territory_obj.army_count >= 2: defense_dice_options.append({"type": "CHOOSE_DEFENSE_DICE", "num_dice": 2})
-
-                        if defense_dice_options:
-                            # This is a nested, synchronous AI call for simplicity here.
-                            # TODO: Could be made async if this causes noticeable delays.
-                            def_prompt = (f"Player {player.name} is attacking neutral territory {to_territory_name} "
-                                          f"(armies: {defender_territory_obj.army_count}). "
-                                          f"You ({other_human_player.name}) must choose how many dice Neutral will defend with.")
-                            # Use a simplified game_rules for this specific choice.
-                            def_rules = "Choose one action from the list: {'type': 'CHOOSE_DEFENSE_DICE', 'num_dice': 1_or_2}"
-
-                            # Temporarily set active AI for this sub-call for logging purposes
-                            original_active_ai_name = self.active_ai_player_name
-                            self.active_ai_player_name = other_human_agent.player_name
-
-                            defense_choice_response = other_human_agent.get_thought_and_action(
-                                self.engine.game_state.to_json_with_history(), defense_dice_options, def_rules, def_prompt
-                            )
-                            self.log_ai_thought(other_human_agent.player_name, defense_choice_response.get("thought", "N/A (defense dice choice)"))
-                            self.active_ai_player_name = original_active_ai_name # Restore
-
-                            defense_action = defense_choice_response.get("action")
-                            if defense_action and defense_action.get("type") == "CHOOSE_DEFENSE_DICE":
-                                explicit_defense_dice = defense_action.get("num_dice")
-                                if not (explicit_defense_dice == 1 or (explicit_defense_dice == 2 and defender_territory_obj.army_count >=2)):
-                                    self.log_turn_info(f"Warning: Invalid defense dice choice {explicit_defense_dice} from {other_human_player.name}. Defaulting to 1 die.")
-                                    explicit_defense_dice = 1 if defender_territory_obj.army_count >=1 else 0
-                            else: # AI failed to choose or malformed action
-                                self.log_turn_info(f"Warning: {other_human_player.name} failed to choose defense dice. Defaulting to 1 die.")
-                                explicit_defense_dice = 1 if defender_territory_obj.army_count >=1 else 0
-                        else: # Neutral territory has 0 armies
-                            explicit_defense_dice = 0
-                    else: # No agent for other human player
-                        self.log_turn_info(f"Warning: No AI agent for other human player {other_human_player.name} to choose neutral defense. Defaulting dice.")
-                        explicit_defense_dice = 1 if defender_territory_obj.army_count >=1 else 0 # Or some other default
-                else: # Should not happen in 2P mode
-                    self.log_turn_info("Warning: Could not find other human player in 2P mode for neutral defense. Defaulting dice.")
-                    explicit_defense_dice = 1 if defender_territory_obj.army_count >=1 else 0
-
-            # Call engine's perform_attack
-            attack_log = self.engine.perform_attack(from_territory_name, to_territory_name, num_armies, explicit_defense_dice)
-            self.log_turn_info(f"Orchestrator: Engine perform_attack log for {player.name}: {attack_log}")
-
-            if "error" not in attack_log: # Only increment if attack was valid and processed
-                attacks_this_turn += 1
-                if self.current_ai_context: self.current_ai_context["attacks_this_turn"] = attacks_this_turn
-                self.log_turn_info(f"Orchestrator: {player.name} attacks_this_turn incremented to: {attacks_this_turn}")
-
-                if "error" not in attack_log:
-                    if attack_log.get("conquered"):
-                        self.log_turn_info(f"Orchestrator: {player.name} conquered {to_territory_name}. PAF required: {self.engine.game_state.requires_post_attack_fortify}. Card drawn: {attack_log.get('card_drawn') is not None}.")
-                        if attack_log.get("eliminated_player_name"):
-                             elim_name = attack_log.get("eliminated_player_name")
-                             self.log_turn_info(f"Orchestrator: {player.name} ELIMINATED {elim_name}!")
-                             self.global_chat.broadcast("GameSystem", f"{player.name} eliminated {elim_name}!")
-                             self.handle_player_elimination(elim_name)
-                             if self.engine.is_game_over():
-                                 self.ai_is_thinking = False # Ensure AI not stuck
-                                 # Game over will be handled by advance_game_turn loop.
-                                 # Update GUI and return to let advance_game_turn handle game over.
-                                 if self.gui: self._update_gui_full_state()
-                                 return
-                # else: Error already logged by engine or in attack_log.
-            self.ai_is_thinking = False # AI ready for next decision (PAF, another attack, or end phase).
-
-        elif action_type == "END_ATTACK_PHASE":
-            self.log_turn_info(f"Orchestrator: {player.name} chose to end ATTACK phase. Transitioning to FORTIFY.")
-            self.engine.game_state.current_game_phase = "FORTIFY"
-            self.has_logged_current_turn_player_phase = False
+        # Handlers return True only when they changed GUI-visible state; rejected actions skip the refresh.
+        handler = self._attack_handlers.get(action_type)
+        if handler:
+            state_changed = handler(player, agent, action)
+        else:
+            self.log_turn_info(f"Orchestrator: Player {player.name} provided an unknown ATTACK action type: '{action_type}'. AI will be prompted again.")
             self.ai_is_thinking = False
-            # print(f"Orchestrator: {player.name} ATTACK phase ended. Transitioning to FORTIFY.") # Replaced by log
+            state_changed = False
 
-        elif action_type == "GLOBAL_CHAT":
-            message = action.get("message", "")
-            if isinstance(message, str) and message.strip():
-                self.global_chat.broadcast(player.name, message)
-                self.log_turn_info(f"Orchestrator: {player.name} (Global Chat): {message}")
-            else:
-                self.log_turn_info(f"Orchestrator: {player.name} attempted GLOBAL_CHAT with empty or invalid message.")
-            self.ai_is_thinking = False
+        self.log_turn_info(f"Orchestrator: End of _process_attack_ai_action for {player.name}. ai_is_thinking: {self.ai_is_thinking}, current_phase: {gs.current_game_phase}")
+        self._flush_event_buffer()
+        if self.gui and state_changed: self._update_gui_full_state()
+
+    def _handle_attack_post_attack_fortify(self, player: GamePlayer, agent: BaseAIAgent, action: dict) -> bool:
+        gs = self.engine.game_state
+        num_to_move = action.get("num_armies")
+        conquest_ctx = gs.conquest_context
+        min_movable_default = conquest_ctx.get('min_movable', 1) if conquest_ctx else 1
 
-        elif action_type == "PRIVATE_CHAT":
-            target_player_name = action.get("target_player_name")
-            initial_message = action.get("initial_message")
+        if not isinstance(num_to_move, int): # Basic type check
+            self.log_turn_info(f"Orchestrator: {player.name} PAF num_armies invalid type: {num_to_move}. Defaulting to min: {min_movable_default}.")
+            num_to_move = min_movable_default
 
-            if not isinstance(target_player_name, str) or not isinstance(initial_message, str) or not initial_message.strip():
-                self.log_turn_info(f"Orchestrator: {player.name} invalid PRIVATE_CHAT parameters: target='{target_player_name}', message_empty='{not initial_message.strip() if isinstance(initial_message, str) else True}'.")
-            else:
-                target_game_player_obj = next((p for p in self.engine.game_state.players if p.name == target_player_name), None)
-                target_agent = self.get_agent_for_player(target_game_player_obj) if target_game_player_obj else None
+        # perform_post_attack_fortify will validate min/max bounds based on conquest_context
+        fortify_log = self.engine.perform_post_attack_fortify(player, num_to_move)
+        self.log_turn_info(f"Orchestrator: {player.name} PAF engine call result: {fortify_log.get('message', 'PAF outcome unknown.')}")
+        self.log_turn_info(f"Orchestrator: PAF for {player.name} complete. PAF required is now: {gs.requires_post_attack_fortify}")
 
-                if not target_agent: # Covers target_game_player_obj being None or Neutral
-                    self.log_turn_info(f"Orchestrator: {player.name} invalid PRIVATE_CHAT target: Player '{target_player_name}' not found, is neutral, or not an AI.")
-                elif target_agent == agent:
-                    self.log_turn_info(f"Orchestrator: {player.name} attempted PRIVATE_CHAT with self. Action ignored.")
-                else:
-                    self.log_turn_info(f"Orchestrator: Initiating private chat between {player.name} and {target_player_name}.")
-                    # Define goals for the negotiation based on game context or default
-                    # Example: initiator wants an alliance, recipient wants to evaluate
-                    initiator_goal = f"Your goal is to negotiate a favorable outcome with {target_player_name}. Consider proposing an ALLIANCE, a non-aggression pact, or a joint attack."
-                    recipient_goal = f"Your goal is to evaluate {player.name}'s proposal and negotiate the best terms for yourself. You can accept, reject, or make a counter-offer."
-
-                    conversation_log_entries, negotiated_action = self.private_chat_manager.run_conversation(
-                        agent1=agent, agent2=target_agent,
-                        initial_message=initial_message,
-                        game_state=self.engine.game_state, # Pass full GameState object
-                        game_rules=self.game_rules,
-                        initiator_goal=initiator_goal,
-                        recipient_goal=recipient_goal
-                    )
-                    summary_msg = f"Private chat between {player.name} and {target_player_name} concluded ({len(conversation_log_entries)} messages)."
-                    if self.gui: self.gui.log_action(summary_msg) # Simple log for now
-                    self.log_turn_info(f"Orchestrator: {summary_msg}")
-
-                    if negotiated_action:
-                        self.log_turn_info(f"Orchestrator: Private chat resulted in a negotiated action: {negotiated_action}")
-                        # Process the negotiated_action
-                        # This is a critical step. The orchestrator needs to validate and apply this action.
-                        # Example: If PROPOSE_ALLIANCE, update GameState.diplomacy to "PROPOSED_ALLIANCE"
-                        #          and set up for target_player to accept/reject on their turn.
-                        # If ACCEPT_ALLIANCE, update GameState.diplomacy to "ALLIANCE".
-                        if negotiated_action.get("type") == "PROPOSE_ALLIANCE":
-                            proposer = negotiated_action.get("proposing_player_name")
-                            target = negotiated_action.get("target_player_name")
-                            if proposer and target:
-                                diplomatic_key = frozenset({proposer, target})
-                                # Store proposal detail (who proposed to whom) for later acceptance check
-                                # This might need a new structure in GameState, e.g., gs.pending_proposals
-                                self.engine.game_state.diplomacy[diplomatic_key] = "PROPOSED_ALLIANCE"
-                                # Add details to a new structure like:
-                                self.engine.game_state.diplomacy[diplomatic_key] = "PROPOSED_ALLIANCE" # General status
-                                self.engine.game_state.active_diplomatic_proposals[diplomatic_key] = {
-                                    'proposer': proposer,
-                                    'target': target,
-                                    'type': 'ALLIANCE', # Could be other types like NON_AGGRESSION
-                                    'turn_proposed': self.engine.game_state.current_turn_number
-                                }
-                                self.log_turn_info(f"Diplomacy: {proposer} proposed ALLIANCE to {target}. Proposal recorded.")
-                                self.global_chat.broadcast("GameSystem", f"{proposer} has proposed an alliance to {target} via private channels.")
-                                # Log event
-                                self.engine.game_state.event_history.append({
-                                    "turn": self.engine.game_state.current_turn_number,
-                                    "type": "DIPLOMACY_PROPOSAL",
-                                    "subtype": "ALLIANCE_PROPOSED",
-                                    "proposer": proposer,
-                                    "target": target
-                                })
-                        elif negotiated_action.get("type") == "ACCEPT_ALLIANCE":
-                            accepter = negotiated_action.get("accepting_player_name")
-                            proposer = negotiated_action.get("proposing_player_name")
-                            if accepter and proposer:
-                                diplomatic_key = frozenset({accepter, proposer})
-                                # TODO: Add verification against a pending proposal structure if implemented
-                                self.engine.game_state.diplomacy[diplomatic_key] = "ALLIANCE"
-                                self.log_turn_info(f"Diplomacy: {accepter} ACCEPTED ALLIANCE with {proposer}. Status set to ALLIANCE.")
-                                self.global_chat.broadcast("GameSystem", f"{accepter} and {proposer} have formed an ALLIANCE!")
-                                # Log event
-                                self.engine.game_state.event_history.append({
-                                    "turn": self.engine.game_state.current_turn_number,
-                                    "type": "DIPLOMACY_CHANGE",
-                                    "subtype": "ALLIANCE_FORMED",
-                                    "players": sorted([accepter, proposer])
-                                })
-                        # Add more processing for other negotiated_action types (BREAK_ALLIANCE, etc.)
-                        self._update_gui_full_state() # Update GUI with new diplomatic status
-                    else:
-                        self.log_turn_info(f"Orchestrator: Private chat between {player.name} and {target_player_name} did not result in a formal agreement.")
+        self.ai_is_thinking = False # Ready for next attack or end phase.
+        if self.engine.is_game_over():
+             self.ai_is_thinking = False # Ensure AI is not stuck if game ends. Fall through to GUI update.
+        return bool(fortify_log.get("success"))
 
-            self.ai_is_thinking = False
+    def _handle_attack_attack(self, player: GamePlayer, agent: BaseAIAgent, action: dict) -> bool:
+        gs = self.engine.game_state
+        # Retrieve attacks_this_turn from context if available, default to 0
+        ctx = self.current_ai_context
+        attacks_this_turn = 0
+        if ctx is not None and isinstance(ctx.get("attacks_this_turn"), int):
+            attacks_this_turn = ctx["attacks_this_turn"]
 
-        elif action_type == "BREAK_ALLIANCE":
-            target_player_name = action.get("target_player_name")
-            if player and target_player_name:
-                diplomatic_key = frozenset({player.name, target_player_name})
-                if self.engine.game_state.diplomacy.get(diplomatic_key) == "ALLIANCE":
-                    self.engine.game_state.diplomacy[diplomatic_key] = "NEUTRAL" # Or WAR, depending on desired outcome
-                    self.log_turn_info(f"Diplomacy: {player.name} BROKE ALLIANCE with {target_player_name}. Status set to NEUTRAL.")
-                    self.global_chat.broadcast("GameSystem", f"{player.name} has broken their alliance with {target_player_name}!")
-                    # Log event
-                    self.engine.game_state.event_history.append({
-                        "turn": self.engine.game_state.current_turn_number,
-                        "type": "DIPLOMACY_CHANGE",
-                        "subtype": "ALLIANCE_BROKEN",
-                        "breaker": player.name,
-                        "target": target_player_name,
-                        "new_status": "NEUTRAL"
-                    })
-                    self._update_gui_full_state()
-                else:
-                    self.log_turn_info(f"Orchestrator: {player.name} tried to BREAK_ALLIANCE with {target_player_name}, but no alliance existed.")
-            else:
-                self.log_turn_info(f"Orchestrator: {player.name} tried BREAK_ALLIANCE with invalid parameters: {action}")
-            self.ai_is_thinking = False # Player can make another move in attack phase
+        try:
+            from_territory_name, to_territory_name, num_armies = _attack_get(action)
+        except KeyError:
+            from_territory_name = to_territory_name = num_armies = None # Reported as invalid below
+
+        if not (isinstance(from_territory_name, str) and isinstance(to_territory_name, str) and
+                isinstance(num_armies, int) and num_armies > 0):
+            self.log_turn_info(f"Orchestrator: {player.name} invalid ATTACK parameters: from='{from_territory_name}', to='{to_territory_name}', num_armies='{num_armies}'. AI will be prompted again.")
+            # No actual attack performed, AI needs to retry.
+            self.ai_is_thinking = False # Allow re-triggering for ATTACK phase
+            return False # Main loop re-initiates AI for attack phase.
+
+        # Check if defender is Neutral in a 2-player game
+        defender_territory_obj = gs.territories.get(to_territory_name)
+        explicit_defense_dice = None
+        if self.is_two_player_mode and defender_territory_obj and \
+           defender_territory_obj.owner and defender_territory_obj.owner.is_neutral:
+
+            neutral_armies = defender_territory_obj.army_count
+            other_human_player = self.two_player_opponent_by_name.get(player.name) # player is the attacker
+            other_human_agent = self.get_agent_for_player(other_human_player) if other_human_player else None
+
+            if neutral_armies < 2:
+                # Only one legal choice (1 die, or 0 for an empty territory), so there is nothing to ask.
+                explicit_defense_dice = 1 if neutral_armies >= 1 else 0
+            elif other_human_agent:
+                self.log_turn_info(f"Neutral territory {to_territory_name} attacked by {player.name}. Prompting {other_human_player.name} for defense dice.")
+                def_prompt = (f"Player {player.name} is attacking neutral territory {to_territory_name} "
+                              f"(armies: {neutral_armies}). "
+                              f"You ({other_human_player.name}) must choose how many dice Neutral will defend with.")
+                # Use a simplified game_rules for this specific choice.
+                def_rules = "Choose one action from the list: {'type': 'CHOOSE_DEFENSE_DICE', 'num_dice': 1_or_2}"
+
+                # Ask asynchronously like any other AI call; the attack is completed by
+                # _resume_neutral_defense_attack once the choice comes back.
+                self.pending_neutral_defense = {
+                    "from": from_territory_name, "to": to_territory_name, "num_armies": num_armies,
+                    "attacks_this_turn": attacks_this_turn, "chooser_name": other_human_player.name
+                }
+                self._execute_ai_turn_async(other_human_agent, gs.to_json_with_history_cached(), _NEUTRAL_DEFENSE_DICE_OPTIONS, def_rules, def_prompt)
+                return False # _execute_ai_turn_async has already refreshed the GUI
+            elif other_human_player: # No agent for other human player
+                self.log_turn_info(f"Warning: No AI agent for other human player {other_human_player.name} to choose neutral defense. Defaulting dice.")
+                explicit_defense_dice = 1 # Or some other default
+            else: # Should not happen in 2P mode
+                self.log_turn_info("Warning: Could not find other human player in 2P mode for neutral defense. Defaulting dice.")
+                explicit_defense_dice = 1
+
+        return self._perform_attack_and_record(player, from_territory_name, to_territory_name, num_armies, explicit_defense_dice, attacks_this_turn)
+
+    def _resume_neutral_defense_attack(self, player: GamePlayer, ai_response: dict) -> bool:
+        """Completes a 2P attack on a neutral territory once the defense dice choice has arrived."""
+        pending = self.pending_neutral_defense
+        self.pending_neutral_defense = None
+        chooser_name = pending["chooser_name"]
+        defender_territory_obj = self.engine.game_state.territories.get(pending["to"])
+        neutral_armies = defender_territory_obj.army_count if defender_territory_obj else 0
+
+        defense_action = ai_response.get("action")
+        if isinstance(defense_action, dict) and defense_action.get("type") == "CHOOSE_DEFENSE_DICE":
+            explicit_defense_dice = defense_action.get("num_dice")
+            if not (explicit_defense_dice == 1 or (explicit_defense_dice == 2 and neutral_armies >= 2)):
+                self.log_turn_info(f"Warning: Invalid defense dice choice {explicit_defense_dice} from {chooser_name}. Defaulting to 1 die.")
+                explicit_defense_dice = 1 if neutral_armies >= 1 else 0
+        else: # AI failed to choose or malformed action
+            self.log_turn_info(f"Warning: {chooser_name} failed to choose defense dice. Defaulting to 1 die.")
+            explicit_defense_dice = 1 if neutral_armies >= 1 else 0
+
+        return self._perform_attack_and_record(player, pending["from"], pending["to"], pending["num_armies"], explicit_defense_dice, pending["attacks_this_turn"])
+
+    def _perform_attack_and_record(self, player: GamePlayer, from_territory_name: str, to_territory_name: str,
+                                   num_armies: int, explicit_defense_dice: int | None, attacks_this_turn: int) -> bool:
+        gs = self.engine.game_state
+        ctx = self.current_ai_context
+        # Call engine's perform_attack
+        attack_log = self.engine.perform_attack(from_territory_name, to_territory_name, num_armies, explicit_defense_dice)
+        if self._debug_on: # Full dump (every roll and outcome) only when diagnosing
+            self.log_turn_info(f"Orchestrator: Engine perform_attack log for {player.name}: {attack_log}")
+        else:
+            self.log_turn_info(f"Orchestrator: {player.name} attack {from_territory_name} -> {to_territory_name}: "
+                               f"{attack_log.get('error') or attack_log.get('summary', 'no outcome reported')}")
+
+        if "error" not in attack_log: # Only increment if attack was valid and processed
+            attacks_this_turn += 1
+            if ctx is not None: ctx["attacks_this_turn"] = attacks_this_turn
+            self.log_turn_info(f"Orchestrator: {player.name} attacks_this_turn incremented to: {attacks_this_turn}")
+
+            if attack_log.get("conquered"):
+                self.log_turn_info(f"Orchestrator: {player.name} conquered {to_territory_name}. PAF required: {gs.requires_post_attack_fortify}. Card drawn: {attack_log.get('card_drawn') is not None}.")
+                if attack_log.get("eliminated_player_name"):
+                     elim_name = attack_log.get("eliminated_player_name")
+                     self.log_turn_info(f"Orchestrator: {player.name} ELIMINATED {elim_name}!")
+                     self.global_chat.broadcast("GameSystem", f"{player.name} eliminated {elim_name}!")
+                     self.handle_player_elimination(elim_name)
+                     if self.engine.is_game_over():
+                         self.ai_is_thinking = False # Ensure AI not stuck
+                         # Game over will be handled by advance_game_turn loop.
+                         # Return (GUI is updated by the caller) to let advance_game_turn handle game over.
+                         return True
+        self.ai_is_thinking = False # AI ready for next decision (PAF, another attack, or end phase).
+        return "error" not in attack_log
+
+    def _handle_attack_end_phase(self, player: GamePlayer, agent: BaseAIAgent, action: dict) -> bool:
+        self.log_turn_info(f"Orchestrator: {player.name} chose to end ATTACK phase. Transitioning to FORTIFY.")
+        self.engine.game_state.current_game_phase = "FORTIFY"
+        self.has_logged_current_turn_player_phase = False
+        self.ai_is_thinking = False
+        # print(f"Orchestrator: {player.name} ATTACK phase ended. Transitioning to FORTIFY.") # Replaced by log
+        return True
 
+    def _handle_attack_global_chat(self, player: GamePlayer, agent: BaseAIAgent, action: dict) -> bool:
+        message = action.get("message", "")
+        self.ai_is_thinking = False
+        if isinstance(message, str) and message.strip():
+            self.global_chat.broadcast(player.name, message)
+            self.log_turn_info(f"Orchestrator: {player.name} (Global Chat): {message}")
+            return True # Chat log is shown in the GUI
+        self.log_turn_info(f"Orchestrator: {player.name} attempted GLOBAL_CHAT with empty or invalid message.")
+        return False
+
+    def _handle_attack_private_chat(self, player: GamePlayer, agent: BaseAIAgent, action: dict) -> bool:
+        gs = self.engine.game_state
+        state_changed = False
+        try:
+            target_player_name, initial_message = _private_chat_get(action)
+        except KeyError:
+            target_player_name = initial_message = None # Reported as invalid below
 
+        if not isinstance(target_player_name, str) or not isinstance(initial_message, str) or not initial_message.strip():
+            self.log_turn_info(f"Orchestrator: {player.name} invalid PRIVATE_CHAT parameters: target='{target_player_name}', message_empty='{not initial_message.strip() if isinstance(initial_message, str) else True}'.")
         else:
-            self.log_turn_info(f"Orchestrator: Player {player.name} provided an unknown ATTACK action type: '{action_type}'. AI will be prompted again.")
-            self.ai_is_thinking = False
+            target_game_player_obj = gs.get_player_by_name(target_player_name)
+            target_agent = self.get_agent_for_player(target_game_player_obj) if target_game_player_obj else None
 
-        self.log_turn_info(f"Orchestrator: End of _process_attack_ai_action for {player.name}. ai_is_thinking: {self.ai_is_thinking}, current_phase: {self.engine.game_state.current_game_phase}")
-        if self.gui: self._update_gui_full_state()
+            if not target_agent: # Covers target_game_player_obj being None or Neutral
+                self.log_turn_info(f"Orchestrator: {player.name} invalid PRIVATE_CHAT target: Player '{target_player_name}' not found, is neutral, or not an AI.")
+            elif target_agent == agent:
+                self.log_turn_info(f"Orchestrator: {player.name} attempted PRIVATE_CHAT with self. Action ignored.")
+            else:
+                self.log_turn_info(f"Orchestrator: Initiating private chat between {player.name} and {target_player_name}.")
+                # Define goals for the negotiation based on game context or default
+                # Example: initiator wants an alliance, recipient wants to evaluate
+                initiator_goal = f"Your goal is to negotiate a favorable outcome with {target_player_name}. Consider proposing an ALLIANCE, a non-aggression pact, or a joint attack."
+                recipient_goal = f"Your goal is to evaluate {player.name}'s proposal and negotiate the best terms for yourself. You can accept, reject, or make a counter-offer."
+
+                chat_kwargs = dict(
+                    agent1=agent, agent2=target_agent,
+                    initial_message=initial_message,
+                    game_state=gs, # Pass full GameState object
+                    game_rules=self.game_rules,
+                    initiator_goal=initiator_goal,
+                    recipient_goal=recipient_goal
+                )
+                if self._ai_executor_is_threaded:
+                    # The conversation is several sequential LLM round-trips. Run it on an AI worker like any
+                    # other AI call so the GUI stays responsive; _finish_private_chat applies the outcome.
+                    self.pending_private_chat = {"target_player_name": target_player_name}
+                    self._ai_future = self._ai_executor.submit(contextvars.copy_context().run, _run_private_chat,
+                                                               self.private_chat_manager, chat_kwargs)
+                    self.ai_is_thinking = True
+                    self.has_logged_ai_is_thinking_for_current_action = False
+                    return False
+                # A process pool would run the conversation on a copy of the chat manager; stay on this thread.
+                conversation_log_entries, negotiated_action = _run_private_chat(self.private_chat_manager, chat_kwargs)
+                state_changed = self._apply_private_chat_outcome(player, target_player_name, conversation_log_entries, negotiated_action)
+
+        self.ai_is_thinking = False
+        return state_changed
+
+    def _finish_private_chat(self, player: GamePlayer, chat_result):
+        """Applies the outcome of a private chat that _handle_attack_private_chat ran on an AI worker."""
+        target_player_name = self.pending_private_chat["target_player_name"]
+        self.pending_private_chat = None
+        conversation_log_entries, negotiated_action = chat_result if isinstance(chat_result, tuple) else ([], None)
+        self._apply_private_chat_outcome(player, target_player_name, conversation_log_entries, negotiated_action)
+        self._flush_event_buffer() # GUI refresh is done by the caller
+
+    def _apply_private_chat_outcome(self, player: GamePlayer, target_player_name: str,
+                                    conversation_log_entries: list[dict], negotiated_action: dict | None) -> bool:
+        """Logs a finished private chat and records any alliance it produced. Returns True (new conversation to display)."""
+        gs = self.engine.game_state
+        summary_msg = f"Private chat between {player.name} and {target_player_name} concluded ({len(conversation_log_entries)} messages)."
+        if self.gui: self.gui.log_action(summary_msg) # Simple log for now
+        self.log_turn_info(f"Orchestrator: {summary_msg}")
+
+        if negotiated_action:
+            self.log_turn_info(f"Orchestrator: Private chat resulted in a negotiated action: {negotiated_action}")
+            # Process the negotiated_action
+            # This is a critical step. The orchestrator needs to validate and apply this action.
+            # Example: If PROPOSE_ALLIANCE, update GameState.diplomacy to "PROPOSED_ALLIANCE"
+            #          and set up for target_player to accept/reject on their turn.
+            # If ACCEPT_ALLIANCE, update GameState.diplomacy to "ALLIANCE".
+            if negotiated_action.get("type") == "PROPOSE_ALLIANCE":
+                proposer = negotiated_action.get("proposing_player_name")
+                target = negotiated_action.get("target_player_name")
+                if proposer and target:
+                    diplomatic_key = self._dip_key(proposer, target)
+                    turn_no = gs.current_turn_number
+                    gs.diplomacy[diplomatic_key] = "PROPOSED_ALLIANCE" # General status
+                    # Store proposal detail (who proposed to whom) for later acceptance check
+                    gs.active_diplomatic_proposals[diplomatic_key] = {
+                        'proposer': proposer,
+                        'target': target,
+                        'type': 'ALLIANCE', # Could be other types like NON_AGGRESSION
+                        'turn_proposed': turn_no
+                    }
+                    gs.version += 1
+                    self.log_turn_info(f"Diplomacy: {proposer} proposed ALLIANCE to {target}. Proposal recorded.")
+                    self.global_chat.broadcast("GameSystem", f"{proposer} has proposed an alliance to {target} via private channels.")
+                    # Log event
+                    self._event_buffer.append(DiplomacyProposalEvent(turn_no, proposer, target))
+            elif negotiated_action.get("type") == "ACCEPT_ALLIANCE":
+                accepter = negotiated_action.get("accepting_player_name")
+                proposer = negotiated_action.get("proposing_player_name")
+                if accepter and proposer:
+                    diplomatic_key = self._dip_key(accepter, proposer)
+                    # TODO: Add verification against a pending proposal structure if implemented
+                    gs.diplomacy[diplomatic_key] = "ALLIANCE"
+                    gs.version += 1
+                    self.log_turn_info(f"Diplomacy: {accepter} ACCEPTED ALLIANCE with {proposer}. Status set to ALLIANCE.")
+                    self.global_chat.broadcast("GameSystem", f"{accepter} and {proposer} have formed an ALLIANCE!")
+                    # Log event
+                    pair = (accepter, proposer) if accepter < proposer else (proposer, accepter) # Sorted pair without a list + sort
+                    self._event_buffer.append(AllianceFormedEvent(gs.current_turn_number, pair))
+            # Add more processing for other negotiated_action types (BREAK_ALLIANCE, etc.)
+            # GUI picks up the new diplomatic status via state_changed.
+        else:
+            self.log_turn_info(f"Orchestrator: Private chat between {player.name} and {target_player_name} did not result in a formal agreement.")
+        return True # New private conversation to display
+
+    def _handle_attack_break_alliance(self, player: GamePlayer, agent: BaseAIAgent, action: dict) -> bool:
+        gs = self.engine.game_state
+        state_changed = False
+        target_player_name = action.get("target_player_name")
+        if player and target_player_name:
+            diplomatic_key = self._dip_key(player.name, target_player_name)
+            if gs.diplomacy.get(diplomatic_key) == "ALLIANCE":
+                gs.diplomacy[diplomatic_key] = "NEUTRAL" # Or WAR, depending on desired outcome
+                gs.version += 1
+                self.log_turn_info(f"Diplomacy: {player.name} BROKE ALLIANCE with {target_player_name}. Status set to NEUTRAL.")
+                self.global_chat.broadcast("GameSystem", f"{player.name} has broken their alliance with {target_player_name}!")
+                # Log event
+                self._event_buffer.append(AllianceBrokenEvent(gs.current_turn_number, player.name, target_player_name, "NEUTRAL"))
+                state_changed = True
+            else:
+                self.log_turn_info(f"Orchestrator: {player.name} tried to BREAK_ALLIANCE with {target_player_name}, but no alliance existed.")
+        else:
+            self.log_turn_info(f"Orchestrator: {player.name} tried BREAK_ALLIANCE with invalid parameters: {action}")
+        self.ai_is_thinking = False # Player can make another move in attack phase
+        return state_changed
 
     def _initiate_fortify_ai_action(self, player: GamePlayer, agent: BaseAIAgent):
         """Gathers info and starts the AI thinking for the FORTIFY phase."""
+        gs = self.engine.game_state
         self.log_turn_info(f"Orchestrator: Initiating FORTIFY AI action for {player.name}. Player has_fortified_this_turn: {player.has_fortified_this_turn}")
-        game_state_json = self.engine.game_state.to_json()
-        valid_actions = self.engine.get_valid_actions(player) # FORTIFY or END_TURN
-        self.log_turn_info(f"Orchestrator: Valid actions for {player.name} in FORTIFY: {valid_actions}")
+        valid_actions, _ = self._get_valid_actions_cached(player) # FORTIFY or END_TURN
+        if self._debug_on:
+            self.log_turn_info(f"Orchestrator: Valid actions for {player.name} in FORTIFY: {valid_actions}")
 
         if not valid_actions:
              self.log_turn_info(f"CRITICAL: No valid FORTIFY actions for {player.name} (should always have END_TURN). Ending turn to prevent issues.");
-             self.engine.game_state.current_game_phase = "REINFORCE" # Prepare for next player
+             gs.current_game_phase = "REINFORCE" # Prepare for next player
              self.engine.next_turn()
              self.has_logged_current_turn_player_phase = False # New turn/player starting
              self.ai_is_thinking = False
              if self.gui: self._update_gui_full_state()
              return
 
-        prompt_add = f"It is your FORTIFY phase. Fortified this turn: {player.has_fortified_this_turn}. "
-        if not player.has_fortified_this_turn:
-            prompt_add += "Make one fortification move (remember to specify 'num_armies') or choose to end your turn."
-        else:
-            prompt_add += "You have already fortified. You must end your turn."
-        self.log_turn_info(f"Orchestrator: Fortify prompt addition for {player.name}: {prompt_add}")
-        self._execute_ai_turn_async(agent, self.engine.game_state.to_json_with_history(), valid_actions, self.game_rules, system_prompt_addition=prompt_add)
+        prompt_add = _FORTIFY_PROMPT_DONE if player.has_fortified_this_turn else _FORTIFY_PROMPT_OPEN
+        if self._debug_on:
+            self.log_turn_info(f"Orchestrator: Fortify prompt addition for {player.name}: {prompt_add}")
+        self._execute_ai_turn_async(agent, gs.to_json_with_history_cached(), valid_actions, self.game_rules, system_prompt_addition=prompt_add)
 
     def _process_fortify_ai_action(self, player: GamePlayer, agent: BaseAIAgent, ai_response: dict):
         """Processes the AI's action for the FORTIFY phase."""
-        self.log_turn_info(f"Orchestrator: Processing FORTIFY AI action for {player.name}. AI Response: {ai_response}")
+        if self._debug_on:
+            self.log_turn_info(f"Orchestrator: Processing FORTIFY AI action for {player.name}. AI Response: {ai_response}")
+        else:
+            self.log_turn_info(f"Orchestrator: Processing FORTIFY AI action for {player.name}.")
         action = ai_response.get("action")
-        self.log_turn_info(f"Orchestrator: Player {player.name} status before processing fortify action: has_fortified_this_turn = {player.has_fortified_this_turn}")
+        if self._debug_on:
+            self.log_turn_info(f"Orchestrator: Player {player.name} status before processing fortify action: has_fortified_this_turn = {player.has_fortified_this_turn}")
 
         if not action or not isinstance(action, dict) or "type" not in action:
             self.log_turn_info(f"{player.name} provided malformed or missing FORTIFY action: {action}. Ending turn as per rules.")
@@ -1497,17 +2093,14 @@ class GameOrchestrator:
                 if player.has_fortified_this_turn:
                      self.log_turn_info(f"{player.name} attempted to FORTIFY again in the same turn (has_fortified_this_turn was True). Action ignored. Turn will end.")
                 else:
-                    from_territory_name = action.get("from")
-                    to_territory_name = action.get("to")
-                    num_armies = action.get("num_armies")
-
-                    if not all(isinstance(param, str) for param in [from_territory_name, to_territory_name]) or \
-                       not isinstance(num_armies, int) or num_armies < 0:
-                        self.log_turn_info(f"{player.name} provided invalid FORTIFY parameters: from='{from_territory_name}', to='{to_territory_name}', num_armies='{num_armies}'. No fortification performed. Turn will end.")
+                    try:
+                        fortify = FortifyAction(action["from"], action["to"], action["num_armies"])
+                    except (KeyError, ValueError):
+                        self.log_turn_info(f"{player.name} provided invalid FORTIFY parameters: from='{action.get('from')}', to='{action.get('to')}', num_armies='{action.get('num_armies')}'. No fortification performed. Turn will end.")
                     else:
                         # Perform the fortification. Engine will set has_fortified_this_turn if successful & num_armies > 0.
-                        fortify_result = self.engine.perform_fortify(from_territory_name, to_territory_name, num_armies)
-                        log_message = fortify_result.get('message', f"Fortify attempt by {player.name} from {from_territory_name} to {to_territory_name} with {num_armies} armies.")
+                        fortify_result = self.engine.perform_fortify(fortify.from_territory, fortify.to_territory, fortify.num_armies)
+                        log_message = fortify_result.get('message', f"Fortify attempt by {player.name} from {fortify.from_territory} to {fortify.to_territory} with {fortify.num_armies} armies.")
                         self.log_turn_info(f"Engine fortify result for {player.name}: {log_message}. Success: {fortify_result.get('success', False)}")
                         # player.has_fortified_this_turn is updated by the engine.
 
@@ -1522,78 +2115,106 @@ class GameOrchestrator:
         self.log_turn_info(f"Orchestrator: Player {player.name} status after processing fortify action: has_fortified_this_turn = {player.has_fortified_this_turn}")
         self.ai_is_thinking = False
         self.log_turn_info(f"Orchestrator: {player.name} FORTIFY phase AI processing complete. Turn will now end via main loop.")
+        self._flush_event_buffer()
         if self.gui: self._update_gui_full_state()
 
     def auto_distribute_armies(self, player: GamePlayer, armies_to_distribute: int):
-        if not player.territories: return
-        idx = 0
-        while armies_to_distribute > 0:
-            territory = player.territories[idx % len(player.territories)]
-            territory.army_count += 1; armies_to_distribute -= 1
-            self.log_turn_info(f"Auto-distributed 1 army to {territory.name} for {player.name}.")
-            idx += 1
-        if self.gui: self._update_gui_full_state()
+        if not player.territories or armies_to_distribute <= 0: return
+        # Round-robin over the territories: each gets q armies, the first r get one extra.
+        n = len(player.territories)
+        q, r = divmod(armies_to_distribute, n)
+        for i, territory in enumerate(player.territories):
+            territory.army_count += q + (1 if i < r else 0)
+        self.log_turn_info(f"Auto-distributed {armies_to_distribute} armies across {n} territories for {player.name}.")
+        self.engine.game_state.version += 1
+        # No GUI refresh here: both callers end the REINFORCE phase and refresh once afterwards.
 
     def handle_player_elimination(self, eliminated_player_name: str):
-        player_to_remove_engine = None
-        original_index = -1
-        for i, p_obj in enumerate(self.engine.game_state.players):
-            if p_obj.name == eliminated_player_name:
-                player_to_remove_engine = p_obj
-                original_index = i
-                break
+        gs = self.engine.game_state
+        players = gs.players
+        player_to_remove_engine = gs.players_by_name.get(eliminated_player_name)
+        original_index = gs.player_index_by_name.get(eliminated_player_name, -1)
+        if player_to_remove_engine is not None and not (0 <= original_index < len(players) and players[original_index] is player_to_remove_engine):
+            # players was modified without rebuild_player_index(); refresh the index and retry.
+            gs.rebuild_player_index()
+            player_to_remove_engine = gs.players_by_name.get(eliminated_player_name)
+            original_index = gs.player_index_by_name.get(eliminated_player_name, -1)
         if player_to_remove_engine:
-            self.engine.game_state.players.pop(original_index) # Use pop with index
+            players.pop(original_index) # Use pop with index
+            gs.rebuild_player_index()
+            gs.version += 1
             print(f"Removed {eliminated_player_name} from engine player list at index {original_index}.")
-            if original_index <= self.engine.game_state.current_player_index and self.engine.game_state.current_player_index > 0:
-                self.engine.game_state.current_player_index -= 1
-                print(f"Adjusted current_player_index to {self.engine.game_state.current_player_index}.")
+            cur = gs.current_player_index
+            new_cur = max(0, cur - (original_index <= cur)) # Shift back if the removed player sat at or before the cursor
+            if new_cur != cur:
+                gs.current_player_index = new_cur
+                print(f"Adjusted current_player_index to {new_cur}.")
         else:
             print(f"Warning: Could not find {eliminated_player_name} in engine player list to remove.")
         if eliminated_player_name in self.ai_agents:
             del self.ai_agents[eliminated_player_name]
-        key_to_remove_map = None
-        for gp_key, ai_val in self.player_map.items():
-            if gp_key.name == eliminated_player_name: # Compare by name as gp_key might be a stale object
-                key_to_remove_map = gp_key; break
-        if key_to_remove_map: del self.player_map[key_to_remove_map]
+        self.agents_by_player_name.pop(eliminated_player_name, None)
+        self.two_player_opponent_by_name.pop(eliminated_player_name, None)
+        # Drop the eliminated player's pair keys; existing gs.diplomacy entries still match by frozenset equality.
+        for pair in [pair for pair in self._dip_key_cache if eliminated_player_name in pair]:
+            del self._dip_key_cache[pair]
+        if player_to_remove_engine is None or self.player_map.pop(player_to_remove_engine, None) is None:
+            # Fall back to a name match, as the player_map key might be a stale object
+            key_to_remove_map = next((gp_key for gp_key in self.player_map if gp_key.name == eliminated_player_name), None)
+            if key_to_remove_map: del self.player_map[key_to_remove_map]
         print(f"Player {eliminated_player_name} fully processed for elimination.")
 
     def log_ai_thought(self, player_name: str, thought: str):
-        log_dir = "logs"
-        if not os.path.exists(log_dir):
-            os.makedirs(log_dir)
         print(f"--- {player_name}'s Thought --- \n{thought[:300]}...\n--------------------")
         if self.gui:
             self.gui.update_thought_panel(player_name, thought)
-        try:
-            with open(os.path.join(log_dir, "ai_thoughts.jsonl"), 'a', encoding='utf-8') as f:
-                log_entry = {
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "player": player_name,
-                    "thought": thought
-                }
-                f.write(json.dumps(log_entry) + "\n")
-        except IOError as e:
-            print(f"Error writing to AI thought log: {e}")
+        # Encoding and disk I/O happen on the writer thread; timestamp is taken now so it reflects the turn.
+        self._log_queue.put((self._thought_log_fh, self._now_iso(), player_name, thought))
 
     def log_turn_info(self, message: str):
-        log_dir = "logs"
-        if not os.path.exists(log_dir):
-            os.makedirs(log_dir)
         if self.gui:
             self.gui.log_action(message)
-        try:
-            with open(os.path.join(log_dir, "game_log.txt"), 'a', encoding='utf-8') as f:
-                f.write(f"[{datetime.utcnow().isoformat()}] {message}\n")
-        except IOError as e:
-            print(f"Error writing to game log: {e}")
+        self._log_queue.put((self._game_log_fh, self._now_iso(), None, message))
+
+    def _now_iso(self) -> str:
+        """UTC log timestamp at one-second resolution; formatted once per second and reused in between."""
+        now = int(time.time())
+        if self._ts_cache[0] != now:
+            self._ts_cache = (now, datetime.utcfromtimestamp(now).isoformat())
+        return self._ts_cache[1]
+
+    def flush_logs(self, timeout: float = 5.0):
+        """Blocks until the writer thread has written and flushed every log line queued so far."""
+        if not self._log_writer.is_alive():
+            return
+        done = threading.Event()
+        self._log_queue.put(done)
+        done.wait(timeout)
+
+    def close_logs(self):
+        """Writes out the queued log lines, stops the writer thread and closes the log files. Idempotent."""
+        self._log_finalizer()
+
+    def close(self):
+        """
+        Releases what the orchestrator holds open: the log files (see close_logs) and, unless it was passed
+        in by the caller, the AI worker pool. Pending AI calls are cancelled. Also called on leaving a with block.
+        """
+        if self._owns_ai_executor:
+            self._ai_executor.shutdown(wait=False, cancel_futures=True)
+        self.close_logs()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
 
     def setup_gui(self):
         try:
             if not self.gui:
                 # Ensure self.map_display_config_to_load is determined before this call
-                print(f"DEBUG: GameOrchestrator.setup_gui - Initializing GameGUI with map_display_config_file: '{self.map_display_config_to_load}' and game_mode: '{self.game_mode}'")
+                logger.debug(f"GameOrchestrator.setup_gui - Initializing GameGUI with map_display_config_file: '{self.map_display_config_to_load}' and game_mode: '{self.game_mode}'")
                 self.gui = GameGUI(engine=self.engine, orchestrator=self, map_display_config_file=self.map_display_config_to_load, game_mode=self.game_mode)
                 print("GUI setup complete. GUI is active.")
         except Exception as e:
@@ -1611,9 +2232,9 @@ if __name__ == '__main__':
         with open(config_path, 'w') as f: json.dump(dummy_player_config, f, indent=2)
         print(f"Created dummy {config_path} for testing.")
     except IOError: print(f"Could not create dummy {config_path}.")
-    orchestrator = GameOrchestrator(default_player_setup_file=config_path, game_mode="standard") # Assuming test runs standard
-    print("Starting game run...")
-    orchestrator.run_game()
+    with GameOrchestrator(default_player_setup_file=config_path, game_mode="standard") as orchestrator: # Assuming test runs standard
+        print("Starting game run...")
+        orchestrator.run_game()
     print("\nGame run finished.")
     if os.path.exists("logs/game_log.txt"):
         with open("logs/game_log.txt", 'r') as f:
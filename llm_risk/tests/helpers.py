@@ -0,0 +1,91 @@
+import json
+import os
+import tempfile
+
+from llm_risk.game_orchestrator import GameOrchestrator
+from llm_risk.ai.base_agent import BaseAIAgent
+
+# A-B-D-C-A ring: every territory borders two others.
+TEST_MAP = {
+    "continents": [
+        {"name": "Testland", "bonus_armies": 2}
+    ],
+    "territories": {
+        "A": {"continent": "Testland", "adjacent_to": ["B", "C"]},
+        "B": {"continent": "Testland", "adjacent_to": ["A", "D"]},
+        "C": {"continent": "Testland", "adjacent_to": ["A", "D"]},
+        "D": {"continent": "Testland", "adjacent_to": ["B", "C"]}
+    }
+}
+
+
+class StubAgent(BaseAIAgent):
+    """Answers with queued actions; with an empty queue, ends the phase or takes the first valid action."""
+    def __init__(self, player_name, player_color, actions=None, chat_reply="Noted."):
+        super().__init__(player_name, player_color)
+        self.actions = list(actions or [])
+        self.chat_reply = chat_reply
+        self.calls = [] # (valid_actions, system_prompt_addition) per get_thought_and_action call
+        self.chat_calls = 0
+
+    def get_thought_and_action(self, game_state_json, valid_actions, game_rules, system_prompt_addition=""):
+        self.calls.append((valid_actions, system_prompt_addition))
+        if self.actions:
+            return {"thought": "Queued", "action": self.actions.pop(0)}
+        for va in valid_actions:
+            if va["type"] in ("END_REINFORCE_PHASE", "END_ATTACK_PHASE", "END_TURN"):
+                return {"thought": "Ending phase", "action": va}
+        return {"thought": "First option", "action": valid_actions[0] if valid_actions else None}
+
+    def engage_in_private_chat(self, history, game_state_json, game_rules, recipient_name, system_prompt_addition=""):
+        self.chat_calls += 1
+        return self.chat_reply
+
+
+def enter_temp_dir(test_case):
+    """Switches into a temporary directory holding TEST_MAP as map.json; it is removed when the test ends."""
+    tmp = tempfile.TemporaryDirectory()
+    test_case.addCleanup(tmp.cleanup)
+    old_cwd = os.getcwd()
+    os.chdir(tmp.name)
+    test_case.addCleanup(os.chdir, old_cwd)
+    with open("map.json", "w") as f:
+        json.dump(TEST_MAP, f)
+
+
+def player_configs(player_names=("P1", "P2", "P3")):
+    colors = ["Red", "Blue", "Green", "Yellow"]
+    return [{"name": name, "color": colors[i], "ai_type": "mock"} for i, name in enumerate(player_names)]
+
+
+def make_orchestrator(test_case, player_names=("P1", "P2", "P3"), **kwargs):
+    """
+    Builds an orchestrator on TEST_MAP with a StubAgent per player, working in a temporary
+    directory that is removed (together with the orchestrator's logs) when the test ends.
+    """
+    enter_temp_dir(test_case)
+    configs = player_configs(player_names)
+    orchestrator = GameOrchestrator(map_file_path_override="map.json", player_configs_override=configs, headless=True, **kwargs)
+    test_case.addCleanup(orchestrator.close)
+    orchestrator.ai_agents = {c["name"]: StubAgent(c["name"], c["color"]) for c in configs}
+    orchestrator._map_game_players_to_ai_agents()
+    return orchestrator
+
+
+def set_board(orchestrator, owners: dict, phase: str = "ATTACK", current: str | None = None):
+    """owners: territory name -> (player name, armies). Makes `current` (default: first owner) the player to act."""
+    gs = orchestrator.engine.game_state
+    for player in gs.players:
+        player.territories = []
+    for territory_name, (player_name, armies) in owners.items():
+        territory = gs.territories[territory_name]
+        player = gs.get_player_by_name(player_name)
+        territory.owner = player
+        territory.army_count = armies
+        player.territories.append(territory)
+    current_player = gs.get_player_by_name(current or next(iter(owners.values()))[0])
+    gs.current_player_index = gs.players.index(current_player)
+    gs.current_game_phase = phase
+    gs.version += 1
+    orchestrator.current_ai_context = {}
+    return current_player
@@ -0,0 +1,81 @@
+import unittest
+from concurrent.futures import wait
+
+from llm_risk.tests.helpers import make_orchestrator, set_board
+
+
+class TestAIResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.orchestrator = make_orchestrator(self)
+        self.orchestrator.reuse_play_ai_responses = True
+        self.gs = self.orchestrator.engine.game_state
+        self.p1 = set_board(self.orchestrator, {"A": ("P1", 6), "B": ("P1", 3), "C": ("P2", 1), "D": ("P3", 2)})
+        self.agent = self.orchestrator.ai_agents["P1"]
+
+    def ask(self):
+        """One AI turn for P1 through the reuse path; returns the response handed to the game."""
+        orchestrator = self.orchestrator
+        valid_actions = orchestrator.engine.get_valid_actions(self.p1)
+        orchestrator._execute_ai_turn_async(self.agent, "{}", valid_actions, "", "")
+        wait((orchestrator._ai_future,))
+        orchestrator._collect_ai_result()
+        orchestrator.ai_is_thinking = False
+        return orchestrator.ai_action_result
+
+    def test_repeated_hits_are_all_served(self):
+        first = self.ask()
+        for _ in range(3):
+            self.gs.version += 1 # Something else happened in between, so the replay is not a repeat rejection
+            self.assertEqual(self.ask(), first)
+        self.assertEqual(len(self.agent.calls), 1)
+        self.assertEqual(len(self.orchestrator._ai_response_cache), 1)
+
+    def test_rejected_replay_asks_again_but_keeps_the_entry(self):
+        self.agent.actions = [{"type": "END_ATTACK_PHASE"}, {"type": "NOT_A_VALID_ACTION"}]
+        self.ask()
+        self.gs.version += 1
+        self.ask() # Replayed
+        self.ask() # Same version: the replay changed nothing, so the agent is asked and answers invalidly
+        self.assertEqual(len(self.agent.calls), 2)
+        self.gs.version += 1
+        self.assertEqual(self.ask()["action"], {"type": "END_ATTACK_PHASE"}) # Still cached
+        self.assertEqual(len(self.agent.calls), 2)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        self.orchestrator.AI_RESPONSE_CACHE_MAXSIZE = 2
+        territory_a = self.gs.territories["A"]
+        for armies in (6, 7):
+            territory_a.army_count = armies # A different board is a different question
+            self.ask()
+        territory_a.army_count = 6
+        self.gs.version += 1
+        self.ask() # Hit: the 6-army board becomes the most recently used
+        territory_a.army_count = 8
+        self.ask() # Third entry; the 7-army board is dropped
+        self.assertEqual(len(self.agent.calls), 3)
+        self.assertEqual([key[3][0] for key in self.orchestrator._ai_response_cache], [("P1", 6), ("P1", 8)])
+    def test_chat_answers_are_cached(self):
+        self.agent.actions = [{"type": "GLOBAL_CHAT", "message": "Hello all"}]
+        self.ask()
+        self.gs.version += 1
+        self.assertEqual(self.ask()["action"], {"type": "GLOBAL_CHAT", "message": "Hello all"}) # Replayed
+        self.assertEqual(len(self.agent.calls), 1)
+
+    def test_actions_missing_identifying_fields_are_not_cached(self):
+        self.agent.actions = [{"type": "ATTACK", "num_armies": 3}] # No from/to
+        self.ask()
+        self.assertEqual(len(self.orchestrator._ai_response_cache), 0)
+
+    def test_matching_rules(self):
+        valid_actions = self.orchestrator.engine.get_valid_actions(self.p1)
+        matches = lambda action: self.orchestrator._matches_valid_action(action, valid_actions)
+        self.assertTrue(matches({"type": "ATTACK", "from": "A", "to": "C", "num_armies": 3})) # Bound left out
+        self.assertTrue(matches({"type": "PRIVATE_CHAT", "target_player_name": "P2", "initial_message": "Truce?"}))
+        self.assertFalse(matches({"type": "ATTACK", "from": "A", "num_armies": 3}))
+        self.assertFalse(matches({"type": "ATTACK", "from": "A", "to": "D", "num_armies": 3})) # Not adjacent
+        self.assertFalse(matches({"type": "ATTACK", "from": "A", "to": "C", "max_armies_for_attack": 9}))
+        self.assertFalse(matches({"type": "PRIVATE_CHAT", "initial_message": "Truce?"}))
+
+
+if __name__ == '__main__':
+    unittest.main()
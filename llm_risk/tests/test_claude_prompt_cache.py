@@ -0,0 +1,39 @@
+import json
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from llm_risk.ai.claude_agent import ClaudeAgent
+
+
+class TestClaudePromptCache(unittest.TestCase):
+    def system_blocks(self, model_name, game_rules=None):
+        """The system blocks of one get_thought_and_action request, sent to a stub client."""
+        agent = ClaudeAgent("Alice", "Red", api_key="test-key", model_name=model_name)
+        reply = json.dumps({"thought": "Done.", "action": {"type": "END_TURN"}})
+        agent.client = MagicMock()
+        agent.client.messages.create.return_value = SimpleNamespace(content=[SimpleNamespace(text=reply)])
+        kwargs = {"game_rules": game_rules} if game_rules is not None else {}
+        result = agent.get_thought_and_action("{}", [{"type": "END_TURN"}], **kwargs)
+        self.assertEqual(result["action"], {"type": "END_TURN"})
+        request = agent.client.messages.create.call_args.kwargs
+        self.assertNotIn("CRITICAL INSTRUCTIONS", request["messages"][0]["content"]) # Sent in the system prefix instead
+        return request["system"]
+
+    def test_default_prefix_is_marked_for_caching(self):
+        for model_name in ("claude-3-haiku-20240307", "claude-sonnet-4-20250514"):
+            static_block = self.system_blocks(model_name)[0]
+            self.assertIn("CRITICAL INSTRUCTIONS", static_block["text"])
+            self.assertEqual(static_block["cache_control"], {"type": "ephemeral"})
+
+    def test_prefix_below_the_model_minimum_is_not_marked(self):
+        short_rules = "Conquer every territory."
+        self.assertNotIn("cache_control", self.system_blocks("claude-sonnet-4-20250514", short_rules)[0])
+        # Around 1.5k tokens: enough for Sonnet and Opus, too short for Haiku.
+        medium_rules = "Attack adjacent territories with up to three dice. " * 75
+        self.assertIn("cache_control", self.system_blocks("claude-sonnet-4-20250514", medium_rules)[0])
+        self.assertNotIn("cache_control", self.system_blocks("claude-3-haiku-20240307", medium_rules)[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+
+from llm_risk.game_engine.data_structures import CardTradeEvent
+from llm_risk.tests.helpers import make_orchestrator
+
+
+def trade_event(turn, player="P1"):
+    return CardTradeEvent(turn, player, ("Infantry", "Infantry", "Infantry"), 4, None)
+
+
+class TestEventHistoryTrim(unittest.TestCase):
+    def setUp(self):
+        self.orchestrator = make_orchestrator(self, event_history_turn_horizon=2)
+        self.gs = self.orchestrator.engine.game_state
+
+    def play_turn(self, turn, *events):
+        """Starts `turn`, buffers the given events and flushes them, as the orchestrator does mid-turn."""
+        self.gs.current_turn_number = turn
+        self.orchestrator._flush_event_buffer()
+        self.orchestrator._event_buffer.extend(events)
+        self.orchestrator._flush_event_buffer()
+
+    def labels(self):
+        return [e["label"] if type(e) is dict else f"trade {e.turn}" for e in self.gs.event_history]
+
+    def test_old_turns_are_trimmed(self):
+        self.play_turn(1, trade_event(1))
+        self.play_turn(2, trade_event(2))
+        self.play_turn(3, trade_event(3))
+        self.assertEqual(self.labels(), ["trade 1", "trade 2", "trade 3"])
+        version = self.gs.version
+        self.play_turn(4, trade_event(4))
+        self.assertEqual(self.labels(), ["trade 2", "trade 3", "trade 4"])
+        self.assertGreater(self.gs.version, version) # The state JSON changed
+
+    def test_events_without_a_turn_age_out(self):
+        self.play_turn(1, {"type": "NOTE", "label": "untimed"})
+        for turn in (2, 3, 4):
+            self.play_turn(turn, trade_event(turn))
+        self.assertEqual(self.labels(), ["trade 2", "trade 3", "trade 4"])
+
+    def test_out_of_order_turn_fields_do_not_stop_the_trim(self):
+        # A late event stamped with a newer turn than the ones after it must not shield them from trimming.
+        self.play_turn(1, {"type": "NOTE", "label": "stamped 9", "turn": 9}, trade_event(1))
+        self.play_turn(2, trade_event(2))
+        self.play_turn(3, trade_event(3))
+        self.play_turn(4, trade_event(4))
+        self.assertEqual(self.labels(), ["trade 2", "trade 3", "trade 4"])
+
+    def test_no_horizon_keeps_everything(self):
+        self.orchestrator.event_history_turn_horizon = None
+        for turn in range(1, 6):
+            self.play_turn(turn, trade_event(turn))
+        self.assertEqual(len(self.gs.event_history), 5)
+
+    def test_branch_restores_turn_marks(self):
+        self.play_turn(1, trade_event(1))
+        self.play_turn(2, trade_event(2))
+        snapshot_id = self.orchestrator.take_snapshot()
+        self.play_turn(3, trade_event(3))
+        self.play_turn(4, trade_event(4))
+        self.orchestrator.branch_from(snapshot_id)
+        self.gs = self.orchestrator.engine.game_state
+        self.assertEqual(self.labels(), ["trade 1", "trade 2"])
+        self.play_turn(3, trade_event(3))
+        self.play_turn(4, trade_event(4))
+        self.assertEqual(self.labels(), ["trade 2", "trade 3", "trade 4"])
+
+
+if __name__ == '__main__':
+    unittest.main()
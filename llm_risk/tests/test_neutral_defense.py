@@ -0,0 +1,81 @@
+import unittest
+from unittest.mock import patch
+
+from llm_risk.game_orchestrator import _NEUTRAL_DEFENSE_DICE_OPTIONS
+from llm_risk.tests.helpers import make_orchestrator, set_board
+
+
+class TestNeutralDefense(unittest.TestCase):
+    """2P mode: attacking a Neutral territory asks the other human for Neutral's defense dice."""
+    def setUp(self):
+        self.orchestrator = make_orchestrator(self, player_names=("P1", "P2"))
+        self.gs = self.orchestrator.engine.game_state
+        self.p1 = set_board(self.orchestrator, {"A": ("P1", 6), "B": ("P1", 2), "C": ("Neutral", 3), "D": ("P2", 2)})
+        self.attacker = self.orchestrator.ai_agents["P1"]
+        self.chooser = self.orchestrator.ai_agents["P2"]
+        self.attacker.actions = [{"type": "ATTACK", "from": "A", "to": "C", "num_armies": 3}]
+
+    def step(self):
+        self.orchestrator.advance_game_turn()
+        if self.orchestrator._ai_future is not None:
+            self.orchestrator._ai_future.result()
+
+    def start_attack(self):
+        """Runs until the defense dice question is pending."""
+        self.step() # P1 is asked for an attack
+        self.step() # The attack is processed and P2 is asked for the dice
+        pending = self.orchestrator.pending_neutral_defense
+        self.assertIsNotNone(pending)
+        self.assertEqual((pending["from"], pending["to"], pending["num_armies"], pending["chooser_name"]), ("A", "C", 3, "P2"))
+        self.assertTrue(self.orchestrator.ai_is_thinking)
+        self.assertEqual(self.orchestrator.active_ai_player_name, "P2")
+        self.assertEqual(self.gs.territories["C"].army_count, 3) # No dice rolled yet
+
+    def test_chosen_dice_are_used(self):
+        self.chooser.actions = [{"type": "CHOOSE_DEFENSE_DICE", "num_dice": 2}]
+        self.start_attack()
+        self.assertEqual(self.chooser.calls[-1][0], _NEUTRAL_DEFENSE_DICE_OPTIONS)
+        with patch("llm_risk.game_engine.engine.random.randint", side_effect=[6, 6, 6, 1, 1]): # 3 attack, 2 defense dice
+            self.step()
+        self.assertIsNone(self.orchestrator.pending_neutral_defense)
+        self.assertEqual(self.gs.territories["C"].army_count, 1)
+        self.assertEqual(self.gs.current_game_phase, "ATTACK")
+
+    def test_invalid_choice_defaults_to_one_die(self):
+        self.chooser.actions = [{"type": "CHOOSE_DEFENSE_DICE", "num_dice": 5}]
+        self.start_attack()
+        with patch("llm_risk.game_engine.engine.random.randint", side_effect=[6, 6, 6, 1]): # Only 1 defense die
+            self.step()
+        self.assertIsNone(self.orchestrator.pending_neutral_defense)
+        self.assertEqual(self.gs.territories["C"].army_count, 2)
+
+    def test_missing_choice_defaults_to_one_die(self):
+        self.chooser.actions = [{"type": "END_TURN"}]
+        self.start_attack()
+        with patch("llm_risk.game_engine.engine.random.randint", side_effect=[1, 1, 1, 6]):
+            self.step()
+        self.assertIsNone(self.orchestrator.pending_neutral_defense)
+        self.assertEqual(self.gs.territories["C"].army_count, 3)
+        self.assertEqual(self.gs.territories["A"].army_count, 5) # Attacker lost the single comparison
+
+    def test_single_neutral_army_is_not_asked(self):
+        self.gs.territories["C"].army_count = 1
+        self.step()
+        with patch("llm_risk.game_engine.engine.random.randint", side_effect=[6, 6, 6, 1]):
+            self.step()
+        self.assertEqual(self.chooser.calls, [])
+        self.assertIsNone(self.orchestrator.pending_neutral_defense)
+        self.assertEqual(self.gs.territories["C"].owner, self.p1)
+
+    def test_defense_answers_are_not_reused(self):
+        self.orchestrator.reuse_play_ai_responses = True
+        self.chooser.actions = [{"type": "CHOOSE_DEFENSE_DICE", "num_dice": 2}]
+        self.start_attack()
+        self.assertIsNone(self.orchestrator._response_cache_key(self.chooser, _NEUTRAL_DEFENSE_DICE_OPTIONS, ""))
+        with patch("llm_risk.game_engine.engine.random.randint", side_effect=[6, 6, 6, 1, 1]):
+            self.step()
+        self.assertNotIn("P2", [key[0] for key in self.orchestrator._ai_response_cache])
+
+
+if __name__ == '__main__':
+    unittest.main()
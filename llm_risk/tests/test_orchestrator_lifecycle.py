@@ -0,0 +1,53 @@
+import gc
+import os
+import unittest
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from llm_risk.game_orchestrator import GameOrchestrator
+from llm_risk.tests.helpers import enter_temp_dir, player_configs
+
+
+class TestOrchestratorLifecycle(unittest.TestCase):
+    def setUp(self):
+        enter_temp_dir(self)
+
+    def make(self, **kwargs):
+        return GameOrchestrator(map_file_path_override="map.json", player_configs_override=player_configs(), headless=True, **kwargs)
+
+    def test_with_block_closes_logs(self):
+        with self.make() as orchestrator:
+            orchestrator.log_turn_info("inside the with block")
+        self.assertFalse(orchestrator._log_writer.is_alive())
+        self.assertTrue(orchestrator._game_log_fh.closed)
+        self.assertTrue(orchestrator._thought_log_fh.closed)
+        with open(os.path.join("logs", "game_log.txt"), encoding="utf-8") as f:
+            self.assertIn("inside the with block", f.read()) # Queued lines are written before closing
+        orchestrator.close() # Closing again is a no-op
+
+    def test_unreferenced_orchestrator_is_collected_and_closed(self):
+        orchestrator = self.make()
+        writer, game_fh = orchestrator._log_writer, orchestrator._game_log_fh
+        ref = weakref.ref(orchestrator)
+        del orchestrator
+        gc.collect()
+        self.assertIsNone(ref()) # Neither the writer thread nor an exit hook keeps it alive
+        self.assertFalse(writer.is_alive())
+        self.assertTrue(game_fh.closed)
+
+    def test_close_shuts_down_the_owned_ai_pool(self):
+        with self.make() as orchestrator:
+            self.assertEqual(orchestrator._ai_executor.submit(sum, (1, 2)).result(), 3)
+        with self.assertRaises(RuntimeError): # Shut down: no new calls are accepted
+            orchestrator._ai_executor.submit(sum, (1, 2))
+
+    def test_close_leaves_a_caller_executor_running(self):
+        executor = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(executor.shutdown)
+        with self.make(ai_executor=executor):
+            pass
+        self.assertEqual(executor.submit(sum, (1, 2)).result(), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import threading
+import unittest
+
+from llm_risk.tests.helpers import StubAgent, make_orchestrator, set_board
+
+
+class GatedChatAgent(StubAgent):
+    """Stub whose chat replies wait for `gate`, and which records the thread each reply ran on."""
+    def __init__(self, player_name, player_color, chat_reply, gate):
+        super().__init__(player_name, player_color, chat_reply=chat_reply)
+        self.gate = gate
+        self.chat_threads = []
+
+    def engage_in_private_chat(self, history, game_state_json, game_rules, recipient_name, system_prompt_addition=""):
+        self.chat_threads.append(threading.current_thread())
+        self.gate.wait(5)
+        return super().engage_in_private_chat(history, game_state_json, game_rules, recipient_name, system_prompt_addition)
+
+
+class TestPrivateChat(unittest.TestCase):
+    def setUp(self):
+        self.orchestrator = make_orchestrator(self)
+        self.gs = self.orchestrator.engine.game_state
+        set_board(self.orchestrator, {"A": ("P1", 6), "B": ("P1", 3), "C": ("P2", 1), "D": ("P3", 2)})
+        self.gate = threading.Event()
+        self.addCleanup(self.gate.set) # Never leave a worker blocked
+        # P2 proposes an alliance in its first reply and P1 accepts it, which ends the conversation.
+        self.p1 = GatedChatAgent("P1", "Red", "Agreed. ACCEPT_PROPOSAL", self.gate)
+        self.p2 = GatedChatAgent("P2", "Blue", "Let us team up. PROPOSAL: ALLIANCE", self.gate)
+        self.orchestrator.ai_agents.update(P1=self.p1, P2=self.p2)
+        self.orchestrator._map_game_players_to_ai_agents()
+        self.p1.actions = [{"type": "PRIVATE_CHAT", "target_player_name": "P2", "initial_message": "Shall we talk?"}]
+
+    def step(self):
+        self.orchestrator.advance_game_turn()
+
+    def test_conversation_runs_on_a_worker_and_is_applied_on_the_main_thread(self):
+        logs_before = self.orchestrator.private_chat_manager.conversation_logs
+        self.step() # P1 is asked and chooses PRIVATE_CHAT
+        self.orchestrator._ai_future.result()
+        self.step() # The conversation starts on an AI worker and blocks on the gate
+        self.assertEqual(self.orchestrator.pending_private_chat, {"target_player_name": "P2"})
+        self.assertTrue(self.orchestrator.ai_is_thinking)
+        self.step() # Still pending: the main thread returns without waiting
+        self.assertIsNotNone(self.orchestrator.pending_private_chat)
+        self.assertNotIn(self.orchestrator._dip_key("P1", "P2"), self.gs.diplomacy)
+
+        self.gate.set()
+        self.orchestrator._ai_future.result()
+        self.assertIsNot(self.p2.chat_threads[0], threading.main_thread())
+        self.assertNotIn(self.orchestrator._dip_key("P1", "P2"), self.gs.diplomacy) # Not applied on the worker
+        calls_before = len(self.p1.calls)
+        self.step() # Outcome applied, and P1 is asked for its next attack phase action in the same tick
+        self.assertIsNone(self.orchestrator.pending_private_chat)
+        self.orchestrator._ai_future.result()
+        self.assertEqual(len(self.p1.calls), calls_before + 1)
+        self.assertEqual(self.gs.diplomacy[self.orchestrator._dip_key("P1", "P2")], "ALLIANCE")
+        self.assertEqual((self.p1.chat_calls, self.p2.chat_calls), (1, 1))
+
+        # Copy-on-write: the worker published a new dict rather than mutating the one readers may hold.
+        self.assertEqual(logs_before, {})
+        conversations = list(self.orchestrator.private_chat_manager.conversation_logs.values())
+        self.assertEqual(len(conversations), 1)
+        self.assertEqual([entry["sender"] for entry in conversations[0]], ["P1", "P2", "P1"])
+
+
+if __name__ == '__main__':
+    unittest.main()
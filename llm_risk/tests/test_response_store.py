@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from llm_risk.ai.response_store import AIResponseStore
+
+RESPONSE = {"thought": "Claim the corner.", "action": {"type": "SETUP_CLAIM", "territory": "A"}}
+
+
+class TestAIResponseStore(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "responses.sqlite")
+
+    def open_store(self, **kwargs):
+        store = AIResponseStore(self.path, **kwargs)
+        self.addCleanup(store.close)
+        return store
+
+    def test_round_trip_across_connections(self):
+        key = AIResponseStore.make_key(("ClaudeAgent", "claude-3-haiku-20240307", "Red"), ("P1", "SETUP_CLAIM_TERRITORIES"))
+        store = self.open_store()
+        self.assertIsNone(store.get(key))
+        store.set(key, RESPONSE)
+        self.assertEqual(store.get(key), RESPONSE)
+        store.close()
+        self.assertEqual(self.open_store().get(key), RESPONSE) # Persisted in the file
+
+    def test_entries_expire_after_the_ttl(self):
+        store = self.open_store(ttl_s=60)
+        with patch("llm_risk.ai.response_store.time.time", return_value=1000.0):
+            store.set("k", RESPONSE)
+        with patch("llm_risk.ai.response_store.time.time", return_value=1059.0):
+            self.assertEqual(store.get("k"), RESPONSE)
+        with patch("llm_risk.ai.response_store.time.time", return_value=1061.0):
+            self.assertIsNone(store.get("k"))
+            store.set("k", {"thought": "Newer", "action": None}) # An expired entry is overwritten
+            self.assertEqual(store.get("k")["thought"], "Newer")
+
+    def test_unserializable_responses_are_skipped(self):
+        store = self.open_store()
+        store.set("k", {"thought": object(), "action": None})
+        self.assertIsNone(store.get("k"))
+
+    def test_keys_are_stable_and_namespaced(self):
+        namespace = ("OpenAIAgent", "gpt-4o", "Blue")
+        cache_key = ("P2", "ATTACK", ('{"type": "END_ATTACK_PHASE"}',), (("P2", 3), (None, 0)), (), (), "")
+        key = AIResponseStore.make_key(namespace, cache_key)
+        # Fixed value: keys must not change between runs (no hash() randomization), or stored answers are lost.
+        self.assertEqual(key, "ab3e2b6275f0f7e770ac2070a3377a12ef7f6435cb7573284236a0297ba91e4b")
+        self.assertNotEqual(key, AIResponseStore.make_key(("OpenAIAgent", "gpt-4o-mini", "Blue"), cache_key))
+        self.assertNotEqual(key, AIResponseStore.make_key(namespace, cache_key[:-1] + ("Be careful.",)))
+
+
+if __name__ == '__main__':
+    unittest.main()
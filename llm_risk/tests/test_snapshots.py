@@ -0,0 +1,117 @@
+import io
+import pickle
+import threading
+import unittest
+from concurrent.futures import Executor, Future
+from unittest.mock import patch
+
+from llm_risk.game_orchestrator import GameOrchestrator
+from llm_risk.tests.helpers import make_orchestrator, set_board
+
+ATTACK_C = {"type": "ATTACK", "from": "A", "to": "C", "num_armies": 3}
+
+
+class TestSnapshots(unittest.TestCase):
+    def setUp(self):
+        self.orchestrator = make_orchestrator(self)
+        set_board(self.orchestrator, {"A": ("P1", 6), "B": ("P1", 3), "C": ("P2", 1), "D": ("P3", 2)})
+        self.agent = self.orchestrator.ai_agents["P1"]
+
+    def step(self):
+        self.orchestrator.advance_game_turn()
+        if self.orchestrator._ai_future is not None:
+            self.orchestrator._ai_future.result()
+
+    def board(self, gs=None):
+        gs = gs or self.orchestrator.engine.game_state
+        return {name: (t.owner.name, t.army_count) for name, t in gs.territories.items()}, gs.current_game_phase
+
+    def conquer_c(self):
+        """P1 asks its agent, which attacks C and wins with these dice."""
+        self.agent.actions = [ATTACK_C]
+        with patch("llm_risk.game_engine.engine.random.randint", side_effect=[6, 6, 6, 1]):
+            self.step() # Asked
+            self.step() # Attack processed
+        self.assertEqual(self.orchestrator.engine.game_state.territories["C"].owner.name, "P1")
+
+    def test_branch_restores_the_snapshot_without_touching_the_original(self):
+        snapshot_id = self.orchestrator.take_snapshot()
+        at_snapshot = self.board()
+        self.conquer_c()
+        original = self.orchestrator.engine.game_state
+        after_conquest = self.board(original)
+
+        self.orchestrator.branch_from(snapshot_id)
+        branch = self.orchestrator.engine.game_state
+        self.assertIsNot(branch, original)
+        self.assertEqual(self.board(), at_snapshot)
+        self.step() # The queue is empty now, so the agent ends the attack phase instead
+        self.step()
+        self.assertEqual(branch.current_game_phase, "FORTIFY")
+        self.assertEqual(branch.territories["C"].owner.name, "P2")
+        self.assertEqual(self.board(original), after_conquest) # The original game is unaffected
+
+        self.orchestrator.branch_from(snapshot_id) # Playing the branch did not change the snapshot either
+        self.assertEqual(self.board(), at_snapshot)
+
+    def test_override_action_replaces_the_ai_call(self):
+        snapshot_id = self.orchestrator.take_snapshot()
+        at_snapshot = self.board()
+        self.orchestrator.branch_from(snapshot_id, override_action=ATTACK_C)
+        with patch("llm_risk.game_engine.engine.random.randint", side_effect=[6, 6, 6, 1]):
+            self.step()
+        self.assertEqual(self.agent.calls, []) # Answered by the override, not the agent
+        self.assertEqual(self.orchestrator.engine.game_state.territories["C"].owner.name, "P1")
+
+        self.orchestrator.branch_from(snapshot_id, override_action={"type": "END_ATTACK_PHASE"})
+        self.step()
+        self.assertEqual(self.orchestrator.engine.game_state.current_game_phase, "FORTIFY")
+        self.assertEqual(self.orchestrator.engine.game_state.territories["C"].owner.name, "P2")
+        self.orchestrator.branch_from(snapshot_id)
+        self.assertEqual(self.board(), at_snapshot)
+
+    def test_snapshot_holds_no_runtime_resources(self):
+        self.orchestrator.log_turn_info("Logged before the snapshot")
+        snapshot_id = self.orchestrator.take_snapshot()
+        state_bytes, _ = self.orchestrator._snapshots[snapshot_id]
+        pickled_types = set()
+
+        class TypeRecorder(pickle.Pickler):
+            def reducer_override(self, obj):
+                pickled_types.add(type(obj))
+                return NotImplemented
+
+        TypeRecorder(io.BytesIO(), protocol=pickle.HIGHEST_PROTOCOL).dump(pickle.loads(state_bytes))
+        for forbidden in (threading.Thread, Executor, Future, io.IOBase, GameOrchestrator, type(threading.Lock())):
+            self.assertFalse([t for t in pickled_types if issubclass(t, forbidden)], forbidden)
+    def test_snapshot_leaves_out_the_json_caches(self):
+        gs = self.orchestrator.engine.game_state
+        gs.event_history.append({"type": "NOTE", "turn": 1})
+        state_json = gs.to_json_with_history_cached()
+        snapshot_id = self.orchestrator.take_snapshot()
+        state_bytes, _ = self.orchestrator._snapshots[snapshot_id]
+        self.assertNotIn(state_json.encode(), state_bytes)
+        self.orchestrator.branch_from(snapshot_id)
+        restored = self.orchestrator.engine.game_state
+        self.assertEqual((restored._json_cache, restored._event_json_cache), ({}, {}))
+        self.assertEqual(restored.to_json_with_history_cached(), state_json) # Rebuilt on demand
+        self.assertTrue(gs._json_cache) # The original keeps its own caches
+
+    def test_dropped_snapshot_ids_are_not_reused(self):
+        first = self.orchestrator.take_snapshot()
+        self.orchestrator.drop_snapshot(first)
+        second = self.orchestrator.take_snapshot()
+        self.assertNotEqual(first, second)
+        with self.assertRaises(KeyError):
+            self.orchestrator.branch_from(first)
+        self.assertEqual(list(self.orchestrator._snapshots), [second])
+
+    def test_branch_forgets_the_last_replayed_response(self):
+        snapshot_id = self.orchestrator.take_snapshot()
+        self.orchestrator._last_response_cache_hit = (("P1", "ATTACK"), self.orchestrator.engine.game_state.version)
+        self.orchestrator.branch_from(snapshot_id)
+        self.assertIsNone(self.orchestrator._last_response_cache_hit)
+
+
+if __name__ == '__main__':
+    unittest.main()
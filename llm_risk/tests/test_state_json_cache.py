@@ -0,0 +1,93 @@
+import json
+import pickle
+import unittest
+
+from llm_risk.game_engine.data_structures import GameState, EventHistory, CardTradeEvent
+
+
+def trade_event(turn, player="P1"):
+    return CardTradeEvent(turn, player, ("Infantry", "Infantry", "Infantry"), 4, None)
+
+
+class TestStateJsonCache(unittest.TestCase):
+    def setUp(self):
+        self.gs = GameState()
+
+    def history_in_json(self):
+        return json.loads(self.gs.to_json_with_history_cached())["event_history"]
+
+    def expected_history(self):
+        return [e if type(e) is dict else e.as_dict() for e in self.gs.event_history]
+
+    def test_unchanged_state_is_served_from_cache(self):
+        self.gs.event_history.append(trade_event(1))
+        first = self.gs.to_json_with_history_cached()
+        self.assertIs(self.gs.to_json_with_history_cached(), first)
+        self.assertIs(self.gs.to_json_cached(), self.gs.to_json_cached())
+
+    def test_version_and_direct_fields_invalidate(self):
+        first = self.gs.to_json_cached()
+        self.gs.version += 1
+        second = self.gs.to_json_cached()
+        self.assertIsNot(second, first)
+        self.gs.current_game_phase = "ATTACK"
+        self.assertEqual(json.loads(self.gs.to_json_cached())["current_game_phase"], "ATTACK")
+
+    def test_appends_and_trims_invalidate(self):
+        self.gs.event_history.append(trade_event(1))
+        self.assertEqual(len(self.history_in_json()), 1)
+        self.gs.event_history.extend([{"turn": 2, "type": "NOTE"}, trade_event(2, "P2")])
+        self.assertEqual(self.history_in_json(), self.expected_history())
+        self.gs.event_history.popleft()
+        self.assertEqual(self.history_in_json(), self.expected_history())
+        self.assertEqual(len(self.history_in_json()), 2)
+
+    def test_appends_at_the_cap_invalidate(self):
+        # At the cap the length stays the same while the contents shift.
+        self.gs.event_history = EventHistory(maxlen=2)
+        self.gs.event_history.extend([trade_event(1, "P1"), trade_event(1, "P2")])
+        self.assertEqual([e["player"] for e in self.history_in_json()], ["P1", "P2"])
+        self.gs.event_history.append(trade_event(1, "P3"))
+        self.assertEqual([e["player"] for e in self.history_in_json()], ["P2", "P3"])
+
+    def test_event_text_cache_follows_sequence_numbers(self):
+        history = self.gs.event_history
+        history.extend([trade_event(1, "P1"), trade_event(1, "P2")])
+        self.gs.to_json_with_history_cached()
+        self.assertEqual(set(self.gs._event_json_cache), {0, 1})
+        history.popleft()
+        history.append(trade_event(2, "P3")) # Same length as before, different contents
+        self.assertEqual([e["player"] for e in self.history_in_json()], ["P2", "P3"])
+        self.assertEqual(set(self.gs._event_json_cache), {1, 2}) # Text of the trimmed event is dropped
+
+
+class TestEventHistory(unittest.TestCase):
+    def test_sequence_numbers(self):
+        history = EventHistory(maxlen=3)
+        history.extend(range(5))
+        history.append(5)
+        self.assertEqual(list(history), [3, 4, 5])
+        self.assertEqual(history.appended, 6)
+        self.assertEqual(history.first_seq(), 3)
+        history.popleft()
+        self.assertEqual(history.first_seq(), 4)
+
+    def test_reordering_operations_are_rejected(self):
+        history = EventHistory([1, 2])
+        for operation in (lambda: history.appendleft(0), lambda: history.pop(), lambda: history.insert(0, 0),
+                          lambda: history.remove(1), lambda: history.rotate(1), lambda: history.__setitem__(0, 9)):
+            with self.assertRaises(TypeError):
+                operation()
+        self.assertEqual(list(history), [1, 2])
+
+    def test_pickle_keeps_count_and_cap(self):
+        history = EventHistory(maxlen=2)
+        history.extend([1, 2, 3])
+        restored = pickle.loads(pickle.dumps(history))
+        self.assertEqual(list(restored), [2, 3])
+        self.assertEqual(restored.maxlen, 2)
+        self.assertEqual(restored.appended, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
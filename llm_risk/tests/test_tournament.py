@@ -0,0 +1,53 @@
+import os
+import unittest
+from unittest.mock import patch
+
+from llm_risk.tests.helpers import StubAgent, enter_temp_dir, player_configs
+from llm_risk.tournament import GameResult, run_one_game
+
+
+class ConquerorAgent(StubAgent):
+    """Deploys everything, attacks whenever it can and moves all armies in, so games on TEST_MAP end quickly."""
+    def get_thought_and_action(self, game_state_json, valid_actions, game_rules, system_prompt_addition=""):
+        by_type = {}
+        for va in valid_actions:
+            by_type.setdefault(va["type"], va)
+        for action_type, max_key in (("TRADE_CARDS", None), ("DEPLOY", "max_armies"), ("POST_ATTACK_FORTIFY", "max_armies"),
+                                     ("ATTACK", "max_armies_for_attack"), ("BETRAY_ALLY", "max_armies_for_attack")):
+            if action_type in by_type:
+                action = dict(by_type[action_type])
+                if max_key:
+                    action["num_armies"] = min(action[max_key], 3) if max_key == "max_armies_for_attack" else action[max_key]
+                self.calls.append((valid_actions, system_prompt_addition))
+                return {"thought": "Attack!", "action": action}
+        return super().get_thought_and_action(game_state_json, valid_actions, game_rules, system_prompt_addition)
+
+
+class TestRunOneGame(unittest.TestCase):
+    def setUp(self):
+        enter_temp_dir(self)
+        self.config = {"player_configs_override": [dict(c, ai_type="Conqueror") for c in player_configs()],
+                       "map_file_path_override": "map.json", "auto_initialize_board": True}
+
+    def test_game_runs_headless_to_the_end(self):
+        with patch.dict("llm_risk.game_orchestrator._AGENT_CLASSES", {"Conqueror": ConquerorAgent}), \
+             patch("llm_risk.game_orchestrator.GameGUI") as gui_class:
+            result = run_one_game(self.config, seed=7)
+        gui_class.assert_not_called()
+        self.assertIsInstance(result, GameResult)
+        self.assertEqual(result.seed, 7)
+        self.assertIn(result.winner, ("P1", "P2", "P3"))
+        with open(os.path.join("logs", "7", "game_log.txt"), encoding="utf-8") as f:
+            self.assertIn("GAME OVER", f.read())
+
+    def test_each_seed_logs_to_its_own_directory(self):
+        self.config["log_dir"] = "tournament_logs"
+        with patch.dict("llm_risk.game_orchestrator._AGENT_CLASSES", {"Conqueror": ConquerorAgent}):
+            for seed in (1, 2):
+                run_one_game(self.config, seed)
+        self.assertEqual(sorted(os.listdir("tournament_logs")), ["1", "2"])
+        self.assertFalse(os.path.exists("logs"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+from unittest.mock import patch
+
+from llm_risk.game_engine.data_structures import Card
+from llm_risk.tests.helpers import make_orchestrator, set_board
+
+
+class TestValidActionsCache(unittest.TestCase):
+    def setUp(self):
+        self.orchestrator = make_orchestrator(self)
+        self.engine = self.orchestrator.engine
+        self.gs = self.engine.game_state
+        # P1 holds A and B, P2 holds C, P3 holds D.
+        self.p1 = set_board(self.orchestrator, {"A": ("P1", 6), "B": ("P1", 3), "C": ("P2", 1), "D": ("P3", 2)})
+
+    def assert_invalidated(self, mutate):
+        """Runs mutate() between two cached lookups and checks the second one is recomputed and current."""
+        before, _ = self.orchestrator._get_valid_actions_cached(self.p1)
+        version_before = self.gs.version
+        mutate()
+        self.assertGreater(self.gs.version, version_before)
+        after, _ = self.orchestrator._get_valid_actions_cached(self.p1)
+        self.assertIsNot(after, before)
+        self.assertEqual(after, self.engine.get_valid_actions(self.p1))
+
+    def test_unchanged_state_is_served_from_cache(self):
+        first = self.orchestrator._get_valid_actions_cached(self.p1)
+        second = self.orchestrator._get_valid_actions_cached(self.p1)
+        self.assertIs(first[0], second[0])
+        self.assertIs(first[1], second[1])
+
+    def test_phase_and_fortify_flag_are_part_of_the_key(self):
+        attack_actions, _ = self.orchestrator._get_valid_actions_cached(self.p1)
+        self.gs.current_game_phase = "FORTIFY" # Set directly by the orchestrator, without a version bump
+        fortify_actions, by_type = self.orchestrator._get_valid_actions_cached(self.p1)
+        self.assertIsNot(fortify_actions, attack_actions)
+        self.assertIn("FORTIFY", by_type)
+        self.p1.has_fortified_this_turn = True
+        _, by_type = self.orchestrator._get_valid_actions_cached(self.p1)
+        self.assertNotIn("FORTIFY", by_type)
+
+    def test_perform_attack_invalidates(self):
+        with patch("llm_risk.game_engine.engine.random.randint", side_effect=[6, 6, 6, 1]):
+            self.assert_invalidated(lambda: self.engine.perform_attack("A", "C", 3))
+        self.assertEqual(self.gs.territories["C"].owner, self.p1)
+
+    def test_perform_post_attack_fortify_invalidates(self):
+        with patch("llm_risk.game_engine.engine.random.randint", side_effect=[6, 6, 6, 1]):
+            self.engine.perform_attack("A", "C", 3)
+        self.assertTrue(self.gs.requires_post_attack_fortify)
+        self.assert_invalidated(lambda: self.engine.perform_post_attack_fortify(self.p1, 3))
+        self.assertFalse(self.gs.requires_post_attack_fortify)
+
+    def test_perform_fortify_invalidates(self):
+        self.gs.current_game_phase = "FORTIFY"
+        self.assert_invalidated(lambda: self.engine.perform_fortify("A", "B", 2))
+
+    def test_perform_card_trade_invalidates(self):
+        self.gs.current_game_phase = "REINFORCE"
+        self.p1.hand = [Card("A", "Infantry"), Card("B", "Infantry"), Card("C", "Infantry")]
+        self.assert_invalidated(lambda: self.engine.perform_card_trade(self.p1, [0, 1, 2]))
+        self.assertEqual(self.p1.hand, [])
+
+    def test_next_turn_invalidates(self):
+        self.gs.current_game_phase = "FORTIFY"
+        self.assert_invalidated(self.engine.next_turn)
+
+    def test_deploy_invalidates(self):
+        self.gs.current_game_phase = "REINFORCE"
+        self.p1.armies_to_deploy = 3
+        self.assert_invalidated(lambda: self.orchestrator._handle_reinforce_deploy(
+            self.p1, None, {"type": "DEPLOY", "territory": "A", "num_armies": 2}))
+        self.assertEqual(self.p1.armies_to_deploy, 1)
+
+    def test_auto_distribute_invalidates(self):
+        self.assert_invalidated(lambda: self.orchestrator.auto_distribute_armies(self.p1, 3))
+
+    def test_alliance_changes_invalidate(self):
+        # Attacks on an ally are offered as BETRAY_ALLY, so the alliance must be visible immediately.
+        self.gs.active_diplomatic_proposals[self.orchestrator._dip_key("P1", "P2")] = {
+            "proposer": "P1", "target": "P2", "type": "ALLIANCE", "turn": 1}
+        self.assert_invalidated(lambda: self.orchestrator._handle_diplomatic_response(
+            self.gs.get_player_by_name("P2"), None, {"type": "ACCEPT_ALLIANCE", "proposing_player_name": "P1"}))
+        _, by_type = self.orchestrator._get_valid_actions_cached(self.p1)
+        self.assertIn("C", [a["to"] for a in by_type.get("BETRAY_ALLY", [])])
+        self.assert_invalidated(lambda: self.orchestrator._handle_attack_break_alliance(
+            self.p1, None, {"type": "BREAK_ALLIANCE", "target_player_name": "P2"}))
+
+    def test_elimination_trade_bypasses_cache(self):
+        self.gs.current_game_phase = "REINFORCE"
+        self.p1.hand = [Card(name, "Infantry") for name in ("A", "B", "C")] + [Card("D", "Cavalry"), Card(None, "Wildcard")]
+        self.gs.elimination_card_trade_player_name = self.p1.name
+        trade_only, by_type = self.orchestrator._get_valid_actions_cached(self.p1)
+        self.assertEqual(set(by_type), {"TRADE_CARDS"})
+        self.assertIsNone(self.orchestrator._va_cache)
+        # Even a direct clear that skips the version bump must not leave the trade-only list cached.
+        self.gs.elimination_card_trade_player_name = None
+        self.assertIn("GLOBAL_CHAT", self.orchestrator._get_valid_actions_cached(self.p1)[1])
+        self.gs.elimination_card_trade_player_name = self.p1.name
+        # Once the trade brings the hand to 4 or fewer, the next lookup must clear the requirement.
+        self.engine.perform_card_trade(self.p1, [0, 1, 2])
+        version = self.gs.version
+        regular, by_type = self.orchestrator._get_valid_actions_cached(self.p1)
+        self.assertIsNone(self.gs.elimination_card_trade_player_name)
+        self.assertGreater(self.gs.version, version) # Clearing the flag changes the state JSON
+        self.assertIn("DEPLOY", by_type)
+        self.assertIsNot(regular, trade_only)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+"""
+Runs many independent headless games in parallel, e.g. for evaluating AI agents against each other.
+Each game gets its own GameOrchestrator in a worker process; single-game play (main.py) is unaffected.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import os
+import random
+
+from .game_orchestrator import GameOrchestrator
+
+
+@dataclass(slots=True, frozen=True)
+class GameResult:
+    """Outcome of one game played by run_one_game."""
+    seed: int
+    winner: str | None # None if the game ended without a winner (e.g. max turns reached)
+    turns: int
+    final_phase: str
+
+
+def run_one_game(config: dict, seed: int) -> GameResult:
+    """
+    Plays one headless game to the end and returns its result.
+    config holds GameOrchestrator keyword arguments (player_configs_override, game_mode, ...). The game
+    always runs without a GUI and logs to <log_dir>/<seed>/ (log_dir from config, default "logs").
+    Module-level so process pools can pickle it.
+    """
+    random.seed(seed) # Dice rolls and setup shuffles use the module-level RNG
+    kwargs = dict(config, headless=True)
+    kwargs["log_dir"] = os.path.join(config.get("log_dir", "logs"), str(seed))
+    with GameOrchestrator(**kwargs) as orchestrator:
+        orchestrator.run_game()
+    gs = orchestrator.engine.game_state
+    winner = orchestrator.engine.is_game_over()
+    return GameResult(seed, winner.name if winner else None, gs.current_turn_number, gs.current_game_phase)
+
+
+class TournamentOrchestrator:
+    """
+    Plays rounds of independent games across a process pool.
+    The pool is created once and reused for every round, since starting worker processes is
+    expensive (especially with the spawn start method used on Windows and macOS).
+    Each game writes its own logs under a directory named after its seed (see run_one_game).
+    """
+    def __init__(self, max_workers: int | None = None):
+        if max_workers is None:
+            max_workers = max(1, (os.cpu_count() or 2) - 1) # Leave a core for the parent process
+        self.max_workers = max_workers
+        self._pool = ProcessPoolExecutor(max_workers=max_workers)
+
+    def run_round(self, config: dict, seeds) -> list[GameResult]:
+        """Plays one game per seed with the same config. Results are in seed order."""
+        futures = [self._pool.submit(run_one_game, config, seed) for seed in seeds]
+        return [f.result() for f in futures]
+
+    def close(self):
+        self._pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -4,6 +4,10 @@ from ..game_engine.data_structures import GameState, Territory, Player as GamePl
 
 import json
 import os
+import time # Per-frame game tick budget
+import logging
+
+logger = logging.getLogger(__name__)
 
 # --- New Aesthetic Color Palette ---
 BACKGROUND_COLOR = (48, 135, 179)      # Dark, desaturated slate blue for map background/ocean
@@ -94,8 +98,8 @@ class GameGUI:
         self.engine = engine
         self.orchestrator = orchestrator
         self.game_mode = game_mode # Store the game mode
-        print(f"DEBUG: GameGUI.__init__ - Received game_mode: '{self.game_mode}', map_display_config_file: '{map_display_config_file}'")
-        print(f"DEBUG: GameGUI.__init__ - Engine's map_file_path: '{engine.map_file_path if engine else 'N/A'}'") # Corrected attribute access
+        logger.debug(f"GameGUI.__init__ - Received game_mode: '{self.game_mode}', map_display_config_file: '{map_display_config_file}'")
+        logger.debug(f"GameGUI.__init__ - Engine's map_file_path: '{engine.map_file_path if engine else 'N/A'}'") # Corrected attribute access
 
         self.current_game_state: GameState = engine.game_state
         self.global_chat_messages: list[dict] = []
@@ -118,6 +122,8 @@ class GameGUI:
         self.chat_tab_rects: dict[str, pygame.Rect] = {}
 
         self.fps = 30
+        # Time per frame the run loop may spend advancing the game before it redraws (see run()).
+        self.game_tick_budget_s = 0.010
         self.running = False
         self.colors = DEFAULT_PLAYER_COLORS
 
@@ -134,7 +140,7 @@ class GameGUI:
         self.zoom_increment = 0.1
 
     def _load_map_display_config(self, config_file: str):
-        print(f"DEBUG: GameGUI._load_map_display_config - Attempting to load display config from '{config_file}' for game_mode '{self.game_mode}'.")
+        logger.debug(f"GameGUI._load_map_display_config - Attempting to load display config from '{config_file}' for game_mode '{self.game_mode}'.")
         try:
             with open(config_file, 'r') as f:
 
@@ -145,12 +151,12 @@ class GameGUI:
                 self.territory_polygons = display_data.get("territory_polygons", {})
                 self.territory_coordinates = display_data.get("territory_centroids", {})
 
-                print(f"DEBUG: GameGUI._load_map_display_config - Loaded for 'world_map'.")
-                print(f"DEBUG: GameGUI._load_map_display_config - Number of polygon entries: {len(self.territory_polygons)}")
-                print(f"DEBUG: GameGUI._load_map_display_config - Number of centroid entries: {len(self.territory_coordinates)}")
+                logger.debug("GameGUI._load_map_display_config - Loaded for 'world_map'.")
+                logger.debug(f"GameGUI._load_map_display_config - Number of polygon entries: {len(self.territory_polygons)}")
+                logger.debug(f"GameGUI._load_map_display_config - Number of centroid entries: {len(self.territory_coordinates)}")
 
                 if not isinstance(self.territory_polygons, dict) or not isinstance(self.territory_coordinates, dict):
-                    print(f"DEBUG: GameGUI._load_map_display_config - WARNING: World map display config '{config_file}' has unexpected structure. Creating dummy data.")
+                    logger.warning(f"GameGUI._load_map_display_config - World map display config '{config_file}' has unexpected structure. Creating dummy data.")
                     self._create_dummy_world_map_display_data(config_file)
                     return
 
@@ -159,28 +165,28 @@ class GameGUI:
                     if not isinstance(poly_parts, list): valid_polygons_format = False; break
                     for part in poly_parts:
                         if not isinstance(part, list) or not all(isinstance(pt, (list, tuple)) and len(pt) == 2 and all(isinstance(coord_val, (int, float)) for coord_val in pt) for pt in part):
-                            valid_polygons_format = False; print(f"DEBUG: Format error in polygon part for {name}: {part}"); break
+                            valid_polygons_format = False; logger.debug(f"Format error in polygon part for {name}: {part}"); break
                     if not valid_polygons_format: break
 
                 valid_centroids_format = all(isinstance(coord, (list, tuple)) and len(coord) == 2 and all(isinstance(val, (int, float)) for val in coord) for coord in self.territory_coordinates.values())
 
                 if not valid_polygons_format:
-                    print(f"DEBUG: GameGUI._load_map_display_config - WARNING: Polygon data format error in '{config_file}'.")
+                    logger.warning(f"GameGUI._load_map_display_config - Polygon data format error in '{config_file}'.")
                 if not valid_centroids_format:
-                    print(f"DEBUG: GameGUI._load_map_display_config - WARNING: Centroid data format error in '{config_file}'.")
+                    logger.warning(f"GameGUI._load_map_display_config - Centroid data format error in '{config_file}'.")
 
                 if not valid_polygons_format or not valid_centroids_format:
-                    print(f"DEBUG: GameGUI._load_map_display_config - Triggering dummy data due to format errors.")
+                    logger.debug("GameGUI._load_map_display_config - Triggering dummy data due to format errors.")
                     self._create_dummy_world_map_display_data(config_file)
                     return
 
                 if not self.territory_polygons and not self.territory_coordinates:
-                    print(f"DEBUG: GameGUI._load_map_display_config - WARNING: World map display config '{config_file}' is empty. Creating dummy data.")
+                    logger.warning(f"GameGUI._load_map_display_config - World map display config '{config_file}' is empty. Creating dummy data.")
                     self._create_dummy_world_map_display_data(config_file)
 
             else: # Standard mode
                 self.territory_coordinates = display_data
-                print(f"DEBUG: GameGUI._load_map_display_config - Loaded for 'standard' mode. Number of territories: {len(self.territory_coordinates)}")
+                logger.debug(f"GameGUI._load_map_display_config - Loaded for 'standard' mode. Number of territories: {len(self.territory_coordinates)}")
                 if not isinstance(self.territory_coordinates, dict):
                     print(f"Warning: Standard map display config '{config_file}' is not a dictionary. Creating dummy data.")
                     self._create_dummy_standard_map_coordinates(config_file)
@@ -253,8 +259,10 @@ class GameGUI:
         self.global_chat_messages = global_chat_log
         self.private_chat_conversations_map = private_chat_conversations
 
-        # Update player names for tabs, in case players are eliminated
-        if self.current_game_state and self.current_game_state.players:
+        # Update player names for tabs, in case players are eliminated.
+        # Players are only ever removed, so a length check is enough to skip the rebuild on routine updates.
+        if self.current_game_state and self.current_game_state.players and \
+           len(self.current_game_state.players) != len(self.player_names_for_tabs):
             self.player_names_for_tabs = [p.name for p in self.current_game_state.players]
             if self.active_tab_thought_panel not in self.player_names_for_tabs and self.player_names_for_tabs:
                 self.active_tab_thought_panel = self.player_names_for_tabs[0]
@@ -312,7 +320,7 @@ class GameGUI:
                 else:
                     adj_name = adj_info["name"]
 
-                adj_pair = tuple(sorted((terr_name, adj_name)))
+                adj_pair = (terr_name, adj_name) if terr_name < adj_name else (adj_name, terr_name)
                 if adj_pair in drawn_adjacencies: continue
                 coords2_orig = self.territory_coordinates.get(adj_name)
                 if not coords2_orig: continue
@@ -374,14 +382,14 @@ class GameGUI:
         self.screen.fill(self.ocean_color, map_area_rect) # Ensure map area is cleared
 
         if not gs_to_draw or not gs_to_draw.territories:
-            print("DEBUG: GameGUI._draw_world_map_polygons - No game_state or territories to draw.")
+            logger.debug("GameGUI._draw_world_map_polygons - No game_state or territories to draw.")
             no_map_text = self.large_font.render("World Map Data Unavailable", True, WHITE)
             self.screen.blit(no_map_text, no_map_text.get_rect(center=map_area_rect.center))
             return
 
 
         if not self.territory_polygons:
-            print("DEBUG: GameGUI._draw_world_map_polygons - self.territory_polygons is empty. Cannot draw polygons.")
+            logger.debug("GameGUI._draw_world_map_polygons - self.territory_polygons is empty. Cannot draw polygons.")
             # Potentially draw circles as a fallback if centroids exist? Or just the error message.
             # For now, if no polygons, it will just draw adjacency lines and then text if centroids exist.
             # This might be a reason why circles appear if this path is hit and then standard drawing is later invoked.
@@ -406,7 +414,7 @@ class GameGUI:
                 adj_name = adj_info["name"]
                 adj_type = adj_info.get("type", "unknown") # Get type for potential different line styles
 
-                adj_pair = tuple(sorted((terr_name_adj, adj_name)))
+                adj_pair = (terr_name_adj, adj_name) if terr_name_adj < adj_name else (adj_name, terr_name_adj)
                 if adj_pair in drawn_adjacencies: continue
 
                 coords2_orig = self.territory_coordinates.get(adj_name)
@@ -454,7 +462,7 @@ class GameGUI:
                             pygame.draw.polygon(self.screen, owner_color, screen_polygon_part_points)
                             pygame.draw.polygon(self.screen, BORDER_COLOR, screen_polygon_part_points, 1) # Use theme BORDER_COLOR
                         except TypeError as e:
-                            print(f"DEBUG: GameGUI._draw_world_map_polygons - Error drawing polygon part {i} for {terr_name}: {e}.")
+                            logger.debug(f"GameGUI._draw_world_map_polygons - Error drawing polygon part {i} for {terr_name}: {e}.")
                             if original_centroid_coords: # Use original_centroid_coords for fallback
                                 screen_centroid_for_fallback = ( (original_centroid_coords[0] * self.zoom_level) + self.camera_offset_x,
                                                                  (original_centroid_coords[1] * self.zoom_level) + self.camera_offset_y )
@@ -844,8 +852,8 @@ class GameGUI:
     def log_private_chat(self, conversation_log: list[dict], p1_name: str, p2_name: str):
         if not conversation_log: return
         # Create a consistent key for the conversation
-        sorted_names = sorted([p1_name, p2_name])
-        log_key = f"private_{sorted_names[0]}_vs_{sorted_names[1]}"
+        first, second = (p1_name, p2_name) if p1_name < p2_name else (p2_name, p1_name)
+        log_key = f"private_{first}_vs_{second}"
 
         # The orchestrator now passes the full map, so GUI doesn't need to manage this itself.
         # This method is more for if GUI was directly told about a new conversation.
@@ -937,8 +945,16 @@ class GameGUI:
 
 
             if self.orchestrator and self.running:
-                if not self.orchestrator.advance_game_turn():
-                    self.running = False
+                # Keep advancing until an AI call is in flight or the tick budget is spent, so steps that
+                # need no AI answer don't each wait for a frame. The game stays on this thread because
+                # the draw calls below read the live game state.
+                tick_deadline = time.perf_counter() + self.game_tick_budget_s
+                while True:
+                    if not self.orchestrator.advance_game_turn():
+                        self.running = False
+                        break
+                    if self.orchestrator.is_waiting_on_ai() or time.perf_counter() >= tick_deadline:
+                        break
 
             # Clamp camera offsets to keep map within bounds
             map_bounds = self._get_map_content_bounds()
@@ -1006,6 +1022,7 @@ if __name__ == '__main__':
     class MockOrchestrator:
         def __init__(self, eng): self.engine,self.ai_agents,self.global_chat,self.private_chat_manager,self.game_should_continue,self._gui = eng,{"Archie":"A","Bea":"B"},type('GC',(),{'get_log':lambda s,l=0:[{"s":"Sys","m":"Global"}]})(),type('PCM',(),{'get_all_conversations':lambda s:{"pvp_Archie_Bea":[{"s":"Archie","m":"Hi"}]}})(),True,None
         def set_gui(self,g):self._gui=g
+        def is_waiting_on_ai(self): return False
         def advance_game_turn(self):
             if not self.game_should_continue or not self.engine.game_state.get_current_player(): return False
             if self.engine.game_state.current_turn_number > 2: self.game_should_continue = False; return False
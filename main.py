@@ -3,8 +3,10 @@ Main entry point for the LLM Risk Game application.
 Allows for console-based configuration of players and AI types.
 """
 from llm_risk.game_orchestrator import GameOrchestrator
+from llm_risk.ai.response_store import AIResponseStore
 from dotenv import load_dotenv
 import os
+import logging
 
 # Define available AI types and colors
 AVAILABLE_AI_TYPES = ["OpenAI", "Gemini", "Claude", "DeepSeek","Llama","Mistral","Qwen"] # Add "Human" if you implement human players
@@ -129,7 +131,26 @@ def main():
         default="map_config.json",
         help="Path to the JSON file with map configuration (primarily for 'standard' mode if explicitly specified)."
     )
+    parser.add_argument(
+        "--reuse_ai_responses",
+        action="store_true",
+        help="Replay an AI's earlier answer when it is asked the same question again (same board, hand, valid actions and prompt). Off by default; only sensible for deterministic models."
+    )
+    parser.add_argument(
+        "--ai_response_store",
+        type=str,
+        default=None,
+        help="With --reuse_ai_responses: SQLite file in which reused AI answers are also kept, so they carry over to later runs."
+    )
+    parser.add_argument(
+        "--debug",
+        action="store_true",
+        help="Show diagnostic output: map and GUI setup details, and full AI action/response dumps in the game log."
+    )
     args = parser.parse_args()
+    if args.debug:
+        logging.basicConfig(format="%(levelname)s %(name)s: %(message)s")
+        logging.getLogger("llm_risk").setLevel(logging.DEBUG) # Only this package; SDK clients stay quiet
 
     selected_game_mode = args.game_mode
     auto_initialize_board = False  # Default value
@@ -218,8 +239,17 @@ def main():
             geojson_data_str=geojson_data_str # Will be None if not world_map mode
         )
 
-    # Run the game.
-    orchestrator.run_game()
+    if args.reuse_ai_responses:
+        orchestrator.reuse_setup_ai_responses = True
+        orchestrator.reuse_play_ai_responses = True
+        if args.ai_response_store:
+            orchestrator.response_store = AIResponseStore(args.ai_response_store)
+
+    # Run the game, then close the orchestrator's log files.
+    with orchestrator:
+        orchestrator.run_game()
+    if orchestrator.response_store is not None:
+        orchestrator.response_store.close()
 
     print("LLM Risk Game - Application Finished.")
 